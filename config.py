@@ -8,3 +8,34 @@ DB_PORT = int(os.getenv("DB_PORT", 3306))
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
+
+# Pool de connexions MySQL
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 1))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 8))
+DB_POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", 300))
+DB_POOL_CHECKOUT_TIMEOUT = float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", 10))
+DB_POOL_PING_INTERVAL = float(os.getenv("DB_POOL_PING_INTERVAL", 5))
+
+# Ventes : décrément du stock et mouvements en une requête par vente au lieu
+# du trigger ligne à ligne (nécessite database/migrations/003_trigger_stock_ensembliste.sql)
+SALE_SET_BASED_STOCK = os.getenv("SALE_SET_BASED_STOCK", "0").lower() in ("1", "true", "yes", "oui")
+
+# Catalogue produits en mémoire (models/product_catalog.py) : âge maximal en
+# secondes avant de relire les produits modifiés par un autre poste
+CATALOG_MAX_AGE = float(os.getenv("CATALOG_MAX_AGE", 30))
+
+# Paramètres (table parametres, models/settings.py) : âge maximal en secondes
+# du cache avant de relire les paramètres modifiés par un autre poste
+SETTINGS_MAX_AGE = float(os.getenv("SETTINGS_MAX_AGE", 60))
+
+# Coût bcrypt des mots de passe (2^n itérations). Les hashes d'un autre coût
+# sont recalculés à la connexion suivante ; mesurer avec tests/bench_bcrypt.py
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
+# Fenêtre principale : précharger les autres vues après le premier affichage
+# (sinon chaque vue est construite à sa première ouverture)
+PREFETCH_VIEWS = os.getenv("PREFETCH_VIEWS", "1").lower() in ("1", "true", "yes", "oui")
+
+# Dashboard : intervalle (s) de rafraîchissement automatique tant qu'il est
+# affiché ; 0 pour désactiver
+DASHBOARD_REFRESH_INTERVAL = float(os.getenv("DASHBOARD_REFRESH_INTERVAL", 60))
@@ -13,6 +13,16 @@ class ClientController:
         """Récupérer tous les clients"""
         return Client.get_all()
 
+    @staticmethod
+    def iter_clients():
+        """Tous les clients, lus au fil de l'eau (exports)"""
+        return Client.iter_all()
+
+    @staticmethod
+    def count_clients():
+        """Nombre de clients"""
+        return Client.count()
+
     @staticmethod
     def get_client(client_id):
         """Récupérer un client par ID"""
@@ -29,11 +39,26 @@ class ClientController:
         return Client.delete(client_id)
 
     @staticmethod
-    def search_clients(search_term):
-        """Recherche de clients"""
+    def search_clients(search_term, limit=None):
+        """Recherche de clients (les plus pertinents d'abord)"""
         if not search_term or len(search_term.strip()) < 1:
             return Client.get_all()
-        return Client.search(search_term)
+        return Client.search(search_term, limit)
+
+    @staticmethod
+    def is_phone_query(search_term):
+        """La saisie est-elle un numéro de téléphone ?"""
+        return bool(Client.PHONE_CHARS.match((search_term or '').strip()))
+
+    @staticmethod
+    def get_client_search_entries():
+        """Nom, prénom et téléphone de tous les clients (index de recherche)"""
+        return Client.get_search_entries()
+
+    @staticmethod
+    def get_recent_clients(limit=20):
+        """Clients des dernières ventes"""
+        return Client.get_recent(limit)
 
     @staticmethod
     def get_client_history(client_id):
@@ -1,5 +1,6 @@
 from models.product import Product
 from models.category import Category
+from models.product_catalog import ProductCatalog
 
 
 class ProductController:
@@ -11,14 +12,19 @@ class ProductController:
 
     @staticmethod
     def get_all_products():
-        """Récupérer tous les produits"""
-        return Product.get_all()
+        """Récupérer tous les produits (catalogue en mémoire)"""
+        return ProductCatalog.all()
 
     @staticmethod
     def get_product(product_id):
         """Récupérer un produit"""
         return Product.get_by_id(product_id)
 
+    @staticmethod
+    def get_product_index():
+        """Index de recherche à la frappe sur les noms de produits"""
+        return ProductCatalog.search_index()
+
     @staticmethod
     def update_product(product_id, category_id, nom, description, prix_achat, prix_vente, stock_min):
         """Modifier un produit"""
@@ -30,11 +36,11 @@ class ProductController:
         return Product.delete(product_id)
 
     @staticmethod
-    def search_products(search_term):
-        """Rechercher un produit"""
-        if not search_term or len(search_term.strip()) < 1:
-            return Product.get_all()
-        return Product.search(search_term)
+    def search_products(search_term, category_id=None, limit=None, offset=0):
+        """Rechercher des produits (par pertinence, paginé)"""
+        if (not search_term or len(search_term.strip()) < 1) and category_id is None:
+            return ProductCatalog.all()
+        return Product.search(search_term, category_id, limit, offset)
 
     @staticmethod
     def update_product_stock(product_id, quantite, type_mouvement, user_id, description=""):
@@ -64,4 +70,9 @@ class ProductController:
     @staticmethod
     def get_products_by_category(category_id):
         """Récupérer les produits d'une catégorie"""
-        return Product.get_by_category(category_id)
+        return ProductCatalog.by_category(category_id)
+
+    @staticmethod
+    def get_catalog_stats():
+        """Statistiques du cache catalogue (taux de succès, coût des relectures)"""
+        return ProductCatalog.stats()
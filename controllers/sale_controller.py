@@ -1,12 +1,16 @@
+from models.invoice_number import InvoiceNumberAllocator
 from models.sale import Sale
+from models.sale_importer import SaleImporter
+from utils.data_exporter import DataExporter
 
 
 class SaleController:
 
     @staticmethod
-    def create_sale(client_id, user_id, articles, tva=18, remise=0, remise_type='montant', notes=""):
+    def create_sale(client_id, user_id, articles, tva=18, remise=0, remise_type='montant', notes="",
+                    numero_facture=None):
         """Créer une vente"""
-        return Sale.create(client_id, user_id, articles, tva, remise, remise_type, notes)
+        return Sale.create(client_id, user_id, articles, tva, remise, remise_type, notes, numero_facture)
 
     @staticmethod
     def get_sale(vente_id):
@@ -19,9 +23,19 @@ class SaleController:
         return Sale.get_by_numero(numero_facture)
 
     @staticmethod
-    def get_all_sales(limit=100, offset=0):
-        """Récupérer toutes les ventes"""
-        return Sale.get_all(limit, offset)
+    def get_all_sales(limit=100, offset=0, after=None, statut=None):
+        """Récupérer toutes les ventes (after : pagination par clé)"""
+        return Sale.get_all(limit, offset, after, statut)
+
+    @staticmethod
+    def iter_sales(statut=None):
+        """Toutes les ventes, lues au fil de l'eau (exports)"""
+        return Sale.iter_all(statut)
+
+    @staticmethod
+    def count_sales(statut=None):
+        """Nombre de ventes"""
+        return Sale.count(statut)
 
     @staticmethod
     def get_sale_details(vente_id):
@@ -65,9 +79,29 @@ class SaleController:
 
     @staticmethod
     def generate_invoice_number():
-        """Générer un numéro de facture"""
+        """Aperçu du prochain numéro de facture"""
         return Sale.generate_invoice_number()
 
+    @staticmethod
+    def import_sales(path, report_path=None, chunk_size=500, default_user_id=None):
+        """Importer un fichier de ventes (CSV/JSONL), rapport d'erreurs optionnel"""
+        importer = SaleImporter(chunk_size=chunk_size, default_user_id=default_user_id)
+        success, message = importer.run(path)
+        if importer.errors and report_path:
+            importer.write_report(report_path)
+        return success, message
+
+    @staticmethod
+    def export_raw_data(directory, date_from, date_to, fmt='csv', tables=None, workers=None, progress=None):
+        """Export brut CSV / JSONL gzip d'une période, repris s'il a été interrompu"""
+        exporter = DataExporter(directory, date_from, date_to, fmt, tables)
+        return exporter.run(workers, progress)
+
+    @staticmethod
+    def reserve_invoice_numbers(size):
+        """Réserver un bloc de numéros de facture (InvoiceNumberBlock)"""
+        return InvoiceNumberAllocator.reserve_block(size)
+
     @staticmethod
     def export_sale_to_pdf(vente_id, output_path, company_info=None):
         """Exporter une vente en PDF"""
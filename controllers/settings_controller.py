@@ -10,6 +10,11 @@ class SettingsController:
         """Récupérer les infos entreprise"""
         return Settings.get_company_info()
 
+    @staticmethod
+    def get_invoice_company_info():
+        """En-tête entreprise des factures PDF"""
+        return Settings.get_invoice_company_info()
+
     @staticmethod
     def update_company_info(company_name, address, phone, email, website, logo_path=None):
         """Mettre à jour les infos entreprise"""
@@ -59,7 +64,32 @@ class SettingsController:
         """Mettre à jour les paramètres généraux"""
         return Settings.update_general_settings(currency, tva, invoice_prefix, date_format, timezone)
 
+    @staticmethod
+    def set_settings(values):
+        """Enregistrer plusieurs paramètres (seulement ceux qui changent)"""
+        return Settings.set_many(values)
+
     @staticmethod
     def get_setting(key):
         """Récupérer un paramètre spécifique"""
         return Settings.get_setting(key)
+
+    @staticmethod
+    def get_sale_defaults(cached=False):
+        """TVA par défaut et devise du formulaire de vente
+
+        cached=True : sans requête (cache, même expiré, ou valeurs par
+        défaut), pour le thread de l'interface
+        """
+        read = Settings.peek if cached else Settings.get
+        return {'tva': read('tva_default'), 'currency': read('currency')}
+
+    @staticmethod
+    def get_default_tva():
+        """Taux de TVA par défaut (%)"""
+        return Settings.tva_default()
+
+    @staticmethod
+    def get_currency():
+        """Devise affichée"""
+        return Settings.currency()
@@ -4,24 +4,24 @@ from models.statistics import Statistics
 class StatisticsController:
 
     @staticmethod
-    def get_ca_by_period(period='today'):
+    def get_ca_by_period(period='today', start=None, end=None):
         """Récupérer le CA par période"""
-        return Statistics.get_ca_by_period(period)
+        return Statistics.get_ca_by_period(period, start, end)
 
     @staticmethod
-    def get_sales_count(period='today'):
+    def get_sales_count(period='today', start=None, end=None):
         """Récupérer le nombre de ventes par période"""
-        return Statistics.get_sales_count(period)
+        return Statistics.get_sales_count(period, start, end)
 
     @staticmethod
-    def get_top_products(limit=5):
+    def get_top_products(limit=5, period='month', start=None, end=None):
         """Récupérer les top produits"""
-        return Statistics.get_top_products(limit)
+        return Statistics.get_top_products(limit, period, start, end)
 
     @staticmethod
-    def get_top_clients(limit=5):
+    def get_top_clients(limit=5, period='month', start=None, end=None):
         """Récupérer les top clients"""
-        return Statistics.get_top_clients(limit)
+        return Statistics.get_top_clients(limit, period, start, end)
 
     @staticmethod
     def get_low_stock_products():
@@ -29,9 +29,9 @@ class StatisticsController:
         return Statistics.get_low_stock_products()
 
     @staticmethod
-    def get_ca_by_category(period='month'):
+    def get_ca_by_category(period='month', start=None, end=None):
         """Récupérer le CA par catégorie"""
-        return Statistics.get_ca_by_category(period)
+        return Statistics.get_ca_by_category(period, start, end)
 
     @staticmethod
     def get_ca_evolution(days=30):
@@ -47,3 +47,8 @@ class StatisticsController:
     def get_dashboard_summary():
         """Récupérer le résumé complet"""
         return Statistics.get_dashboard_summary()
+
+    @staticmethod
+    def get_dashboard_changes(since=None):
+        """Résumé du dashboard s'il a changé depuis le repère `since`"""
+        return Statistics.get_dashboard_changes(since)
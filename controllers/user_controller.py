@@ -1,5 +1,6 @@
 from models.user import User
 from utils.permissions import check_role
+from utils.passwords import needs_rehash
 
 
 class UserController:
@@ -18,6 +19,11 @@ class UserController:
         if not User.verify_password(password, user["password_hash"]):
             return None, "Mot de passe incorrect"
 
+        if needs_rehash(user["password_hash"]):
+            # Coût bcrypt modifié (BCRYPT_ROUNDS) : seul moment où le mot de
+            # passe en clair est disponible pour recalculer le hash
+            User.rehash_password(user["id"], password, user["password_hash"])
+
         return user, None
 
     @staticmethod
@@ -1,19 +1,110 @@
+import atexit
+import threading
+
 import pymysql
-from config import DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, DB_PORT
+from config import (
+    DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, DB_PORT,
+    DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_IDLE_TIMEOUT,
+    DB_POOL_CHECKOUT_TIMEOUT, DB_POOL_PING_INTERVAL
+)
+from database.pool import ConnectionPool, PoolTimeoutError
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _connect():
+    """Ouvrir une nouvelle connexion MySQL (utilisé par le pool)"""
+    return pymysql.connect(
+        host=DB_HOST,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        database=DB_NAME,
+        port=DB_PORT,
+        cursorclass=pymysql.cursors.DictCursor,
+        autocommit=True
+    )
+
+
+def get_pool():
+    """Récupérer le pool de connexions de l'application (créé à la demande)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    _connect,
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=DB_POOL_MAX_SIZE,
+                    idle_timeout=DB_POOL_IDLE_TIMEOUT,
+                    checkout_timeout=DB_POOL_CHECKOUT_TIMEOUT,
+                    ping_interval=DB_POOL_PING_INTERVAL
+                )
+                atexit.register(_pool.close_all)
+    return _pool
 
 
 def get_connection():
+    """Emprunter une connexion au pool
+
+    `conn.close()` rend la connexion au pool. Retourne None en cas d'erreur.
+    """
     try:
-        connection = pymysql.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_NAME,
-            port=DB_PORT,
-            cursorclass=pymysql.cursors.DictCursor,
-            autocommit=True
-        )
-        return connection
+        return get_pool().acquire()
+    except PoolTimeoutError as e:
+        print("❌ Pool de connexions saturé :", e)
+        return None
     except pymysql.MySQLError as e:
         print("❌ Erreur de connexion MySQL :", e)
         return None
+
+
+def get_pool_stats():
+    """Statistiques du pool (emprunts, attentes, créations, réutilisations...)"""
+    return get_pool().stats()
+
+
+def stream_query(sql, params=None):
+    """Lignes d'un SELECT lues au fil de l'eau (curseur côté serveur)
+
+    Générateur : les lignes ne sont pas chargées en mémoire d'un bloc
+    (SSDictCursor), ce qui convient aux exports de plusieurs centaines de
+    milliers de lignes. La connexion reste empruntée jusqu'à la fin de la
+    lecture ; un générateur abandonné avant la fin ferme sa connexion
+    plutôt que de lire les lignes restantes pour la rendre au pool.
+    Sans connexion, lève ConnectionError (un export vide passerait inaperçu).
+    """
+    conn = get_connection()
+    if not conn:
+        raise ConnectionError("Erreur de connexion à la base de données")
+
+    finished = False
+    try:
+        cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+        cursor.execute(sql, params)
+        for row in cursor:
+            yield row
+        cursor.close()
+        finished = True
+    finally:
+        if finished:
+            conn.close()
+        else:
+            conn.discard()
+
+
+def query_columns(sql, params=None):
+    """Noms des colonnes d'un SELECT, sans lire de ligne (LIMIT 0)
+
+    Sans connexion, lève ConnectionError, comme stream_query.
+    """
+    conn = get_connection()
+    if not conn:
+        raise ConnectionError("Erreur de connexion à la base de données")
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"{sql} LIMIT 0", params)
+        return [column[0] for column in cursor.description]
+    finally:
+        conn.close()
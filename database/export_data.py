@@ -0,0 +1,47 @@
+"""Export brut des ventes pour la comptabilité (CSV / JSONL compressés)
+
+Usage :
+    python -m database.export_data export/ 2026-01-01 2026-12-31 [--format jsonl]
+        [--tables ventes paiements] [--threads 4]
+
+Un fichier <table>.<format>.gz par table (ventes, ventes_details,
+paiements, mouvements_stock) ; la date de fin est incluse. Relancer la
+même commande après une interruption reprend l'export là où il s'était
+arrêté (voir utils/data_exporter.py).
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from utils.data_exporter import DataExporter, FORMATS, TABLES
+from utils.helpers import resolve_period
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporter les ventes d'une période en CSV / JSONL gzip")
+    parser.add_argument('dossier')
+    parser.add_argument('du', type=date.fromisoformat, help="premier jour (AAAA-MM-JJ)")
+    parser.add_argument('au', type=date.fromisoformat, help="dernier jour inclus (AAAA-MM-JJ)")
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    parser.add_argument('--tables', nargs='+', choices=list(TABLES), help="tables à exporter (toutes par défaut)")
+    parser.add_argument('--threads', type=int, help="tables exportées en parallèle")
+    args = parser.parse_args(argv)
+
+    date_from, date_to = resolve_period('custom', args.du, args.au)
+    exporter = DataExporter(args.dossier, date_from, date_to, args.format, args.tables)
+
+    def progress(table, rows):
+        print(f"  {table} : {rows} lignes", flush=True)
+
+    started = time.perf_counter()
+    success, message, counts = exporter.run(args.threads, progress)
+    print(f"{message} en {time.perf_counter() - started:.1f} s")
+    for table, rows in counts.items():
+        print(f"  {exporter.path(table)} : {rows} lignes")
+
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Import en masse de ventes (remontées de caisse)
+
+Usage :
+    python -m database.import_sales ventes.csv [--rapport erreurs.csv] [--lot 500] [--vendeur ID]
+
+Voir models/sale_importer.py pour le format des fichiers CSV / JSONL.
+"""
+import argparse
+import sys
+import time
+
+from models.sale_importer import SaleImporter
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importer des ventes depuis un fichier CSV ou JSONL")
+    parser.add_argument('fichier')
+    parser.add_argument('--rapport', help="fichier CSV du rapport d'erreurs")
+    parser.add_argument('--lot', type=int, default=500, help="nombre de ventes par transaction")
+    parser.add_argument('--vendeur', type=int, help="vendeur par défaut (id)")
+    args = parser.parse_args(argv)
+
+    importer = SaleImporter(chunk_size=args.lot, default_user_id=args.vendeur)
+    started = time.perf_counter()
+    success, message = importer.run(args.fichier)
+    print(f"{message} en {time.perf_counter() - started:.1f} s")
+
+    if importer.errors:
+        if args.rapport:
+            importer.write_report(args.rapport)
+            print(f"Rapport d'erreurs : {args.rapport}")
+        else:
+            for error in importer.errors[:20]:
+                print(f"  ligne {error['ligne']} ({error['ref']}) : {error['erreur']}")
+
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
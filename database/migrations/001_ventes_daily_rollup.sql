@@ -0,0 +1,20 @@
+-- Agregats journaliers des ventes (voir models/sales_rollup.py)
+-- Apres application : python -m database.rebuild_rollup
+USE gestion_commerciale;
+
+CREATE TABLE IF NOT EXISTS ventes_daily_rollup(
+    jour DATE NOT NULL,
+    category_id INT NOT NULL,
+    produit_id INT NOT NULL,
+    user_id INT NOT NULL,
+    quantite INT NOT NULL DEFAULT 0,
+    nombre_lignes INT NOT NULL DEFAULT 0,
+    ca_lignes DECIMAL(14,2) NOT NULL DEFAULT 0,
+    nombre_ventes DECIMAL(14,6) NOT NULL DEFAULT 0,
+    ca DECIMAL(16,4) NOT NULL DEFAULT 0,
+    montant_paye DECIMAL(16,4) NOT NULL DEFAULT 0,
+    montant_reste DECIMAL(16,4) NOT NULL DEFAULT 0,
+    PRIMARY KEY (jour, category_id, produit_id, user_id),
+    INDEX idx_produit(produit_id),
+    INDEX idx_category(category_id)
+) ENGINE=InnoDB;
@@ -0,0 +1,13 @@
+-- Compteurs de numeros de facture (voir models/invoice_number.py)
+-- Chaque compteur est initialise au premier usage a partir du plus grand
+-- numero deja present dans ventes pour le meme prefixe et le meme mois.
+USE gestion_commerciale;
+
+CREATE TABLE IF NOT EXISTS compteurs_factures(
+    prefixe VARCHAR(30) NOT NULL DEFAULT '',
+    annee SMALLINT NOT NULL,
+    mois TINYINT NOT NULL,
+    dernier_numero INT NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (prefixe, annee, mois)
+) ENGINE=InnoDB;
@@ -0,0 +1,29 @@
+-- Trigger de stock desactivable par session (voir Sale.create / SALE_SET_BASED_STOCK)
+-- A appliquer AVANT d'activer SALE_SET_BASED_STOCK, sinon le stock serait
+-- decremente deux fois.
+USE gestion_commerciale;
+
+DROP TRIGGER IF EXISTS after_vente_insert;
+
+DELIMITER //
+CREATE TRIGGER after_vente_insert
+    AFTER INSERT ON ventes_details
+    FOR EACH ROW
+BEGIN
+    IF COALESCE(@ventes_stock_ensemble, 0) = 0 THEN
+        UPDATE produits
+        SET stock_actuel = stock_actuel - NEW.quantite
+        WHERE id = NEW.produit_id;
+
+        INSERT INTO mouvements_stock (produit_id, user_id, type, quantite, description)
+        SELECT
+            NEW.produit_id,
+            v.user_id,
+            'vente',
+            NEW.quantite,
+            CONCAT('Vente facture: ', v.numero_facture)
+        FROM ventes v
+        WHERE v.id = NEW.vente_id;
+    END IF;
+END//
+DELIMITER ;
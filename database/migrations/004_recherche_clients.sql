@@ -0,0 +1,11 @@
+-- Recherche de clients (voir Client.search)
+-- telephone_normalise : chiffres seuls du telephone, calcule par MySQL et
+-- indexe, pour chercher un numero quel que soit son format de saisie.
+-- idx_prenom : repli des termes trop courts pour l'index FULLTEXT.
+USE gestion_commerciale;
+
+ALTER TABLE clients
+    ADD COLUMN telephone_normalise VARCHAR(20)
+        GENERATED ALWAYS AS (REGEXP_REPLACE(telephone, '[^0-9]', '')) STORED AFTER telephone,
+    ADD INDEX idx_telephone_normalise(telephone_normalise),
+    ADD INDEX idx_prenom(prenom);
@@ -0,0 +1,8 @@
+-- Recherche de produits (voir Product.search)
+-- idx_nom : repli des termes trop courts pour l'index FULLTEXT et tri des
+-- listes par categorie (idx_category_nom).
+USE gestion_commerciale;
+
+ALTER TABLE produits
+    ADD INDEX idx_nom(nom),
+    ADD INDEX idx_category_nom(category_id, nom);
@@ -0,0 +1,6 @@
+-- Cache du catalogue produits (voir models/product_catalog.py)
+-- La synchronisation incrementale lit les produits par updated_at.
+USE gestion_commerciale;
+
+ALTER TABLE produits
+    ADD INDEX idx_updated_at(updated_at);
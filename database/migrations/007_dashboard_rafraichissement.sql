@@ -0,0 +1,6 @@
+-- Rafraichissement automatique du dashboard (voir Statistics.get_dashboard_changes)
+-- Le repere de fraicheur lit MAX(ventes.updated_at) par index.
+USE gestion_commerciale;
+
+ALTER TABLE ventes
+    ADD INDEX idx_updated_at(updated_at);
@@ -0,0 +1,265 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from pymysql.constants import SERVER_STATUS
+
+
+class PoolTimeoutError(Exception):
+    """Aucune connexion disponible dans le délai imparti"""
+
+
+class PooledConnection:
+    """Connexion empruntée au pool
+
+    Se comporte comme une connexion pymysql : `close()` rend la connexion
+    au pool au lieu de fermer la socket, ce qui permet aux modèles de garder
+    le schéma `conn = get_connection() ... conn.close()`.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get('_raw')
+        if raw is None:
+            raise AttributeError(f"Connexion déjà rendue au pool ({name})")
+        return getattr(raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self._raw is not None:
+            try:
+                self._raw.rollback()
+            except Exception:
+                pass
+        self.close()
+
+    @property
+    def raw(self):
+        """Connexion pymysql sous-jacente"""
+        return self._raw
+
+    def close(self):
+        """Rendre la connexion au pool (appel idempotent)"""
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.release(raw)
+
+    def discard(self):
+        """Fermer réellement la connexion (état incertain)"""
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.release(raw, discard=True)
+
+    def __del__(self):
+        # Connexion oubliée par l'appelant (exception avant close()) :
+        # on libère sa place dans le pool plutôt que de la perdre
+        try:
+            self.discard()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Pool de connexions MySQL borné et thread-safe
+
+    - min_size : nombre de connexions conservées même inactives
+    - max_size : nombre maximum de connexions ouvertes simultanément
+    - idle_timeout : durée (s) au-delà de laquelle une connexion inactive est fermée
+    - checkout_timeout : attente maximale (s) d'une connexion libre
+    - ping_interval : une connexion inactive depuis plus longtemps est
+      vérifiée par un ping avant d'être prêtée
+    """
+
+    def __init__(self, connect, min_size=1, max_size=8, idle_timeout=300,
+                 checkout_timeout=10, ping_interval=5):
+        if max_size < 1:
+            raise ValueError("max_size doit être >= 1")
+        self._connect = connect
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.ping_interval = ping_interval
+
+        self._idle = deque()  # (connexion, dernière utilisation)
+        self._size = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'creations': 0,
+            'pings': 0,
+            'discards': 0,
+            'idle_closed': 0,
+        }
+
+    # ==================== Emprunt / restitution ====================
+
+    def acquire(self, timeout=None):
+        """Emprunter une connexion (PooledConnection)"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            self._stats['checkouts'] += 1
+
+        while True:
+            raw, last_used = self._reserve(deadline)
+
+            if raw is None:
+                try:
+                    raw = self._connect()
+                except Exception:
+                    self._forget()
+                    raise
+                with self._cond:
+                    self._stats['creations'] += 1
+                return PooledConnection(self, raw)
+
+            if time.monotonic() - last_used <= self.ping_interval:
+                return PooledConnection(self, raw)
+
+            try:
+                with self._cond:
+                    self._stats['pings'] += 1
+                raw.ping(reconnect=False)
+                return PooledConnection(self, raw)
+            except Exception:
+                # Connexion morte (timeout serveur, coupure réseau) : on en prend une autre
+                self._close_quietly(raw)
+                self._forget(discarded=True)
+
+    def release(self, raw, discard=False):
+        """Rendre une connexion au pool"""
+        if not discard:
+            discard = not self._reset(raw)
+
+        if discard:
+            self._close_quietly(raw)
+            self._forget(discarded=True)
+            return
+
+        with self._cond:
+            self._idle.append((raw, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager : `with pool.connection() as conn:`"""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                conn.discard()
+            raise
+        finally:
+            conn.close()
+
+    # ==================== Observabilité ====================
+
+    def stats(self):
+        """Statistiques du pool (les réutilisations sont des handshakes évités)"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['size'] = self._size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._size - len(self._idle)
+        stats['reuses'] = max(0, stats['checkouts'] - stats['creations'] - stats['timeouts'])
+        return stats
+
+    def close_all(self):
+        """Fermer toutes les connexions inactives"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for raw, _ in idle:
+            self._close_quietly(raw)
+
+    # ==================== Interne ====================
+
+    def _reserve(self, deadline):
+        """Réserver une connexion inactive ou une place pour en créer une"""
+        to_close = []
+        try:
+            with self._cond:
+                waited = False
+                while True:
+                    to_close.extend(self._prune_locked())
+
+                    if self._idle:
+                        # LIFO : on réutilise la plus chaude, les autres vieillissent
+                        return self._idle.pop()
+
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None, 0.0
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"Aucune connexion disponible après {self.checkout_timeout:.0f}s "
+                            f"({self.max_size} connexions utilisées)"
+                        )
+                    if not waited:
+                        self._stats['waits'] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+        finally:
+            for raw in to_close:
+                self._close_quietly(raw)
+
+    def _prune_locked(self):
+        """Retirer les connexions inactives trop anciennes (au-delà de min_size)"""
+        expired = []
+        if self.idle_timeout is None:
+            return expired
+        limit = time.monotonic() - self.idle_timeout
+        # Les plus anciennes sont à gauche de la deque
+        while self._idle and self._size > self.min_size and self._idle[0][1] < limit:
+            raw, _ = self._idle.popleft()
+            self._size -= 1
+            self._stats['idle_closed'] += 1
+            expired.append(raw)
+        return expired
+
+    def _forget(self, discarded=False):
+        with self._cond:
+            self._size -= 1
+            if discarded:
+                self._stats['discards'] += 1
+            self._cond.notify()
+
+    @staticmethod
+    def _reset(raw):
+        """Remettre la connexion dans un état propre avant réutilisation"""
+        try:
+            if not raw.open:
+                return False
+            # Transaction laissée ouverte par l'appelant : on l'annule
+            if raw.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                raw.rollback()
+            if not raw.get_autocommit():
+                raw.autocommit(True)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
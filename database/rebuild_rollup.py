@@ -0,0 +1,39 @@
+"""Reconstruction des agrégats journaliers des ventes
+
+Usage :
+    python -m database.rebuild_rollup               # reconstruction complète
+    python -m database.rebuild_rollup 2026-01-01    # à partir d'une date
+
+À lancer après l'application de database/migrations/001_ventes_daily_rollup.sql
+ou après une correction manuelle de ventes passées.
+"""
+import argparse
+import sys
+from datetime import date
+
+from database.connection import get_connection
+from models.sales_rollup import SalesRollup
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconstruire ventes_daily_rollup")
+    parser.add_argument('depuis', nargs='?', type=date.fromisoformat,
+                        help="premier jour à reconstruire (AAAA-MM-JJ)")
+    args = parser.parse_args(argv)
+
+    conn = get_connection()
+    if not conn:
+        print("Erreur de connexion à la base de données")
+        return 1
+
+    try:
+        success, message = SalesRollup.rebuild_all(conn, args.depuis)
+    finally:
+        conn.close()
+
+    print(message)
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -24,6 +24,7 @@ CREATE TABLE clients(
     nom VARCHAR(100) NOT NULL,
     prenom VARCHAR(100) NOT NULL,
     telephone VARCHAR(20),
+    telephone_normalise VARCHAR(20) GENERATED ALWAYS AS (REGEXP_REPLACE(telephone, '[^0-9]', '')) STORED,
     email VARCHAR(100),
     adresse TEXT,
     ville VARCHAR(100),
@@ -31,7 +32,9 @@ CREATE TABLE clients(
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_nom(nom),
+    INDEX idx_prenom(prenom),
     INDEX idx_telephone(telephone),
+    INDEX idx_telephone_normalise(telephone_normalise),
     FULLTEXT idx_search(nom, prenom, email)
 ) ENGINE=InnoDB;
 
@@ -58,7 +61,10 @@ CREATE TABLE produits(
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE RESTRICT,
     INDEX idx_category(category_id),
+    INDEX idx_category_nom(category_id, nom),
+    INDEX idx_nom(nom),
     INDEX idx_stock(stock_actuel),
+    INDEX idx_updated_at(updated_at),
     FULLTEXT idx_search(nom, description)
 ) ENGINE=InnoDB;
 
@@ -82,7 +88,8 @@ CREATE TABLE ventes(
     INDEX idx_user(user_id),
     INDEX idx_date(date_vente),
     INDEX idx_statut(statut),
-    INDEX idx_numero(numero_facture)
+    INDEX idx_numero(numero_facture),
+    INDEX idx_updated_at(updated_at)
 ) ENGINE=InnoDB;
 
 -- Table ventes_details
@@ -136,25 +143,60 @@ CREATE TABLE paiements(
     INDEX idx_date(date_paiement)
 ) ENGINE=InnoDB;
 
+-- Table ventes_daily_rollup (agregats journaliers des jours clos)
+-- Les montants de la vente (total, paye, reste) et le nombre de ventes sont
+-- repartis entre ses lignes au prorata du sous-total : leur somme sur une
+-- journee redonne exactement les totaux de ventes.
+CREATE TABLE IF NOT EXISTS ventes_daily_rollup(
+    jour DATE NOT NULL,
+    category_id INT NOT NULL,
+    produit_id INT NOT NULL,
+    user_id INT NOT NULL,
+    quantite INT NOT NULL DEFAULT 0,
+    nombre_lignes INT NOT NULL DEFAULT 0,
+    ca_lignes DECIMAL(14,2) NOT NULL DEFAULT 0,
+    nombre_ventes DECIMAL(14,6) NOT NULL DEFAULT 0,
+    ca DECIMAL(16,4) NOT NULL DEFAULT 0,
+    montant_paye DECIMAL(16,4) NOT NULL DEFAULT 0,
+    montant_reste DECIMAL(16,4) NOT NULL DEFAULT 0,
+    PRIMARY KEY (jour, category_id, produit_id, user_id),
+    INDEX idx_produit(produit_id),
+    INDEX idx_category(category_id)
+) ENGINE=InnoDB;
+
+-- Table compteurs_factures (dernier numero attribue par prefixe et par mois)
+CREATE TABLE IF NOT EXISTS compteurs_factures(
+    prefixe VARCHAR(30) NOT NULL DEFAULT '',
+    annee SMALLINT NOT NULL,
+    mois TINYINT NOT NULL,
+    dernier_numero INT NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (prefixe, annee, mois)
+) ENGINE=InnoDB;
+
 -- Trigger pour mise a jour stock apres vente
+-- Desactive quand la session pose @ventes_stock_ensemble = 1 : Sale.create
+-- fait alors le meme travail en une requete pour toute la vente.
 DELIMITER //
 CREATE TRIGGER after_vente_insert
     AFTER INSERT ON ventes_details
     FOR EACH ROW
 BEGIN
-    UPDATE produits
-    SET stock_actuel = stock_actuel - NEW.quantite
-    WHERE id = NEW.produit_id;
-
-    INSERT INTO mouvements_stock (produit_id, user_id, type, quantite, description)
-    SELECT
-        NEW.produit_id,
-        v.user_id,
-        'vente',
-        NEW.quantite,
-        CONCAT('Vente facture: ', v.numero_facture)
-    FROM ventes v
-    WHERE v.id = NEW.vente_id;
+    IF COALESCE(@ventes_stock_ensemble, 0) = 0 THEN
+        UPDATE produits
+        SET stock_actuel = stock_actuel - NEW.quantite
+        WHERE id = NEW.produit_id;
+
+        INSERT INTO mouvements_stock (produit_id, user_id, type, quantite, description)
+        SELECT
+            NEW.produit_id,
+            v.user_id,
+            'vente',
+            NEW.quantite,
+            CONCAT('Vente facture: ', v.numero_facture)
+        FROM ventes v
+        WHERE v.id = NEW.vente_id;
+    END IF;
 END//
 DELIMITER ;
 
@@ -1,37 +1,60 @@
 import sys
+from utils import startup
+
+# --profile-startup : chronologie et temps d'import de chaque module
+# --exit-after-startup : quitter une fois la connexion affichée (tests/bench_startup.py)
+PROFILE_STARTUP = "--profile-startup" in sys.argv
+EXIT_AFTER_STARTUP = "--exit-after-startup" in sys.argv
+if PROFILE_STARTUP:
+    startup.enable_profile()
+
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import QTimer
-from views.login_view import LoginView
 from views.splash_screen import SplashScreen
 from utils.path import resource_path
-from PyQt6.QtCore import QFile
 
 
 def main():
+    startup.mark("Imports Qt")
     app = QApplication(sys.argv)
 
     # Show splash screen
     splash = SplashScreen()
     splash.show()
     app.processEvents()
+    startup.mark("Splash affiché")
 
     # Charger le style
     splash.update_message("Chargement des styles...")
     with open(resource_path("resources/styles/main.qss"), "r") as f:
         app.setStyleSheet(f.read())
     app.processEvents()
+    startup.mark("Styles chargés")
 
-    # Créer la fenêtre de connexion
+    # Créer la fenêtre de connexion (les vues métier ne sont importées
+    # qu'après la connexion, voir LoginView.open_main_window)
     splash.update_message("Initialisation de l'application...")
+    from views.login_view import LoginView
     login = LoginView()
     app.processEvents()
+    startup.mark("Connexion créée")
 
     # Fermer le splash screen et afficher la connexion
     splash.finish(login)
     login.showMaximized()
+    QTimer.singleShot(0, lambda: startup_done(app))
 
     sys.exit(app.exec())
 
 
+def startup_done(app):
+    """Première itération de la boucle après l'affichage de la connexion"""
+    startup.mark("Connexion affichée")
+    if PROFILE_STARTUP:
+        startup.report()
+    if EXIT_AFTER_STARTUP:
+        app.quit()
+
+
 if __name__ == "__main__":
     main()
@@ -1,4 +1,6 @@
-from database.connection import get_connection
+import re
+from database.connection import get_connection, stream_query
+from models.fulltext import FullTextQuery
 from datetime import datetime
 
 
@@ -56,6 +58,84 @@ class Client:
 
         return clients
 
+    @staticmethod
+    def iter_all():
+        """Tous les clients, au fil de l'eau (exports), triés comme get_all"""
+        yield from stream_query("SELECT * FROM clients ORDER BY nom, prenom")
+
+    @staticmethod
+    def count():
+        """Nombre de clients"""
+        conn = get_connection()
+        if not conn:
+            return 0
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT COUNT(*) as total FROM clients")
+            return cursor.fetchone()['total']
+        except Exception as e:
+            print(f"Erreur comptage clients : {e}")
+            return 0
+        finally:
+            conn.close()
+
+    @staticmethod
+    def get_search_entries():
+        """Colonnes utiles à la recherche à la frappe, pour tous les clients"""
+        conn = get_connection()
+        if not conn:
+            return []
+
+        cursor = conn.cursor()
+        sql = "SELECT id, nom, prenom, telephone, telephone_normalise FROM clients"
+
+        try:
+            cursor.execute(sql)
+            clients = cursor.fetchall()
+        except Exception as e:
+            print(f"Erreur chargement clients : {e}")
+            clients = []
+        finally:
+            conn.close()
+
+        return clients
+
+    @staticmethod
+    def get_recent(limit=20):
+        """Clients des dernières ventes, du plus récent au plus ancien
+
+        Lit les RECENT_SALES dernières ventes par idx_date plutôt que de
+        grouper toute la table ventes.
+        """
+        conn = get_connection()
+        if not conn:
+            return []
+
+        cursor = conn.cursor()
+        sql = """
+        SELECT c.*
+        FROM (
+            SELECT client_id, MAX(date_vente) as derniere_vente
+            FROM (SELECT client_id, date_vente FROM ventes ORDER BY date_vente DESC LIMIT %s) r
+            GROUP BY client_id
+        ) recents
+        JOIN clients c ON c.id = recents.client_id
+        ORDER BY recents.derniere_vente DESC
+        LIMIT %s
+        """
+
+        try:
+            cursor.execute(sql, (Client.RECENT_SALES, limit))
+            clients = cursor.fetchall()
+        except Exception as e:
+            print(f"Erreur clients récents : {e}")
+            clients = []
+        finally:
+            conn.close()
+
+        return clients
+
     @staticmethod
     def update(client_id, nom, prenom, telephone=None, email=None, adresse=None, ville=None, code_postal=None):
         """Modifier un client"""
@@ -110,24 +190,58 @@ class Client:
         finally:
             conn.close()
 
+    # Un terme de recherche composé uniquement de ces caractères est un numéro
+    PHONE_CHARS = re.compile(r'^[0-9\s+\-.()/]+$')
+    SEARCH_LIMIT = 100
+    RECENT_SALES = 500
+
     @staticmethod
-    def search(search_term):
-        """Recherche multicritère (nom, prénom, téléphone, email)"""
+    def build_search_query(search_term):
+        """Traduire la saisie en requête SQL de recherche
+
+        Retourne (where, order, params) :
+        - numéro (chiffres, espaces, +, -...) : préfixe sur telephone_normalise
+          (index B-tree), quel que soit le format saisi ou enregistré
+        - sinon FULLTEXT sur idx_search(nom, prenom, email), avec repli en
+          préfixe sur nom / prénom (idx_nom, idx_prenom) pour les mots courts,
+          voir FullTextQuery.build
+        Retourne None si la saisie ne contient rien de cherchable.
+        """
+        term = (search_term or '').strip()
+        if not term:
+            return None
+
+        digits = ''.join(c for c in term if c.isdigit())
+        if digits and Client.PHONE_CHARS.match(term):
+            return "telephone_normalise LIKE %s", "telephone_normalise", [digits + '%']
+
+        return FullTextQuery.build(term, "nom, prenom, email", ("nom", "prenom"), "nom, prenom")
+
+    @staticmethod
+    def search(search_term, limit=None):
+        """Recherche multicritère (nom, prénom, email, téléphone)
+
+        Voir build_search_query pour les chemins indexés utilisés.
+        """
+        query = Client.build_search_query(search_term)
+        if not query:
+            return []
+        where, order, params = query
+
         conn = get_connection()
         if not conn:
             return []
 
         cursor = conn.cursor()
-        sql = """
-        SELECT * FROM clients 
-        WHERE nom LIKE %s OR prenom LIKE %s OR telephone LIKE %s OR email LIKE %s
-        ORDER BY nom, prenom
+        sql = f"""
+        SELECT * FROM clients
+        WHERE {where}
+        ORDER BY {order}
+        LIMIT %s
         """
 
-        search_pattern = f"%{search_term}%"
-
         try:
-            cursor.execute(sql, (search_pattern, search_pattern, search_pattern, search_pattern))
+            cursor.execute(sql, (*params, limit or Client.SEARCH_LIMIT))
             clients = cursor.fetchall()
         except Exception as e:
             print(f"Erreur recherche : {e}")
@@ -0,0 +1,74 @@
+import re
+
+
+class FullTextQuery:
+    """Construction des conditions de recherche FULLTEXT (mode booléen)
+
+    Partagé par Client.search et Product.search.
+    """
+
+    # Taille minimale d'un mot indexé par FULLTEXT (innodb_ft_min_token_size)
+    MIN_WORD = 3
+    # Mots vides InnoDB par défaut : ignorés par FULLTEXT, cherchés en préfixe
+    STOPWORDS = frozenset((
+        'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en', 'for', 'from',
+        'how', 'i', 'in', 'is', 'it', 'la', 'of', 'on', 'or', 'that', 'the', 'this', 'to',
+        'was', 'what', 'when', 'where', 'who', 'will', 'with', 'und', 'www'
+    ))
+
+    @staticmethod
+    def escape_like(text):
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    @staticmethod
+    def build(term, match_columns, prefix_columns, order_columns):
+        """Condition de recherche sur un index FULLTEXT
+
+        - match_columns : colonnes de l'index FULLTEXT, ex. "nom, prenom, email"
+        - prefix_columns : colonnes indexées (B-tree) pour le préfixe des mots
+          trop courts pour FULLTEXT
+        - order_columns : tri secondaire, ex. "nom, prenom"
+
+        Mots d'au moins MIN_WORD lettres : MATCH ... AGAINST, chaque mot
+        obligatoire et complété (« dup » trouve « Dupont »), tri par
+        pertinence. Mots plus courts (ou mots vides) : préfixe sur
+        prefix_columns ; avec des mots FULLTEXT, simple filtre sur les lignes
+        trouvées par l'index.
+
+        Retourne (where, order, params) — params dans l'ordre des %s de
+        where puis order — ou None si la saisie ne contient aucun mot.
+        """
+        words = re.findall(r'\w+', term or '')
+        if not words:
+            return None
+        long_words = [
+            w for w in words
+            if len(w) >= FullTextQuery.MIN_WORD and w.lower() not in FullTextQuery.STOPWORDS
+        ]
+        short_words = [w for w in words if w not in long_words]
+
+        conditions = []
+        params = []
+        order = order_columns
+        match = f"MATCH({match_columns}) AGAINST (%s IN BOOLEAN MODE)"
+
+        if long_words:
+            against = ' '.join(f"+{w}*" for w in long_words)
+            conditions.append(match)
+            params.append(against)
+            order = f"{match} DESC, {order_columns}"
+
+        for word in short_words:
+            pattern = FullTextQuery.escape_like(word)
+            if long_words:
+                # Lignes déjà réduites par FULLTEXT : simple filtre sur le résultat
+                conditions.append(f"CONCAT_WS(' ', {match_columns}) LIKE %s")
+                params.append(f"%{pattern}%")
+            else:
+                conditions.append('(' + ' OR '.join(f"{column} LIKE %s" for column in prefix_columns) + ')')
+                params.extend([pattern + '%'] * len(prefix_columns))
+
+        if long_words:
+            params.append(against)
+
+        return ' AND '.join(conditions), order, params
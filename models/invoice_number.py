@@ -0,0 +1,171 @@
+from database.connection import get_connection
+from datetime import datetime
+from models.settings import Settings
+import threading
+
+
+class InvoiceNumberBlock:
+    """Bloc de numéros de facture réservé d'avance (caisses à fort volume)
+
+    Les numéros sont distribués localement, sans aller-retour en base.
+    Les numéros non utilisés d'un bloc sont perdus (trou dans la séquence).
+    """
+
+    def __init__(self, prefix, year, month, first, last):
+        self.prefix = prefix
+        self.year = year
+        self.month = month
+        self.next = first
+        self.last = last
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        return max(self.last - self.next + 1, 0)
+
+    def take(self, when=None):
+        """Prendre le prochain numéro (None si le bloc est épuisé ou d'un autre mois)"""
+        when = when or datetime.now()
+        if (when.year, when.month) != (self.year, self.month):
+            return None
+
+        with self._lock:
+            if self.next > self.last:
+                return None
+            sequence = self.next
+            self.next += 1
+
+        return InvoiceNumberAllocator.format_number(self.prefix, self.year, self.month, sequence)
+
+
+class InvoiceNumberAllocator:
+    """Attribution des numéros de facture via la table compteurs_factures
+
+    Une ligne par (préfixe, année, mois) contient le dernier numéro
+    attribué. L'incrément se fait par UPDATE ... LAST_INSERT_ID(expr) dans
+    la transaction de l'appelant : la ligne reste verrouillée jusqu'au
+    COMMIT, deux caisses ne peuvent donc pas obtenir le même numéro, et un
+    ROLLBACK rend le numéro.
+    """
+
+    @staticmethod
+    def format_number(prefix, year, month, sequence):
+        """Format: [PREFIXE/]YYYY/MM/NNNNNN"""
+        number = f"{year}/{month:02d}/{sequence:06d}"
+        return f"{prefix}/{number}" if prefix else number
+
+    @staticmethod
+    def read_prefix():
+        """Préfixe configuré (paramètre invoice_prefix), '' s'il n'est pas défini
+
+        Lu dans le cache des paramètres : aucune requête.
+        """
+        return Settings.invoice_prefix()
+
+    @staticmethod
+    def _last_used(cursor, prefix, year, month):
+        """Plus grand numéro déjà présent dans ventes (initialisation du compteur)"""
+        base = InvoiceNumberAllocator.format_number(prefix, year, month, 0)[:-6]
+        sql = """
+        SELECT numero_facture FROM ventes
+        WHERE numero_facture LIKE %s
+        ORDER BY numero_facture DESC LIMIT 1
+        """
+        cursor.execute(sql, (base.replace('%', r'\%').replace('_', r'\_') + '%',))
+        row = cursor.fetchone()
+        if not row:
+            return 0
+        try:
+            return int(row['numero_facture'][len(base):])
+        except ValueError:
+            return 0
+
+    @staticmethod
+    def allocate(cursor, count=1, prefix=None, when=None):
+        """Réserver `count` numéros consécutifs dans la transaction courante
+
+        Retourne (prefix, year, month, premier, dernier).
+        """
+        when = when or datetime.now()
+        if prefix is None:
+            prefix = InvoiceNumberAllocator.read_prefix()
+        key = (prefix, when.year, when.month)
+
+        update_sql = """
+        UPDATE compteurs_factures
+        SET dernier_numero = LAST_INSERT_ID(dernier_numero + %s)
+        WHERE prefixe = %s AND annee = %s AND mois = %s
+        """
+        cursor.execute(update_sql, (count, *key))
+
+        if cursor.rowcount == 0:
+            # Premier numéro du mois : repartir des factures existantes
+            seed = InvoiceNumberAllocator._last_used(cursor, *key)
+            insert_sql = """
+            INSERT INTO compteurs_factures (prefixe, annee, mois, dernier_numero)
+            VALUES (%s, %s, %s, LAST_INSERT_ID(%s))
+            ON DUPLICATE KEY UPDATE dernier_numero = LAST_INSERT_ID(dernier_numero + %s)
+            """
+            cursor.execute(insert_sql, (*key, seed + count, count))
+
+        cursor.execute("SELECT LAST_INSERT_ID() as dernier")
+        last = int(cursor.fetchone()['dernier'])
+        return prefix, when.year, when.month, last - count + 1, last
+
+    @staticmethod
+    def next_number(cursor, when=None):
+        """Attribuer un numéro dans la transaction courante"""
+        prefix, year, month, first, _ = InvoiceNumberAllocator.allocate(cursor, 1, when=when)
+        return InvoiceNumberAllocator.format_number(prefix, year, month, first)
+
+    @staticmethod
+    def reserve_block(size):
+        """Réserver un bloc de `size` numéros (transaction courte, validée aussitôt)"""
+        if size < 1:
+            return None
+
+        conn = get_connection()
+        if not conn:
+            return None
+
+        cursor = conn.cursor()
+
+        try:
+            conn.begin()
+            prefix, year, month, first, last = InvoiceNumberAllocator.allocate(cursor, size)
+            conn.commit()
+            return InvoiceNumberBlock(prefix, year, month, first, last)
+        except Exception as e:
+            conn.rollback()
+            print(f"Erreur réservation numéros : {e}")
+            return None
+        finally:
+            conn.close()
+
+    @staticmethod
+    def preview():
+        """Prochain numéro probable, sans le réserver (affichage uniquement)"""
+        conn = get_connection()
+        if not conn:
+            return None
+
+        cursor = conn.cursor()
+        when = datetime.now()
+
+        try:
+            prefix = InvoiceNumberAllocator.read_prefix()
+            sql = """
+            SELECT dernier_numero FROM compteurs_factures
+            WHERE prefixe = %s AND annee = %s AND mois = %s
+            """
+            cursor.execute(sql, (prefix, when.year, when.month))
+            row = cursor.fetchone()
+            if row:
+                last = row['dernier_numero']
+            else:
+                last = InvoiceNumberAllocator._last_used(cursor, prefix, when.year, when.month)
+            return InvoiceNumberAllocator.format_number(prefix, when.year, when.month, last + 1)
+        except Exception as e:
+            print(f"Erreur numéro facture : {e}")
+            return None
+        finally:
+            conn.close()
@@ -1,4 +1,6 @@
 from database.connection import get_connection
+from models.fulltext import FullTextQuery
+from models.product_catalog import ProductCatalog
 from datetime import datetime
 
 
@@ -21,6 +23,7 @@ class Product:
             cursor.execute(sql, (category_id, nom, description, prix_achat, prix_vente, stock_min, stock_actuel))
             conn.commit()
             product_id = cursor.lastrowid
+            ProductCatalog.invalidate()
             
             # Enregistrer le mouvement de stock initial
             if stock_actuel > 0:
@@ -100,6 +103,7 @@ class Product:
         try:
             cursor.execute(sql, (category_id, nom, description, prix_achat, prix_vente, stock_min, product_id))
             conn.commit()
+            ProductCatalog.invalidate()
             return True, "Produit modifié"
         except Exception as e:
             return False, f"Erreur : {str(e)}"
@@ -130,6 +134,7 @@ class Product:
         try:
             cursor.execute(delete_sql, (product_id,))
             conn.commit()
+            ProductCatalog.forget(product_id)
             return True, "Produit supprimé"
         except Exception as e:
             return False, f"Erreur : {str(e)}"
@@ -170,6 +175,7 @@ class Product:
             Product.record_stock_movement(product_id, quantite, type_mouvement, user_id, description)
             
             conn.commit()
+            ProductCatalog.invalidate()
             return True, f"Stock mis à jour ({quantite:+d})"
         except Exception as e:
             return False, f"Erreur : {str(e)}"
@@ -258,26 +264,57 @@ class Product:
             return 0
         return ((prix_vente - prix_achat) / prix_achat) * 100
 
+    SEARCH_PAGE_SIZE = 50
+
+    @staticmethod
+    def build_search_query(search_term, category_id=None):
+        """Traduire la saisie (et la catégorie) en requête SQL de recherche
+
+        FULLTEXT sur idx_search(nom, description) avec repli en préfixe sur
+        le nom (idx_nom) pour les mots courts, voir FullTextQuery.build. La
+        catégorie est un critère SQL (idx_category). Retourne
+        (where, order, params), ou None s'il n'y a rien à chercher.
+        """
+        query = FullTextQuery.build(search_term, "p.nom, p.description", ("p.nom",), "p.nom, p.id")
+        if query is None:
+            if category_id is None:
+                return None
+            query = ("", "p.nom, p.id", [])
+
+        where, order, params = query
+        if category_id is not None:
+            where = f"p.category_id = %s AND {where}" if where else "p.category_id = %s"
+            params = [category_id] + params
+        return where, order, params
+
     @staticmethod
-    def search(search_term):
-        """Rechercher un produit"""
+    def search(search_term, category_id=None, limit=None, offset=0):
+        """Rechercher des produits, les plus pertinents d'abord
+
+        Résultats paginés : `limit` lignes (SEARCH_PAGE_SIZE par défaut) à
+        partir de `offset`.
+        """
+        query = Product.build_search_query(search_term, category_id)
+        if not query:
+            return []
+        where, order, params = query
+
         conn = get_connection()
         if not conn:
             return []
 
         cursor = conn.cursor()
-        sql = """
+        sql = f"""
         SELECT p.*, c.nom as categorie
         FROM produits p
         LEFT JOIN categories c ON p.category_id = c.id
-        WHERE p.nom LIKE %s OR p.description LIKE %s
-        ORDER BY p.nom
+        WHERE {where}
+        ORDER BY {order}
+        LIMIT %s OFFSET %s
         """
 
-        search_pattern = f"%{search_term}%"
-
         try:
-            cursor.execute(sql, (search_pattern, search_pattern))
+            cursor.execute(sql, (*params, limit or Product.SEARCH_PAGE_SIZE, offset))
             products = cursor.fetchall()
         except Exception as e:
             print(f"Erreur recherche : {e}")
@@ -0,0 +1,310 @@
+import threading
+import time
+
+from database.connection import get_connection
+from config import CATALOG_MAX_AGE
+from utils.prefix_index import PrefixIndex
+
+
+class ProductCatalog:
+    """Cache du catalogue produits partagé par toute l'application
+
+    Chargé une fois (produits + nom de catégorie), puis tenu à jour par
+    lectures incrémentales : seules les lignes dont updated_at (ou celui de
+    leur catégorie) a bougé depuis la dernière synchronisation sont relues.
+    Une relecture a lieu au plus tard toutes les CATALOG_MAX_AGE secondes,
+    ou dès la lecture suivante après invalidate() (appelé par les écritures
+    sur produits, catégories et ventes de ce processus).
+
+    Les requêtes de synchronisation sont faites hors de _lock : pendant une
+    relecture, les autres threads continuent d'être servis depuis la
+    mémoire ; seule l'application des lignes lues prend le verrou.
+
+    Les lignes retournées sont partagées : ne pas les modifier.
+    """
+
+    _lock = threading.RLock()           # structures en mémoire
+    _refresh_lock = threading.Lock()    # une synchronisation à la fois
+    _products = None        # id -> ligne ; None tant que rien n'est chargé
+    _by_category = {}       # category_id -> {id, ...}
+    _by_name = {}           # nom en minuscules -> id
+    _ordered = None         # liste triée comme Product.get_all (catégorie, nom)
+    _index = None           # PrefixIndex des noms, reconstruit si un nom change
+    _index_version = 0      # incrémenté à chaque abandon de l'index
+    _last_sync = None       # horloge MySQL au début de la dernière lecture
+    _checked_at = 0.0
+    _generation = 0         # incrémenté par invalidate()
+    _synced_generation = 0  # génération vue par la dernière synchronisation
+    _stats = {
+        'hits': 0, 'refreshes': 0, 'full_loads': 0,
+        'rows_refreshed': 0, 'refresh_ms_total': 0.0, 'last_refresh_ms': 0.0
+    }
+
+    SELECT_SQL = """
+    SELECT p.*, c.nom as categorie
+    FROM produits p
+    LEFT JOIN categories c ON p.category_id = c.id
+    """
+
+    # ==================== Lecture ====================
+
+    @staticmethod
+    def all():
+        """Tous les produits, triés par catégorie puis nom"""
+        if not ProductCatalog._ensure_fresh():
+            return []
+        with ProductCatalog._lock:
+            if ProductCatalog._products is None:
+                return []
+            if ProductCatalog._ordered is None:
+                ProductCatalog._ordered = sorted(
+                    ProductCatalog._products.values(),
+                    key=lambda p: ((p.get('categorie') or '').lower(), (p.get('nom') or '').lower())
+                )
+            return list(ProductCatalog._ordered)
+
+    @staticmethod
+    def get(product_id):
+        """Un produit par ID (None si inconnu)"""
+        if not ProductCatalog._ensure_fresh():
+            return None
+        with ProductCatalog._lock:
+            return (ProductCatalog._products or {}).get(product_id)
+
+    @staticmethod
+    def by_category(category_id):
+        """Produits d'une catégorie, triés par nom"""
+        if not ProductCatalog._ensure_fresh():
+            return []
+        with ProductCatalog._lock:
+            ids = ProductCatalog._by_category.get(category_id, ()) if ProductCatalog._products else ()
+            products = [ProductCatalog._products[i] for i in ids]
+        return sorted(products, key=lambda p: (p.get('nom') or '').lower())
+
+    @staticmethod
+    def find_by_name(nom):
+        """Produit dont le nom est exactement `nom` (casse ignorée)"""
+        if not ProductCatalog._ensure_fresh():
+            return None
+        with ProductCatalog._lock:
+            product_id = ProductCatalog._by_name.get((nom or '').strip().lower())
+            return (ProductCatalog._products or {}).get(product_id)
+
+    @staticmethod
+    def search_index():
+        """Index de recherche à la frappe (utils.prefix_index) sur les noms
+
+        Codes exacts : l'ID du produit. Reconstruit seulement quand un nom
+        change ou qu'un produit apparaît / disparaît, pas à chaque
+        mouvement de stock. Quelques centaines de ms pour 40k produits : à
+        appeler hors du thread de l'interface. La construction se fait hors
+        de _lock sur une copie des noms ; l'index n'est gardé que si aucun
+        nom n'a changé entre-temps.
+        """
+        if not ProductCatalog._ensure_fresh():
+            return PrefixIndex()
+        with ProductCatalog._lock:
+            if ProductCatalog._products is None:
+                return PrefixIndex()
+            if ProductCatalog._index is not None:
+                return ProductCatalog._index
+            version = ProductCatalog._index_version
+            entries = [
+                (p['id'], p.get('nom'), (str(p['id']),))
+                for p in ProductCatalog._products.values()
+            ]
+
+        index = PrefixIndex(entries)
+        with ProductCatalog._lock:
+            if ProductCatalog._index_version == version and ProductCatalog._products is not None:
+                ProductCatalog._index = index
+        return index
+
+    # ==================== Invalidation ====================
+
+    @staticmethod
+    def invalidate():
+        """Relire les changements à la prochaine lecture"""
+        with ProductCatalog._lock:
+            ProductCatalog._generation += 1
+
+    @staticmethod
+    def forget(product_id):
+        """Retirer un produit supprimé (les suppressions n'ont pas d'updated_at)"""
+        with ProductCatalog._lock:
+            if ProductCatalog._products is not None:
+                ProductCatalog._remove(product_id)
+            ProductCatalog._generation += 1
+
+    @staticmethod
+    def clear():
+        """Vider le cache (rechargement complet à la prochaine lecture)"""
+        with ProductCatalog._lock:
+            ProductCatalog._products = None
+            ProductCatalog._by_category = {}
+            ProductCatalog._by_name = {}
+            ProductCatalog._ordered = None
+            ProductCatalog._drop_index()
+            ProductCatalog._last_sync = None
+            ProductCatalog._synced_generation = ProductCatalog._generation
+
+    @staticmethod
+    def stats():
+        """Compteurs du cache : lectures servies sans requête, relectures, coût"""
+        with ProductCatalog._lock:
+            stats = dict(ProductCatalog._stats)
+            size = len(ProductCatalog._products or {})
+        reads = stats['hits'] + stats['refreshes'] + stats['full_loads']
+        syncs = stats['refreshes'] + stats['full_loads']
+        stats['size'] = size
+        stats['hit_rate'] = stats['hits'] / reads if reads else 0.0
+        stats['avg_refresh_ms'] = stats['refresh_ms_total'] / syncs if syncs else 0.0
+        return stats
+
+    # ==================== Synchronisation ====================
+
+    @staticmethod
+    def _ensure_fresh():
+        """Charger / resynchroniser si nécessaire ; False si indisponible
+
+        Appelé hors de _lock. Après invalidate(), la lecture attend la
+        synchronisation (elle doit voir l'écriture qui a invalidé) ; quand
+        le cache a seulement dépassé CATALOG_MAX_AGE et qu'une autre
+        synchronisation est en cours, les données actuelles sont servies.
+        """
+        if not ProductCatalog._needs_refresh():
+            with ProductCatalog._lock:
+                ProductCatalog._stats['hits'] += 1
+            return True
+
+        only_aged = (ProductCatalog._products is not None
+                     and ProductCatalog._generation == ProductCatalog._synced_generation)
+        if not ProductCatalog._refresh_lock.acquire(blocking=not only_aged):
+            with ProductCatalog._lock:
+                ProductCatalog._stats['hits'] += 1
+            return True
+        try:
+            # Une synchronisation concurrente a pu suffire pendant l'attente
+            if ProductCatalog._needs_refresh():
+                return ProductCatalog._sync(full=ProductCatalog._products is None)
+            return ProductCatalog._products is not None
+        finally:
+            ProductCatalog._refresh_lock.release()
+
+    @staticmethod
+    def _needs_refresh():
+        return (ProductCatalog._products is None
+                or ProductCatalog._generation != ProductCatalog._synced_generation
+                or time.monotonic() - ProductCatalog._checked_at > CATALOG_MAX_AGE)
+
+    @staticmethod
+    def refresh(full=False):
+        """Relire le catalogue (complet, ou seulement les lignes modifiées)"""
+        with ProductCatalog._refresh_lock:
+            return ProductCatalog._sync(full)
+
+    @staticmethod
+    def _sync(full):
+        """Synchronisation (appelant : _refresh_lock) : requêtes hors de _lock"""
+        conn = get_connection()
+        if not conn:
+            return ProductCatalog._products is not None
+
+        cursor = conn.cursor()
+        started = time.perf_counter()
+        generation = ProductCatalog._generation
+        full = full or ProductCatalog._products is None
+
+        try:
+            # Horloge MySQL lue avant les lignes : une modification
+            # concurrente sera relue à la synchronisation suivante
+            cursor.execute("SELECT NOW() as maintenant")
+            now = cursor.fetchone()['maintenant']
+
+            if full:
+                cursor.execute(ProductCatalog.SELECT_SQL)
+                rows = cursor.fetchall()
+            else:
+                rows = ProductCatalog._fetch_changes(cursor, ProductCatalog._last_sync)
+
+            cursor.execute("SELECT COUNT(*) as total FROM produits")
+            total = cursor.fetchone()['total']
+        except Exception as e:
+            print(f"Erreur catalogue produits : {e}")
+            return ProductCatalog._products is not None
+        finally:
+            conn.close()
+
+        with ProductCatalog._lock:
+            if full:
+                ProductCatalog._products = {}
+                ProductCatalog._by_category = {}
+                ProductCatalog._by_name = {}
+                ProductCatalog._drop_index()
+            elif ProductCatalog._products is None:
+                # Vidé par clear() pendant la lecture
+                return False
+            for row in rows:
+                ProductCatalog._put(row)
+            ProductCatalog._ordered = None
+
+            missing = len(ProductCatalog._products) != total and not full
+            if not missing:
+                ProductCatalog._last_sync = now
+                ProductCatalog._checked_at = time.monotonic()
+                ProductCatalog._synced_generation = generation
+
+                elapsed = (time.perf_counter() - started) * 1000
+                stats = ProductCatalog._stats
+                stats['full_loads' if full else 'refreshes'] += 1
+                stats['rows_refreshed'] += len(rows)
+                stats['refresh_ms_total'] += elapsed
+                stats['last_refresh_ms'] = elapsed
+
+        if missing:
+            # Suppression faite ailleurs : repartir d'une lecture complète
+            return ProductCatalog._sync(full=True)
+        return True
+
+    @staticmethod
+    def _fetch_changes(cursor, since):
+        """Produits modifiés, ou dont la catégorie a été modifiée, depuis `since`"""
+        # >= : updated_at est à la seconde, une ligne de la même seconde que
+        # la synchronisation précédente est relue plutôt que perdue
+        cursor.execute(f"""
+            {ProductCatalog.SELECT_SQL}
+            WHERE p.updated_at >= %s
+            UNION
+            {ProductCatalog.SELECT_SQL}
+            WHERE c.updated_at >= %s
+        """, (since, since))
+        return cursor.fetchall()
+
+    @staticmethod
+    def _put(row):
+        old = ProductCatalog._products.get(row['id'])
+        if old is None or old.get('nom') != row.get('nom'):
+            ProductCatalog._drop_index()
+        ProductCatalog._remove(row['id'], keep_index=True)
+        ProductCatalog._products[row['id']] = row
+        ProductCatalog._by_category.setdefault(row.get('category_id'), set()).add(row['id'])
+        ProductCatalog._by_name[(row.get('nom') or '').strip().lower()] = row['id']
+
+    @staticmethod
+    def _drop_index():
+        """Index à reconstruire (appelant : _lock)"""
+        ProductCatalog._index = None
+        ProductCatalog._index_version += 1
+
+    @staticmethod
+    def _remove(product_id, keep_index=False):
+        old = ProductCatalog._products.pop(product_id, None)
+        if old is None:
+            return
+        if not keep_index:
+            ProductCatalog._drop_index()
+        ProductCatalog._by_category.get(old.get('category_id'), set()).discard(product_id)
+        name = (old.get('nom') or '').strip().lower()
+        if ProductCatalog._by_name.get(name) == product_id:
+            del ProductCatalog._by_name[name]
+        ProductCatalog._ordered = None
@@ -1,55 +1,40 @@
-from database.connection import get_connection
+from config import SALE_SET_BASED_STOCK
+from database.connection import get_connection, stream_query
 from datetime import datetime
-import random
-import string
+from models.invoice_number import InvoiceNumberAllocator
+from models.product_catalog import ProductCatalog
+from models.sales_rollup import SalesRollup
+from utils.helpers import resolve_period
 
 
 class Sale:
 
     @staticmethod
     def generate_invoice_number():
-        """Générer un numéro de facture unique"""
-        conn = get_connection()
-        if not conn:
-            return None
-        
-        cursor = conn.cursor()
-        
-        # Numéro au format: YYYY/MMMM/NNNNNN
-        current_date = datetime.now()
-        year = current_date.year
-        month = current_date.month
-        
-        # Chercher le dernier numéro du mois
-        sql = """
-        SELECT numero_facture FROM ventes 
-        WHERE numero_facture LIKE %s
-        ORDER BY numero_facture DESC LIMIT 1
+        """Prochain numéro de facture (aperçu, non réservé)
+
+        Le numéro définitif est attribué par Sale.create, dans la
+        transaction de la vente (voir InvoiceNumberAllocator).
         """
-        pattern = f"{year}/{month:02d}/%"
-        cursor.execute(sql, (pattern,))
-        result = cursor.fetchone()
-        conn.close()
-        
-        if result:
-            # Accéder au résultat comme un dictionnaire
-            numero = result['numero_facture']
-            last_num = numero.split('/')[-1]
-            next_num = str(int(last_num) + 1).zfill(6)
-        else:
-            next_num = "000001"
-        
-        return f"{year}/{month:02d}/{next_num}"
+        return InvoiceNumberAllocator.preview()
 
     @staticmethod
-    def create(client_id, user_id, articles, tva=18, remise=0, remise_type='montant', notes=""):
+    def create(client_id, user_id, articles, tva=18, remise=0, remise_type='montant', notes="",
+               numero_facture=None, set_based_stock=None):
         """Créer une nouvelle vente
         
         articles = [
             {'produit_id': 1, 'quantite': 2, 'prix_unitaire': 100},
             ...
         ]
+        numero_facture: numéro pris dans un InvoiceNumberBlock ; sinon un
+        numéro est attribué dans la transaction de la vente.
+        set_based_stock: décrémenter le stock en une requête pour toute la
+        vente au lieu du trigger ligne à ligne (SALE_SET_BASED_STOCK par défaut)
         """
+        if set_based_stock is None:
+            set_based_stock = SALE_SET_BASED_STOCK
+
         # Validation des paramètres
         if not client_id or not user_id:
             return False, "client_id et user_id sont obligatoires"
@@ -69,22 +54,14 @@ class Sale:
         cursor = conn.cursor()
         
         try:
-            # Générer numéro de facture
-            numero_facture = Sale.generate_invoice_number()
+            conn.begin()
+
+            # Attribuer le numéro de facture (compteur verrouillé jusqu'au COMMIT)
             if not numero_facture:
-                return False, "Erreur génération numéro facture"
+                numero_facture = InvoiceNumberAllocator.next_number(cursor)
             
             # Calculer le montant total
-            montant_ht = sum(art['quantite'] * art['prix_unitaire'] for art in articles)
-            
-            # Appliquer remise
-            if remise_type == 'pourcentage':
-                montant_remise = montant_ht * (remise / 100)
-            else:
-                montant_remise = remise
-            
-            montant_ht = montant_ht - montant_remise
-            montant_ttc = montant_ht * (1 + tva / 100)
+            montant_ttc = Sale.compute_total(articles, tva, remise, remise_type)
             
             # Créer la vente
             vente_sql = """
@@ -98,21 +75,27 @@ class Sale:
                 conn.rollback()
                 return False, "Erreur lors de la création de la vente (lastrowid non obtenu)"
             
-            # Ajouter les articles
+            # Ajouter les articles (executemany => un seul INSERT multi-lignes)
             detail_sql = """
             INSERT INTO ventes_details (vente_id, produit_id, quantite, prix_unitaire)
             VALUES (%s, %s, %s, %s)
             """
-            
-            for article in articles:
-                cursor.execute(detail_sql, (
-                    vente_id, 
-                    article['produit_id'],
-                    article['quantite'],
-                    article['prix_unitaire']
-                ))
-            
+
+            if set_based_stock:
+                # Le trigger after_vente_insert ne fait rien tant que la variable est posée
+                cursor.execute("SET @ventes_stock_ensemble = 1")
+
+            cursor.executemany(detail_sql, [
+                (vente_id, article['produit_id'], article['quantite'], article['prix_unitaire'])
+                for article in articles
+            ])
+
+            if set_based_stock:
+                Sale.apply_stock_movements(cursor, [vente_id])
+
             conn.commit()
+            # Stock décrémenté (trigger ou mise à jour ensembliste)
+            ProductCatalog.invalidate()
             return True, f"Vente créée avec succès"
         
         except Exception as e:
@@ -122,8 +105,59 @@ class Sale:
             print(f"Traceback détaillé: {traceback.format_exc()}")
             return False, f"Erreur : {error_msg}"
         finally:
+            if set_based_stock:
+                # La connexion retourne au pool : ne pas laisser le trigger désactivé
+                try:
+                    cursor.execute("SET @ventes_stock_ensemble = NULL")
+                except Exception:
+                    conn.discard()
             conn.close()
 
+    @staticmethod
+    def compute_total(articles, tva=18, remise=0, remise_type='montant'):
+        """Montant TTC d'une vente (remise appliquée sur le HT)"""
+        montant_ht = sum(art['quantite'] * art['prix_unitaire'] for art in articles)
+
+        # Appliquer remise
+        if remise_type == 'pourcentage':
+            montant_remise = montant_ht * (remise / 100)
+        else:
+            montant_remise = remise
+
+        montant_ht = montant_ht - montant_remise
+        return montant_ht * (1 + tva / 100)
+
+    @staticmethod
+    def apply_stock_movements(cursor, vente_ids):
+        """Décrémenter le stock et journaliser les mouvements de ventes
+
+        Équivalent ensembliste du trigger after_vente_insert : deux requêtes
+        pour l'ensemble des ventes au lieu de deux par ligne.
+        """
+        placeholders = ', '.join(['%s'] * len(vente_ids))
+        stock_sql = f"""
+        UPDATE produits p
+        JOIN (
+            SELECT produit_id, SUM(quantite) as quantite
+            FROM ventes_details
+            WHERE vente_id IN ({placeholders})
+            GROUP BY produit_id
+        ) t ON t.produit_id = p.id
+        SET p.stock_actuel = p.stock_actuel - t.quantite
+        """
+        cursor.execute(stock_sql, vente_ids)
+
+        movements_sql = f"""
+        INSERT INTO mouvements_stock (produit_id, user_id, type, quantite, description)
+        SELECT vd.produit_id, v.user_id, 'vente', vd.quantite,
+               CONCAT('Vente facture: ', v.numero_facture)
+        FROM ventes_details vd
+        JOIN ventes v ON vd.vente_id = v.id
+        WHERE vd.vente_id IN ({placeholders})
+        ORDER BY vd.id
+        """
+        cursor.execute(movements_sql, vente_ids)
+
     @staticmethod
     def get_by_id(vente_id):
         """Récupérer une vente par ID"""
@@ -155,27 +189,88 @@ class Sale:
         return vente
 
     @staticmethod
-    def get_all(limit=100, offset=0):
-        """Récupérer toutes les ventes"""
+    def get_all(limit=100, offset=0, after=None, statut=None):
+        """Récupérer toutes les ventes (les plus récentes d'abord)
+
+        after: (date_vente, id) de la dernière vente de la page précédente.
+        Pagination par clé : la page suivante part directement de cette
+        position dans idx_date au lieu de relire les `offset` premières
+        lignes. offset reste accepté pour les appelants existants.
+        statut: ne retourner que les ventes de ce statut
+        """
         conn = get_connection()
         if not conn:
             return []
 
         cursor = conn.cursor()
-        sql = """
+        conditions = []
+        params = []
+
+        if after:
+            date_vente, vente_id = after
+            conditions.append("(v.date_vente < %s OR (v.date_vente = %s AND v.id < %s))")
+            params.extend((date_vente, date_vente, vente_id))
+        if statut:
+            conditions.append("v.statut = %s")
+            params.append(statut)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"""
         SELECT v.*, CONCAT(c.nom, ' ', c.prenom) as client_nom, u.username as vendeur
         FROM ventes v
         LEFT JOIN clients c ON v.client_id = c.id
         LEFT JOIN users u ON v.user_id = u.id
-        ORDER BY v.date_vente DESC
+        {where}
+        ORDER BY v.date_vente DESC, v.id DESC
         LIMIT %s OFFSET %s
         """
-        cursor.execute(sql, (limit, offset))
-        ventes = cursor.fetchall()
-        conn.close()
+        params.extend((limit, 0 if after else offset))
+
+        try:
+            cursor.execute(sql, params)
+            ventes = cursor.fetchall()
+        except Exception as e:
+            print(f"Erreur ventes : {e}")
+            ventes = []
+        finally:
+            conn.close()
 
         return ventes
 
+    @staticmethod
+    def iter_all(statut=None):
+        """Toutes les ventes, au fil de l'eau (exports), dans l'ordre de get_all
+
+        Générateur sur un curseur côté serveur : rien n'est chargé d'un bloc.
+        """
+        where, params = ("WHERE v.statut = %s", (statut,)) if statut else ("", ())
+        yield from stream_query(f"""
+        SELECT v.numero_facture, v.date_vente, v.montant_total, v.montant_paye,
+               v.montant_reste, v.statut, CONCAT(c.nom, ' ', c.prenom) as client_nom
+        FROM ventes v
+        LEFT JOIN clients c ON v.client_id = c.id
+        {where}
+        ORDER BY v.date_vente DESC, v.id DESC
+        """, params)
+
+    @staticmethod
+    def count(statut=None):
+        """Nombre de ventes (du statut donné)"""
+        conn = get_connection()
+        if not conn:
+            return 0
+
+        cursor = conn.cursor()
+        where, params = ("WHERE statut = %s", (statut,)) if statut else ("", ())
+        try:
+            cursor.execute(f"SELECT COUNT(*) as total FROM ventes {where}", params)
+            return cursor.fetchone()['total']
+        except Exception as e:
+            print(f"Erreur comptage ventes : {e}")
+            return 0
+        finally:
+            conn.close()
+
     @staticmethod
     def get_details(vente_id):
         """Récupérer les détails d'une vente"""
@@ -207,10 +302,18 @@ class Sale:
         sql = "UPDATE ventes SET statut = %s WHERE id = %s"
 
         try:
+            conn.begin()
+            watermark = SalesRollup.read_watermark(cursor, lock='share')
+            cursor.execute("SELECT date_vente FROM ventes WHERE id = %s", (vente_id,))
+            vente = cursor.fetchone()
+
             cursor.execute(sql, (statut, vente_id))
+            if vente:
+                SalesRollup.refresh_day(cursor, vente['date_vente'], watermark)
             conn.commit()
             return True, f"Statut mis à jour : {statut}"
         except Exception as e:
+            conn.rollback()
             return False, f"Erreur : {str(e)}"
         finally:
             conn.close()
@@ -225,8 +328,12 @@ class Sale:
         cursor = conn.cursor()
         
         try:
+            # Verrouiller le watermark des agrégats avant la vente (même ordre que leur construction)
+            conn.begin()
+            watermark = SalesRollup.read_watermark(cursor, lock='share')
+
             # Récupérer la vente
-            select_sql = "SELECT montant_total, montant_paye FROM ventes WHERE id = %s"
+            select_sql = "SELECT montant_total, montant_paye, date_vente FROM ventes WHERE id = %s FOR UPDATE"
             cursor.execute(select_sql, (vente_id,))
             result = cursor.fetchone()
             
@@ -267,7 +374,10 @@ class Sale:
             VALUES (%s, %s, %s)
             """
             cursor.execute(payment_sql, (vente_id, montant_paye, datetime.now()))
-            
+
+            # Un paiement sur une vente d'un jour clos modifie ses agrégats
+            SalesRollup.refresh_day(cursor, result['date_vente'], watermark)
+
             conn.commit()
             montant_restant = montant_total - nouveau_paiement
             return True, f"Paiement enregistré : {montant_paye:.2f} XOF (Montant restant: {montant_restant:.2f} XOF)"
@@ -385,6 +495,11 @@ class Sale:
         cursor = conn.cursor()
 
         try:
+            conn.begin()
+            watermark = SalesRollup.read_watermark(cursor, lock='share')
+            cursor.execute("SELECT date_vente FROM ventes WHERE id = %s", (vente_id,))
+            vente = cursor.fetchone()
+
             # Supprimer les détails
             delete_details_sql = "DELETE FROM ventes_details WHERE vente_id = %s"
             cursor.execute(delete_details_sql, (vente_id,))
@@ -396,7 +511,10 @@ class Sale:
             # Supprimer la vente
             delete_vente_sql = "DELETE FROM ventes WHERE id = %s"
             cursor.execute(delete_vente_sql, (vente_id,))
-            
+
+            if vente:
+                SalesRollup.refresh_day(cursor, vente['date_vente'], watermark)
+
             conn.commit()
             return True, "Vente supprimée"
         except Exception as e:
@@ -421,11 +539,11 @@ class Sale:
             SUM(CASE WHEN statut = 'payee' THEN montant_total ELSE 0 END) as ca_paye,
             SUM(CASE WHEN statut IN ('en_cours', 'partielle') THEN (montant_total - montant_paye) ELSE 0 END) as montant_reste_total
         FROM ventes
-        WHERE DATE(date_vente) = CURDATE()
+        WHERE date_vente >= %s AND date_vente < %s
         """
 
         try:
-            cursor.execute(sql)
+            cursor.execute(sql, resolve_period('today'))
             stats = cursor.fetchone()
             conn.close()
             
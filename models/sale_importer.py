@@ -0,0 +1,462 @@
+from config import SALE_SET_BASED_STOCK
+from database.connection import get_connection
+from datetime import date, datetime
+from models.invoice_number import InvoiceNumberAllocator
+from models.product_catalog import ProductCatalog
+from models.sale import Sale
+from models.sales_rollup import SalesRollup
+from utils.validators import SaleValidator
+import csv
+import json
+import os
+
+import pymysql
+
+
+# Colonnes reconnues (CSV : une ligne par article, ventes regroupées par `ref`)
+SALE_FIELDS = ('ref', 'date', 'client_id', 'client_telephone', 'client_email',
+               'user_id', 'vendeur', 'tva', 'remise', 'remise_type', 'montant_paye', 'notes')
+LINE_FIELDS = ('produit_id', 'produit', 'quantite', 'prix_unitaire')
+
+
+class SaleImportError(Exception):
+    """Erreur sur une vente du fichier (reportée, n'arrête pas l'import)"""
+
+
+class SaleImporter:
+    """Import en masse de ventes (remontées de caisse en fin de journée)
+
+    Fichier CSV (une ligne par article, colonnes SALE_FIELDS + LINE_FIELDS)
+    ou JSONL (une vente par ligne avec une liste `lignes`, ou une ligne
+    d'article par ligne comme en CSV). Les articles d'une même vente
+    partagent la même `ref` et doivent se suivre.
+
+    - clients, vendeurs et produits sont résolus en mémoire (chargés une fois)
+    - les ventes sont validées par lots avec SaleValidator
+    - chaque lot est écrit en une transaction : numéros de facture réservés
+      par mois en un seul appel, ventes / lignes / paiements en INSERT
+      multi-lignes
+    - une vente en erreur est reportée dans `errors` sans arrêter l'import ;
+      si l'écriture d'un lot échoue, ses ventes sont rejouées une à une pour
+      isoler la ou les ventes fautives
+    """
+
+    def __init__(self, chunk_size=500, default_user_id=None, tva=18, set_based_stock=None):
+        self.chunk_size = chunk_size
+        self.default_user_id = default_user_id
+        self.default_tva = tva
+        self.set_based_stock = SALE_SET_BASED_STOCK if set_based_stock is None else set_based_stock
+
+        self.errors = []
+        self.imported_sales = 0
+        self.imported_lines = 0
+        self._days = set()
+
+        self._clients = {}
+        self._clients_by_phone = {}
+        self._clients_by_email = {}
+        self._users = {}
+        self._products = {}
+        self._products_by_name = {}
+
+    # ==================== Import ====================
+
+    def run(self, path):
+        """Importer un fichier CSV ou JSONL, retourne (success, message)"""
+        conn = get_connection()
+        if not conn:
+            return False, "Erreur de connexion à la base de données"
+
+        cursor = conn.cursor()
+
+        try:
+            self._load_lookups(cursor)
+            prefix = InvoiceNumberAllocator.read_prefix()
+
+            chunk = []
+            for sale in self._read_sales(path):
+                prepared = self._prepare(sale)
+                if prepared:
+                    chunk.append(prepared)
+                if len(chunk) >= self.chunk_size:
+                    self._write_chunk(conn, cursor, self._validate(chunk), prefix)
+                    chunk = []
+            if chunk:
+                self._write_chunk(conn, cursor, self._validate(chunk), prefix)
+
+            self._refresh_rollup(conn, cursor)
+        except OSError as e:
+            return False, f"Erreur lecture fichier : {e}{self._partial()}"
+        except UnicodeDecodeError as e:
+            return False, (f"Erreur lecture fichier : encodage non UTF-8 (octet {e.object[e.start:e.start + 1]!r} "
+                           f"en position {e.start}), réenregistrer le fichier en UTF-8{self._partial()}")
+        except pymysql.MySQLError as e:
+            return False, f"Erreur base de données : {e}{self._partial()}"
+        finally:
+            conn.close()
+
+        message = f"{self.imported_sales} vente(s) importée(s), {self.imported_lines} ligne(s)"
+        if self.errors:
+            message += f", {len(self.errors)} erreur(s)"
+        return not self.errors, message
+
+    def _partial(self):
+        """Rappel des ventes déjà importées quand l'import s'arrête en cours de route"""
+        return f" ({self.imported_sales} vente(s) déjà importée(s))" if self.imported_sales else ""
+
+    def write_report(self, path):
+        """Écrire le rapport d'erreurs (CSV : ligne, ref, erreur)"""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter=';')
+            writer.writerow(['ligne', 'ref', 'erreur'])
+            for error in self.errors:
+                writer.writerow([error['ligne'], error['ref'], error['erreur']])
+
+    def _error(self, sale, message):
+        self.errors.append({'ligne': sale['ligne'], 'ref': sale['ref'], 'erreur': message})
+
+    # ==================== Lecture ====================
+
+    def _read_sales(self, path):
+        """Itérer sur les ventes du fichier (regroupe les articles par ref)"""
+        extension = os.path.splitext(path)[1].lower()
+        rows = self._read_jsonl(path) if extension in ('.jsonl', '.ndjson') else self._read_csv(path)
+
+        seen = set()
+        current = None
+        for line_number, row in rows:
+            if 'lignes' in row:
+                # Vente complète sur une ligne JSONL
+                if current:
+                    yield current
+                    current = None
+                sale = self._new_sale(line_number, row)
+                sale['lignes'] = [(line_number, item) for item in row.get('lignes') or []]
+                if sale['ref'] in seen:
+                    self._error(sale, "Référence de vente en double dans le fichier")
+                    continue
+                seen.add(sale['ref'])
+                yield sale
+                continue
+
+            ref = str(row.get('ref') or '').strip()
+            if current and current['ref'] == ref:
+                current['lignes'].append((line_number, row))
+                continue
+
+            if current:
+                yield current
+            current = self._new_sale(line_number, row)
+            current['lignes'].append((line_number, row))
+            if ref in seen:
+                self._error(current, "Référence de vente en double ou lignes non consécutives")
+                current = None
+                continue
+            seen.add(ref)
+
+        if current:
+            yield current
+
+    @staticmethod
+    def _new_sale(line_number, row):
+        sale = {field: row.get(field) for field in SALE_FIELDS}
+        sale['ref'] = str(row.get('ref') or '').strip()
+        sale['_erreur'] = row.get('_erreur')
+        sale['ligne'] = line_number
+        sale['lignes'] = []
+        return sale
+
+    @staticmethod
+    def _read_csv(path):
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            sample = f.read(4096)
+            f.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                dialect = csv.excel
+            reader = csv.DictReader(f, dialect=dialect)
+            for row in reader:
+                yield reader.line_num, {k.strip(): (v.strip() if isinstance(v, str) else v)
+                                        for k, v in row.items() if k}
+
+    @staticmethod
+    def _read_jsonl(path):
+        with open(path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    row = {'ref': f"ligne {line_number}", 'lignes': None, '_erreur': f"JSON invalide : {e}"}
+                yield line_number, row
+
+    # ==================== Résolution / validation ====================
+
+    def _load_lookups(self, cursor):
+        """Charger en mémoire les correspondances clients / vendeurs / produits"""
+        cursor.execute("SELECT id, telephone, email FROM clients")
+        for row in cursor.fetchall():
+            self._clients[row['id']] = row
+            if row['telephone']:
+                self._clients_by_phone[self._normalize_phone(row['telephone'])] = row['id']
+            if row['email']:
+                self._clients_by_email[row['email'].strip().lower()] = row['id']
+
+        cursor.execute("SELECT id, username FROM users WHERE is_active = TRUE")
+        for row in cursor.fetchall():
+            self._users[row['id']] = row['id']
+            self._users[row['username'].lower()] = row['id']
+
+        cursor.execute("SELECT id, nom, prix_vente FROM produits")
+        for row in cursor.fetchall():
+            self._products[row['id']] = float(row['prix_vente'])
+            self._products_by_name[row['nom'].strip().lower()] = row['id']
+
+    @staticmethod
+    def _normalize_phone(phone):
+        return ''.join(c for c in str(phone) if c.isdigit())
+
+    @staticmethod
+    def _number(value, default, cast=float):
+        if value is None or value == '':
+            return default
+        if isinstance(value, str):
+            value = value.replace(',', '.').replace(' ', '')
+        return cast(value)
+
+    def _resolve_client(self, sale):
+        if sale.get('client_id') not in (None, ''):
+            client_id = int(sale['client_id'])
+            if client_id not in self._clients:
+                raise SaleImportError(f"Client {client_id} introuvable")
+            return client_id
+        if sale.get('client_telephone'):
+            client_id = self._clients_by_phone.get(self._normalize_phone(sale['client_telephone']))
+            if client_id:
+                return client_id
+        if sale.get('client_email'):
+            client_id = self._clients_by_email.get(str(sale['client_email']).strip().lower())
+            if client_id:
+                return client_id
+        raise SaleImportError("Client introuvable (client_id, client_telephone ou client_email)")
+
+    def _resolve_user(self, sale):
+        if sale.get('user_id') not in (None, ''):
+            user_id = self._users.get(int(sale['user_id']))
+        elif sale.get('vendeur'):
+            user_id = self._users.get(str(sale['vendeur']).strip().lower())
+        else:
+            user_id = self.default_user_id
+        if not user_id:
+            raise SaleImportError("Vendeur introuvable ou inactif")
+        return user_id
+
+    def _resolve_article(self, line_number, row):
+        if row.get('produit_id') not in (None, ''):
+            produit_id = int(row['produit_id'])
+            if produit_id not in self._products:
+                raise SaleImportError(f"Ligne {line_number} : produit {produit_id} introuvable")
+        else:
+            produit_id = self._products_by_name.get(str(row.get('produit') or '').strip().lower())
+            if not produit_id:
+                raise SaleImportError(f"Ligne {line_number} : produit « {row.get('produit')} » introuvable")
+
+        return {
+            'produit_id': produit_id,
+            'quantite': self._number(row.get('quantite'), 0, int),
+            'prix_unitaire': self._number(row.get('prix_unitaire'), self._products[produit_id])
+        }
+
+    @staticmethod
+    def _parse_date(value):
+        if not value:
+            return datetime.now()
+        if isinstance(value, datetime):
+            return value
+        value = str(value).strip().replace('T', ' ')
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return datetime.strptime(value, '%d/%m/%Y %H:%M' if ':' in value else '%d/%m/%Y')
+
+    def _prepare(self, sale):
+        """Résoudre les identifiants et convertir les valeurs (None si erreur)"""
+        try:
+            if not sale['ref']:
+                raise SaleImportError("Référence de vente (ref) manquante")
+            if sale.get('_erreur'):
+                raise SaleImportError(sale['_erreur'])
+
+            date_vente = self._parse_date(sale.get('date'))
+            if date_vente > datetime.now():
+                raise SaleImportError("Date de vente dans le futur")
+
+            return {
+                'ref': sale['ref'],
+                'ligne': sale['ligne'],
+                'date_vente': date_vente,
+                'client_id': self._resolve_client(sale),
+                'user_id': self._resolve_user(sale),
+                'articles': [self._resolve_article(n, row) for n, row in sale['lignes']],
+                'tva': self._number(sale.get('tva'), self.default_tva),
+                'remise': self._number(sale.get('remise'), 0),
+                'remise_type': sale.get('remise_type') or 'montant',
+                'montant_paye': self._number(sale.get('montant_paye'), 0),
+                'notes': sale.get('notes') or f"Import {sale['ref']}"
+            }
+        except SaleImportError as e:
+            self._error(sale, str(e))
+        except (TypeError, ValueError) as e:
+            self._error(sale, f"Valeur invalide : {e}")
+        return None
+
+    def _validate(self, chunk):
+        """Valider un lot et calculer les montants des ventes valides"""
+        invalid = dict(SaleValidator.validate_batch(chunk))
+
+        valid = []
+        for index, sale in enumerate(chunk):
+            if index in invalid:
+                self._error(sale, invalid[index])
+                continue
+
+            sale['montant_total'] = round(Sale.compute_total(
+                sale['articles'], sale['tva'], sale['remise'], sale['remise_type']
+            ), 2)
+            if sale['montant_paye'] < 0 or sale['montant_paye'] > sale['montant_total']:
+                self._error(sale, f"Montant payé invalide (total : {sale['montant_total']})")
+                continue
+            valid.append(sale)
+        return valid
+
+    # ==================== Écriture ====================
+
+    def _write_chunk(self, conn, cursor, sales, prefix):
+        """Écrire un lot en une transaction ; en cas d'échec, vente par vente"""
+        if not sales:
+            return
+        try:
+            self._insert(conn, cursor, sales, prefix)
+        except Exception as e:
+            if len(sales) == 1:
+                self._error(sales[0], f"Erreur : {str(e)}")
+                return
+            for sale in sales:
+                try:
+                    self._insert(conn, cursor, [sale], prefix)
+                except Exception as e:
+                    self._error(sale, f"Erreur : {str(e)}")
+
+    def _insert(self, conn, cursor, sales, prefix):
+        try:
+            conn.begin()
+
+            # Numéros de facture : un bloc par mois, dans l'ordre chronologique
+            sales = sorted(sales, key=lambda s: s['date_vente'])
+            by_month = {}
+            for sale in sales:
+                by_month.setdefault((sale['date_vente'].year, sale['date_vente'].month), []).append(sale)
+            for (year, month), month_sales in by_month.items():
+                _, _, _, first, _ = InvoiceNumberAllocator.allocate(
+                    cursor, len(month_sales), prefix=prefix, when=datetime(year, month, 1)
+                )
+                for offset, sale in enumerate(month_sales):
+                    sale['numero_facture'] = InvoiceNumberAllocator.format_number(
+                        prefix, year, month, first + offset
+                    )
+
+            vente_sql = """
+            INSERT INTO ventes (numero_facture, client_id, user_id, date_vente, montant_total,
+                                montant_paye, statut, notes)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            cursor.executemany(vente_sql, [
+                (s['numero_facture'], s['client_id'], s['user_id'], s['date_vente'], s['montant_total'],
+                 s['montant_paye'], self._status(s), s['notes'])
+                for s in sales
+            ])
+
+            numeros = [s['numero_facture'] for s in sales]
+            placeholders = ', '.join(['%s'] * len(numeros))
+            cursor.execute(
+                f"SELECT id, numero_facture FROM ventes WHERE numero_facture IN ({placeholders})",
+                numeros
+            )
+            ids = {row['numero_facture']: row['id'] for row in cursor.fetchall()}
+
+            if self.set_based_stock:
+                cursor.execute("SET @ventes_stock_ensemble = 1")
+
+            detail_sql = """
+            INSERT INTO ventes_details (vente_id, produit_id, quantite, prix_unitaire)
+            VALUES (%s, %s, %s, %s)
+            """
+            cursor.executemany(detail_sql, [
+                (ids[s['numero_facture']], a['produit_id'], a['quantite'], a['prix_unitaire'])
+                for s in sales for a in s['articles']
+            ])
+
+            if self.set_based_stock:
+                Sale.apply_stock_movements(cursor, list(ids.values()))
+
+            payments = [
+                (ids[s['numero_facture']], s['montant_paye'], s['date_vente'])
+                for s in sales if s['montant_paye'] > 0
+            ]
+            if payments:
+                cursor.executemany(
+                    "INSERT INTO paiements (vente_id, montant, date_paiement) VALUES (%s, %s, %s)",
+                    payments
+                )
+
+            conn.commit()
+            ProductCatalog.invalidate()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if self.set_based_stock:
+                self._reset_stock_flag(conn, cursor)
+
+        self.imported_sales += len(sales)
+        self.imported_lines += sum(len(s['articles']) for s in sales)
+        self._days.update(s['date_vente'].date() for s in sales)
+
+    @staticmethod
+    def _reset_stock_flag(conn, cursor):
+        """Remettre @ventes_stock_ensemble à NULL sans masquer l'erreur en cours
+
+        Si la remise à zéro échoue (connexion perdue), la connexion est
+        fermée plutôt que rendue au pool avec la variable encore à 1.
+        """
+        try:
+            cursor.execute("SET @ventes_stock_ensemble = NULL")
+        except pymysql.MySQLError as e:
+            print(f"Erreur remise à zéro de @ventes_stock_ensemble : {e}")
+            conn.discard()
+
+    @staticmethod
+    def _status(sale):
+        if sale['montant_paye'] >= sale['montant_total']:
+            return 'payee'
+        if sale['montant_paye'] > 0:
+            return 'partielle'
+        return 'en_cours'
+
+    def _refresh_rollup(self, conn, cursor):
+        """Recalculer les jours clos déjà agrégés qui ont reçu des ventes"""
+        days = sorted(day for day in self._days if day < date.today())
+        if not days:
+            return
+        try:
+            conn.begin()
+            watermark = SalesRollup.read_watermark(cursor, lock='share')
+            for day in days:
+                SalesRollup.refresh_day(cursor, day, watermark)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Erreur agrégats ventes : {e}")
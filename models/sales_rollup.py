@@ -0,0 +1,279 @@
+from datetime import date, datetime, time, timedelta
+
+
+WATERMARK_KEY = 'rollup_ventes_jusqu_au'
+
+# Nombre de jours reconstruits par transaction lors d'un rattrapage
+CHUNK_DAYS = 31
+
+# Jours agrégés au plus par lecture (dashboard, statistiques) : le watermark
+# avance à chaque lecture, les jours restants sont lus dans `ventes` en
+# attendant les suivantes
+READ_CATCH_UP_DAYS = 7
+
+
+class SalesRollup:
+    """Agrégats journaliers des ventes (table ventes_daily_rollup)
+
+    Seuls les jours clos (antérieurs à aujourd'hui) sont agrégés. Le dernier
+    jour agrégé (« watermark ») est stocké dans `parametres` ; tout ce qui
+    est postérieur est lu directement dans `ventes`.
+
+    Les méthodes reçoivent une connexion ou un curseur existant pour
+    s'exécuter dans la transaction de l'appelant.
+    """
+
+    # Watermark connu du processus (seulement quand il vaut hier)
+    _watermark = None
+
+    # ==================== Watermark ====================
+
+    @staticmethod
+    def read_watermark(cursor, lock=None):
+        """Lire le dernier jour agrégé (None si la table n'a jamais été construite)
+
+        lock: None, 'share' (LOCK IN SHARE MODE) ou 'update' (FOR UPDATE)
+        """
+        sql = "SELECT valeur FROM parametres WHERE cle = %s"
+        if lock == 'share':
+            sql += " LOCK IN SHARE MODE"
+        elif lock == 'update':
+            sql += " FOR UPDATE"
+
+        cursor.execute(sql, (WATERMARK_KEY,))
+        row = cursor.fetchone()
+        if not row or not row['valeur']:
+            return None
+        return date.fromisoformat(row['valeur'])
+
+    @staticmethod
+    def write_watermark(cursor, day):
+        sql = """
+        INSERT INTO parametres (cle, valeur, description)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE valeur = VALUES(valeur)
+        """
+        cursor.execute(sql, (WATERMARK_KEY, day.isoformat(), "Dernier jour agrégé dans ventes_daily_rollup"))
+
+    # ==================== Construction ====================
+
+    @staticmethod
+    def rebuild_days(cursor, first_day, last_day):
+        """Recalculer les agrégats des jours [first_day, last_day] (inclus)
+
+        Le montant de la vente (total, payé, reste) et la vente elle-même
+        sont répartis entre ses lignes au prorata du sous-total, pour que la
+        somme d'une journée redonne exactement les totaux de `ventes`. Une
+        vente sans ligne est rattachée au produit 0.
+        """
+        start = datetime.combine(first_day, time.min)
+        end = datetime.combine(last_day + timedelta(days=1), time.min)
+
+        cursor.execute(
+            "DELETE FROM ventes_daily_rollup WHERE jour >= %s AND jour <= %s",
+            (first_day, last_day)
+        )
+
+        sql = """
+        INSERT INTO ventes_daily_rollup
+            (jour, category_id, produit_id, user_id, quantite, nombre_lignes,
+             ca_lignes, nombre_ventes, ca, montant_paye, montant_reste)
+        SELECT jour, category_id, produit_id, user_id,
+               SUM(quantite), COUNT(ligne_id), SUM(sous_total),
+               SUM(part), SUM(part * montant_total),
+               SUM(part * montant_paye), SUM(part * montant_reste)
+        FROM (
+            SELECT DATE(v.date_vente) as jour,
+                   COALESCE(p.category_id, 0) as category_id,
+                   COALESCE(vd.produit_id, 0) as produit_id,
+                   v.user_id,
+                   vd.id as ligne_id,
+                   COALESCE(vd.quantite, 0) as quantite,
+                   COALESCE(vd.sous_total, 0) as sous_total,
+                   v.montant_total, v.montant_paye, v.montant_reste,
+                   CASE WHEN COALESCE(t.total_lignes, 0) = 0
+                        THEN 1.000000 / GREATEST(COALESCE(t.nombre_lignes, 0), 1)
+                        ELSE vd.sous_total * 1.000000 / t.total_lignes
+                   END as part
+            FROM ventes v
+            LEFT JOIN ventes_details vd ON vd.vente_id = v.id
+            LEFT JOIN produits p ON vd.produit_id = p.id
+            LEFT JOIN (
+                SELECT vd2.vente_id, SUM(vd2.sous_total) as total_lignes, COUNT(*) as nombre_lignes
+                FROM ventes_details vd2
+                JOIN ventes v2 ON vd2.vente_id = v2.id
+                WHERE v2.date_vente >= %s AND v2.date_vente < %s
+                GROUP BY vd2.vente_id
+            ) t ON t.vente_id = v.id
+            WHERE v.date_vente >= %s AND v.date_vente < %s
+        ) lignes
+        GROUP BY jour, category_id, produit_id, user_id
+        """
+        cursor.execute(sql, (start, end, start, end))
+
+    @staticmethod
+    def ensure_up_to_date(conn, max_days=None):
+        """Agréger les jours clos manquants et retourner le watermark
+
+        Rattrape par tranches de CHUNK_DAYS jours, une transaction par
+        tranche, en verrouillant la ligne du watermark pour qu'un seul poste
+        construise à la fois. Retourne None en cas d'erreur : les
+        statistiques retombent alors sur les tables brutes.
+
+        max_days: rattrapage borné (lectures) : une seule tranche d'au plus
+        max_days jours est construite par appel, à partir du premier jour
+        manquant. Le watermark avance donc à chaque lecture ; les jours
+        restants sont lus dans les tables brutes en attendant les suivantes.
+        """
+        yesterday = date.today() - timedelta(days=1)
+        if SalesRollup._watermark == yesterday:
+            return yesterday
+
+        cursor = conn.cursor()
+
+        chunk_days = CHUNK_DAYS if max_days is None else min(max_days, CHUNK_DAYS)
+
+        try:
+            while True:
+                conn.begin()
+                stored = SalesRollup.read_watermark(cursor, lock='update')
+                first_day = SalesRollup._first_missing_day(cursor, stored)
+                watermark = first_day - timedelta(days=1)
+
+                if first_day > yesterday:
+                    if stored is None:
+                        SalesRollup.write_watermark(cursor, min(watermark, yesterday))
+                    conn.commit()
+                    break
+
+                last_day = min(first_day + timedelta(days=chunk_days - 1), yesterday)
+                SalesRollup.rebuild_days(cursor, first_day, last_day)
+                SalesRollup.write_watermark(cursor, last_day)
+                conn.commit()
+
+                if max_days is not None:
+                    watermark = last_day
+                    break
+
+            SalesRollup._watermark = watermark if watermark >= yesterday else None
+            return min(watermark, yesterday)
+        except Exception as e:
+            conn.rollback()
+            print(f"Erreur agrégats ventes : {e}")
+            return None
+
+    @staticmethod
+    def _first_missing_day(cursor, watermark):
+        """Premier jour à agréger (jour de la première vente si jamais construit)"""
+        if watermark is not None:
+            return watermark + timedelta(days=1)
+        cursor.execute("SELECT MIN(date_vente) as premiere FROM ventes")
+        row = cursor.fetchone()
+        return row['premiere'].date() if row and row['premiere'] else date.today()
+
+    @staticmethod
+    def rebuild_all(conn, since=None):
+        """Reconstruire les agrégats depuis `since` (date), ou entièrement"""
+        cursor = conn.cursor()
+
+        try:
+            conn.begin()
+            watermark = SalesRollup.read_watermark(cursor, lock='update')
+            if since is None:
+                cursor.execute("DELETE FROM ventes_daily_rollup")
+                cursor.execute("DELETE FROM parametres WHERE cle = %s", (WATERMARK_KEY,))
+            else:
+                cursor.execute("DELETE FROM ventes_daily_rollup WHERE jour >= %s", (since,))
+                # Ne jamais avancer le watermark au-delà des jours réellement construits
+                if watermark is not None and watermark >= since:
+                    SalesRollup.write_watermark(cursor, since - timedelta(days=1))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            return False, f"Erreur : {str(e)}"
+
+        SalesRollup._watermark = None
+        watermark = SalesRollup.ensure_up_to_date(conn)
+        if watermark is None:
+            return False, "Erreur lors de la reconstruction des agrégats"
+        return True, f"Agrégats à jour jusqu'au {watermark.isoformat()}"
+
+    # ==================== Maintenance incrémentale ====================
+
+    @staticmethod
+    def refresh_day(cursor, day, watermark):
+        """Recalculer un jour déjà agrégé après modification d'une de ses ventes
+
+        À appeler dans la transaction de la modification, avec le watermark
+        lu (verrou partagé) avant de toucher à la vente. Les jours non encore
+        agrégés seront construits au prochain rattrapage.
+        """
+        if isinstance(day, datetime):
+            day = day.date()
+        if watermark is None or day is None or day > watermark or day >= date.today():
+            return
+        SalesRollup.rebuild_days(cursor, day, day)
+
+    # ==================== Lecture ====================
+
+    @staticmethod
+    def split_range(start, end, watermark):
+        """Découper [start, end) entre agrégats et lignes brutes
+
+        Retourne (jours, bruts) :
+        - jours : (premier_jour, jour_suivant_le_dernier) lu dans les
+          agrégats, ou None
+        - bruts : liste de bornes (début, fin) à lire dans `ventes` ;
+          fin vaut None si la période est ouverte
+        """
+        if watermark is None:
+            return None, [(start, end)]
+
+        # Seuls les jours entiers, clos et agrégés sont lus dans les agrégats
+        first = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+        last = watermark + timedelta(days=1)
+        if end is not None:
+            last = min(last, end.date())
+
+        if first >= last:
+            return None, [(start, end)]
+
+        first_dt = datetime.combine(first, time.min)
+        last_dt = datetime.combine(last, time.min)
+
+        raw = []
+        if start < first_dt:
+            raw.append((start, first_dt))
+        if end is None or last_dt < end:
+            raw.append((last_dt, end))
+        return (first, last), raw
+
+    @staticmethod
+    def union_sql(bounds, watermark, rollup_select, raw_select):
+        """Assembler une source UNION ALL agrégats + lignes brutes
+
+        rollup_select et raw_select contiennent un marqueur {where},
+        remplacé respectivement par un filtre sur r.jour et sur
+        v.date_vente. Retourne (sql, params).
+        """
+        days, raw = SalesRollup.split_range(bounds[0], bounds[1], watermark)
+
+        parts = []
+        params = []
+
+        if days:
+            parts.append(rollup_select.format(where="r.jour >= %s AND r.jour < %s"))
+            params.extend(days)
+
+        if raw:
+            conditions = []
+            for raw_start, raw_end in raw:
+                if raw_end is None:
+                    conditions.append("v.date_vente >= %s")
+                    params.append(raw_start)
+                else:
+                    conditions.append("(v.date_vente >= %s AND v.date_vente < %s)")
+                    params.extend((raw_start, raw_end))
+            parts.append(raw_select.format(where="(" + " OR ".join(conditions) + ")"))
+
+        return "\nUNION ALL\n".join(parts), params
@@ -1,81 +1,200 @@
 from database.connection import get_connection
+from config import SETTINGS_MAX_AGE
 from datetime import datetime
-import bcrypt
+import threading
+import time
+from utils.passwords import hash_password
 
 
 class Settings:
+    """Paramètres de l'application (table parametres) et utilisateurs
+
+    Les paramètres sont lus en une requête puis servis depuis la mémoire ;
+    relus après SETTINGS_MAX_AGE secondes (modification depuis un autre
+    poste) ou dès la lecture suivante après une mise à jour.
+    """
+
+    COMPANY_KEYS = ['company_name', 'company_address', 'company_phone', 'company_email', 'company_website', 'company_logo']
+    GENERAL_KEYS = ['currency', 'tva_default', 'invoice_prefix', 'date_format', 'timezone']
+
+    # Conversion des valeurs (stockées en texte) pour get()
+    TYPES = {'tva_default': float}
+    DEFAULTS = {'currency': 'XOF', 'tva_default': 18.0, 'invoice_prefix': ''}
+
+    _lock = threading.Lock()
+    _cache = None           # cle -> valeur (texte) ; None tant que rien n'est chargé
+    _loaded_at = 0.0
+
+    # ==================== Cache des paramètres ====================
 
-    # ==================== Company Configuration ====================
-    
     @staticmethod
-    def get_company_info():
-        """Récupérer les informations entreprise"""
+    def all():
+        """Tous les paramètres {cle: valeur texte}, depuis le cache"""
+        with Settings._lock:
+            expired = time.monotonic() - Settings._loaded_at > SETTINGS_MAX_AGE
+            if Settings._cache is None or expired:
+                values = Settings._load()
+                if values is not None:
+                    Settings._cache = values
+                    Settings._loaded_at = time.monotonic()
+            return dict(Settings._cache or {})
+
+    @staticmethod
+    def _load():
+        """Lire toute la table parametres (une requête) ; None si indisponible"""
         conn = get_connection()
         if not conn:
-            return {}
+            return None
 
         cursor = conn.cursor()
-        keys = ['company_name', 'company_address', 'company_phone', 'company_email', 'company_website', 'company_logo']
-        
+
         try:
-            result = {}
-            for key in keys:
-                sql = "SELECT valeur FROM parametres WHERE cle = %s"
-                cursor.execute(sql, (key,))
-                row = cursor.fetchone()
-                result[key] = row['valeur'] if row else ""
-            
-            conn.close()
-            return result
+            cursor.execute("SELECT cle, valeur FROM parametres")
+            return {row['cle']: row['valeur'] for row in cursor.fetchall()}
         except Exception as e:
-            print(f"Erreur récupération infos : {e}")
+            print(f"Erreur chargement paramètres : {e}")
+            return None
+        finally:
             conn.close()
-            return {}
 
     @staticmethod
-    def update_company_info(company_name, address, phone, email, website, logo_path=None):
-        """Mettre à jour les informations entreprise"""
+    def get(key, default=None):
+        """Valeur typée d'un paramètre (TYPES), sinon `default` / DEFAULTS"""
+        return Settings._typed(key, Settings.all().get(key), default)
+
+    @staticmethod
+    def peek(key, default=None):
+        """Comme get(), sans requête ni attente : cache actuel (même expiré)
+
+        Pour le thread de l'interface ; DEFAULTS tant que rien n'est chargé.
+        """
+        return Settings._typed(key, (Settings._cache or {}).get(key), default)
+
+    @staticmethod
+    def _typed(key, value, default):
+        if default is None:
+            default = Settings.DEFAULTS.get(key)
+        if value is None or value == '':
+            return default
+        convert = Settings.TYPES.get(key)
+        if convert:
+            try:
+                return convert(value)
+            except (ValueError, TypeError):
+                return default
+        return value
+
+    @staticmethod
+    def set_many(values):
+        """Enregistrer plusieurs paramètres en une requête
+
+        Les valeurs actuelles des clés sont relues sur la connexion
+        d'écriture (le cache peut ignorer une modification faite depuis un
+        autre poste) ; seules celles qui diffèrent sont écrites, par un
+        seul INSERT ... ON DUPLICATE KEY UPDATE multi-lignes (clé unique
+        `cle`). Le cache est ensuite mis à jour sans relecture complète.
+
+        Retourne (succès, message, clés modifiées).
+        """
+        values = {key: str(value) for key, value in values.items() if value is not None}
+        if not values:
+            return True, "Aucune modification", []
+
         conn = get_connection()
         if not conn:
-            return False, "Erreur de connexion"
+            return False, "Erreur de connexion", []
 
         cursor = conn.cursor()
-        
+
         try:
-            updates = [
-                ('company_name', company_name),
-                ('company_address', address),
-                ('company_phone', phone),
-                ('company_email', email),
-                ('company_website', website)
-            ]
-            
-            if logo_path:
-                updates.append(('company_logo', logo_path))
-            
-            for key, value in updates:
-                # Vérifier si la clé existe
-                check_sql = "SELECT id FROM parametres WHERE cle = %s"
-                cursor.execute(check_sql, (key,))
-                exists = cursor.fetchone()
-                
-                if exists:
-                    update_sql = "UPDATE parametres SET valeur = %s WHERE cle = %s"
-                    cursor.execute(update_sql, (value, key))
-                else:
-                    insert_sql = """
-                    INSERT INTO parametres (cle, valeur, description)
-                    VALUES (%s, %s, %s)
-                    """
-                    cursor.execute(insert_sql, (key, value, f"Configuration {key}"))
-            
+            conn.begin()
+            cursor.execute(
+                f"SELECT cle, valeur FROM parametres WHERE cle IN ({', '.join(['%s'] * len(values))}) FOR UPDATE",
+                list(values)
+            )
+            current = {row['cle']: row['valeur'] for row in cursor.fetchall()}
+            changed = {key: value for key, value in values.items() if current.get(key) != value}
+
+            if changed:
+                sql = f"""
+                INSERT INTO parametres (cle, valeur, description)
+                VALUES {', '.join(['(%s, %s, %s)'] * len(changed))}
+                ON DUPLICATE KEY UPDATE valeur = VALUES(valeur)
+                """
+                params = []
+                for key, value in changed.items():
+                    params.extend((key, value, f"Configuration {key}"))
+                cursor.execute(sql, params)
             conn.commit()
-            conn.close()
-            return True, "Entreprise mise à jour"
         except Exception as e:
             conn.rollback()
+            return False, f"Erreur : {str(e)}", []
+        finally:
             conn.close()
-            return False, f"Erreur : {str(e)}"
+
+        with Settings._lock:
+            if Settings._cache is not None:
+                Settings._cache.update(current)
+                Settings._cache.update(changed)
+
+        if not changed:
+            return True, "Aucune modification", []
+        return True, f"{len(changed)} paramètre(s) mis à jour", list(changed)
+
+    @staticmethod
+    def invalidate():
+        """Relire les paramètres à la prochaine lecture"""
+        with Settings._lock:
+            Settings._cache = None
+
+    @staticmethod
+    def tva_default():
+        return Settings.get('tva_default')
+
+    @staticmethod
+    def currency():
+        return Settings.get('currency')
+
+    @staticmethod
+    def invoice_prefix():
+        """Préfixe des numéros de facture, '' s'il n'est pas défini"""
+        return (Settings.get('invoice_prefix') or '').strip().strip('/')
+
+    # ==================== Company Configuration ====================
+    
+    @staticmethod
+    def get_company_info():
+        """Récupérer les informations entreprise"""
+        values = Settings.all()
+        return {key: values.get(key) or "" for key in Settings.COMPANY_KEYS}
+
+    @staticmethod
+    def get_invoice_company_info():
+        """En-tête des factures PDF (utils.pdf_generator.InvoiceGenerator)"""
+        info = Settings.get_company_info()
+        return {
+            'name': info['company_name'] or 'Votre Entreprise',
+            'address': info['company_address'] or 'Adresse',
+            'phone': info['company_phone'] or '',
+            'email': info['company_email'] or ''
+        }
+
+    @staticmethod
+    def update_company_info(company_name, address, phone, email, website, logo_path=None):
+        """Mettre à jour les informations entreprise"""
+        updates = {
+            'company_name': company_name,
+            'company_address': address,
+            'company_phone': phone,
+            'company_email': email,
+            'company_website': website
+        }
+
+        if logo_path:
+            updates['company_logo'] = logo_path
+
+        success, message, _ = Settings.set_many(updates)
+        return success, "Entreprise mise à jour" if success else message
 
     # ==================== User Management ====================
     
@@ -121,7 +240,7 @@ class Settings:
                 return False, "Utilisateur ou email déjà existant"
             
             # Hasher le mot de passe
-            password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+            password_hash = hash_password(password)
             
             # Créer l'utilisateur
             insert_sql = """
@@ -188,7 +307,7 @@ class Settings:
         cursor = conn.cursor()
         
         try:
-            password_hash = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+            password_hash = hash_password(new_password)
             
             update_sql = "UPDATE users SET password_hash = %s WHERE id = %s"
             cursor.execute(update_sql, (password_hash, user_id))
@@ -230,85 +349,22 @@ class Settings:
     @staticmethod
     def get_general_settings():
         """Récupérer les paramètres généraux"""
-        conn = get_connection()
-        if not conn:
-            return {}
-
-        cursor = conn.cursor()
-        keys = ['currency', 'tva_default', 'invoice_prefix', 'date_format', 'timezone']
-        
-        try:
-            result = {}
-            for key in keys:
-                sql = "SELECT valeur FROM parametres WHERE cle = %s"
-                cursor.execute(sql, (key,))
-                row = cursor.fetchone()
-                result[key] = row['valeur'] if row else ""
-            
-            conn.close()
-            return result
-        except Exception as e:
-            print(f"Erreur paramètres : {e}")
-            conn.close()
-            return {}
+        values = Settings.all()
+        return {key: values.get(key) or "" for key in Settings.GENERAL_KEYS}
 
     @staticmethod
     def update_general_settings(currency='XOF', tva=18, invoice_prefix='FAC', date_format='DD/MM/YYYY', timezone='Europe/Paris'):
         """Mettre à jour les paramètres généraux"""
-        conn = get_connection()
-        if not conn:
-            return False, "Erreur de connexion"
-
-        cursor = conn.cursor()
-        
-        try:
-            settings = [
-                ('currency', currency),
-                ('tva_default', str(tva)),
-                ('invoice_prefix', invoice_prefix),
-                ('date_format', date_format),
-                ('timezone', timezone)
-            ]
-            
-            for key, value in settings:
-                check_sql = "SELECT id FROM parametres WHERE cle = %s"
-                cursor.execute(check_sql, (key,))
-                exists = cursor.fetchone()
-                
-                if exists:
-                    update_sql = "UPDATE parametres SET valeur = %s WHERE cle = %s"
-                    cursor.execute(update_sql, (value, key))
-                else:
-                    insert_sql = """
-                    INSERT INTO parametres (cle, valeur, description)
-                    VALUES (%s, %s, %s)
-                    """
-                    cursor.execute(insert_sql, (key, value, f"Configuration {key}"))
-            
-            conn.commit()
-            conn.close()
-            return True, "Paramètres mis à jour"
-        except Exception as e:
-            conn.rollback()
-            conn.close()
-            return False, f"Erreur : {str(e)}"
+        success, message, _ = Settings.set_many({
+            'currency': currency,
+            'tva_default': tva,
+            'invoice_prefix': invoice_prefix,
+            'date_format': date_format,
+            'timezone': timezone
+        })
+        return success, "Paramètres mis à jour" if success else message
 
     @staticmethod
     def get_setting(key):
-        """Récupérer un paramètre spécifique"""
-        conn = get_connection()
-        if not conn:
-            return None
-
-        cursor = conn.cursor()
-        
-        try:
-            sql = "SELECT valeur FROM parametres WHERE cle = %s"
-            cursor.execute(sql, (key,))
-            row = cursor.fetchone()
-            conn.close()
-            return row['valeur'] if row else None
-        except Exception as e:
-            print(f"Erreur paramètre : {e}")
-            conn.close()
-            return None
+        """Récupérer un paramètre spécifique (texte, None s'il n'existe pas)"""
+        return Settings.all().get(key)
@@ -1,155 +1,329 @@
+import threading
+
 from database.connection import get_connection
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
+from models.product_catalog import ProductCatalog
+from models.sales_rollup import READ_CATCH_UP_DAYS, SalesRollup
+from utils.helpers import resolve_period
+
+
+def _period_bounds(period, start=None, end=None):
+    """Bornes [début, fin) de la période (None si période invalide)"""
+    try:
+        return resolve_period(period, start, end)
+    except ValueError as e:
+        print(f"Erreur période : {e}")
+        return None
 
 
 class Statistics:
 
     @staticmethod
-    def get_ca_by_period(period='today'):
+    def get_ca_by_period(period='today', start=None, end=None):
         """Récupérer le chiffre d'affaires par période
-        
-        period: 'today', 'week', 'month'
+
+        period: 'today', 'week', 'month', 'custom' (avec start/end)
         """
-        conn = get_connection()
-        if not conn:
+        bounds = _period_bounds(period, start, end)
+        if not bounds:
             return 0
+        totals = Statistics._run(Statistics._fetch_totals, None, "Erreur CA", bounds, rollup=True)
+        return totals['ca'] if totals else 0
 
-        cursor = conn.cursor()
-        
-        if period == 'today':
-            sql = "SELECT COALESCE(SUM(montant_total), 0) as ca FROM ventes WHERE DATE(date_vente) = CURDATE()"
-        elif period == 'week':
-            sql = """
-            SELECT COALESCE(SUM(montant_total), 0) as ca FROM ventes 
-            WHERE YEARWEEK(date_vente) = YEARWEEK(NOW())
-            """
-        elif period == 'month':
-            sql = """
-            SELECT COALESCE(SUM(montant_total), 0) as ca FROM ventes 
-            WHERE YEAR(date_vente) = YEAR(NOW())
-            AND MONTH(date_vente) = MONTH(NOW())
-            """
-        else:
+    @staticmethod
+    def get_sales_count(period='today', start=None, end=None):
+        """Récupérer le nombre de ventes par période"""
+        bounds = _period_bounds(period, start, end)
+        if not bounds:
             return 0
-        
+        totals = Statistics._run(Statistics._fetch_totals, None, "Erreur count", bounds, rollup=True)
+        return totals['ventes'] if totals else 0
+
+    @staticmethod
+    def get_top_products(limit=5, period='month', start=None, end=None):
+        """Récupérer les top produits vendus (du mois par défaut)"""
+        bounds = _period_bounds(period, start, end)
+        if not bounds:
+            return []
+        return Statistics._run(Statistics._fetch_top_products, [], "Erreur top produits", bounds, limit, rollup=True)
+
+    @staticmethod
+    def get_top_clients(limit=5, period='month', start=None, end=None):
+        """Récupérer les top clients (du mois par défaut)"""
+        bounds = _period_bounds(period, start, end)
+        if not bounds:
+            return []
+        return Statistics._run(Statistics._fetch_top_clients, [], "Erreur top clients", bounds, limit)
+
+    @staticmethod
+    def get_low_stock_products():
+        """Récupérer les produits en rupture de stock critique"""
+        return Statistics._run(Statistics._fetch_low_stock_products, [], "Erreur stocks bas")
+
+    @staticmethod
+    def get_ca_by_category(period='month', start=None, end=None):
+        """Récupérer le CA par catégorie"""
+        bounds = _period_bounds(period, start, end)
+        if not bounds:
+            return []
+        return Statistics._run(Statistics._fetch_ca_by_category, [], "Erreur CA catégorie", bounds, rollup=True)
+
+    @staticmethod
+    def get_ca_evolution(days=30):
+        """Récupérer l'évolution du CA sur les 30 derniers jours"""
+        return Statistics._run(Statistics._fetch_ca_evolution, [], "Erreur évolution", days, rollup=True)
+
+    @staticmethod
+    def get_payment_status():
+        """Récupérer les statuts de paiement"""
+        return Statistics._run(Statistics._fetch_payment_status, {}, "Erreur paiements")
+
+    @staticmethod
+    def get_dashboard_summary():
+        """Récupérer un résumé complet pour le dashboard
+
+        Toutes les requêtes passent par une seule connexion, et les CA /
+        nombres de ventes du jour, de la semaine et du mois sont calculés
+        en un seul passage. Les jours clos sont lus dans les agrégats
+        journaliers (ventes_daily_rollup), seul le jour courant dans `ventes`.
+        """
+        conn = get_connection()
+        if not conn:
+            return Statistics._empty_summary()
+
         try:
-            cursor.execute(sql)
-            result = cursor.fetchone()
-            conn.close()
-            return float(result['ca'] or 0)
+            return Statistics._fetch_summary(conn)
         except Exception as e:
-            print(f"Erreur CA : {e}")
+            print(f"Erreur résumé dashboard : {e}")
+            return Statistics._empty_summary()
+        finally:
             conn.close()
-            return 0
 
     @staticmethod
-    def get_sales_count(period='today'):
-        """Récupérer le nombre de ventes par période"""
+    def get_dashboard_changes(since=None):
+        """Résumé du dashboard seulement si les données ont changé
+
+        Le repère (get_dashboard_watermark) est relu en une requête
+        indexée ; s'il est identique à `since`, aucune autre requête n'est
+        faite. Sinon le résumé est mis à jour par différences
+        (DashboardSnapshot) : seules les ventes créées ou modifiées depuis
+        le repère précédent sont relues. Retourne (repère, résumé) — résumé
+        None si rien n'a changé depuis `since`, ou si la base est
+        indisponible.
+        """
         conn = get_connection()
         if not conn:
-            return 0
+            return since, None
 
         cursor = conn.cursor()
-        
-        if period == 'today':
-            sql = "SELECT COUNT(*) as count FROM ventes WHERE DATE(date_vente) = CURDATE()"
-        elif period == 'week':
-            sql = """
-            SELECT COUNT(*) as count FROM ventes 
-            WHERE YEARWEEK(date_vente) = YEARWEEK(NOW())
-            """
-        elif period == 'month':
-            sql = """
-            SELECT COUNT(*) as count FROM ventes 
-            WHERE YEAR(date_vente) = YEAR(NOW())
-            AND MONTH(date_vente) = MONTH(NOW())
-            """
-        else:
-            return 0
-        
+
         try:
-            cursor.execute(sql)
-            result = cursor.fetchone()
-            conn.close()
-            return result['count'] or 0
+            # Repère lu avant le résumé : une vente concurrente sera vue au
+            # rafraîchissement suivant
+            watermark = Statistics._fetch_dashboard_watermark(cursor)
+            if since is not None and watermark == since:
+                return since, None
+            return watermark, DashboardSnapshot.summary(conn, watermark)
         except Exception as e:
-            print(f"Erreur count : {e}")
+            print(f"Erreur rafraîchissement dashboard : {e}")
+            return since, None
+        finally:
             conn.close()
-            return 0
 
     @staticmethod
-    def get_top_products(limit=5):
-        """Récupérer les top produits vendus du mois"""
+    def _fetch_summary(conn):
+        rollup_watermark = SalesRollup.ensure_up_to_date(conn, READ_CATCH_UP_DAYS)
+        cursor = conn.cursor()
+
+        month = resolve_period('month')
+        summary = Statistics._fetch_period_totals(cursor, rollup_watermark)
+        summary.update({
+            'top_products': Statistics._fetch_top_products(cursor, month, 5, rollup_watermark),
+            'top_clients': Statistics._fetch_top_clients(cursor, month, 5),
+            'low_stock': Statistics._fetch_low_stock_products(cursor),
+            'ca_by_category': Statistics._fetch_ca_by_category(cursor, month, rollup_watermark),
+            'ca_evolution': Statistics._fetch_ca_evolution(cursor, 30, rollup_watermark),
+            'payment_status': Statistics._fetch_payment_status(cursor)
+        })
+        return summary
+
+    @staticmethod
+    def _fetch_dashboard_watermark(cursor):
+        """Repère de fraîcheur du dashboard
+
+        Dernière vente (PRIMARY), dernière vente modifiée (paiement,
+        annulation : ventes.idx_updated_at), dernier produit modifié (stock :
+        produits.idx_updated_at), et le jour courant (changement de jour).
+        """
+        cursor.execute("""
+            SELECT
+                (SELECT MAX(id) FROM ventes) as derniere_vente,
+                (SELECT MAX(updated_at) FROM ventes) as ventes_modifiees,
+                (SELECT MAX(updated_at) FROM produits) as produits_modifies,
+                CURDATE() as jour
+        """)
+        row = cursor.fetchone()
+        return (row['jour'], row['derniere_vente'], row['ventes_modifiees'], row['produits_modifies'])
+
+    # ==================== Requêtes (curseur fourni) ====================
+
+    @staticmethod
+    def _run(fetch, default, error_label, *args, rollup=False):
+        """Exécuter une requête élémentaire sur une connexion empruntée
+
+        rollup: rattraper les agrégats journaliers (READ_CATCH_UP_DAYS jours
+        au plus) et passer leur watermark en dernier argument
+        """
         conn = get_connection()
         if not conn:
-            return []
+            return default
 
+        if rollup:
+            args = (*args, SalesRollup.ensure_up_to_date(conn, READ_CATCH_UP_DAYS))
         cursor = conn.cursor()
-        sql = """
-        SELECT p.nom, p.category_id, c.nom as categorie, SUM(vd.quantite) as quantite_vendue, 
-               SUM(vd.sous_total) as ca
+
+        try:
+            return fetch(cursor, *args)
+        except Exception as e:
+            print(f"{error_label} : {e}")
+            return default
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _empty_summary():
+        return {
+            'ca_today': 0.0,
+            'ca_week': 0.0,
+            'ca_month': 0.0,
+            'sales_today': 0,
+            'sales_week': 0,
+            'sales_month': 0,
+            'top_products': [],
+            'top_clients': [],
+            'low_stock': [],
+            'ca_by_category': [],
+            'ca_evolution': [],
+            'payment_status': {}
+        }
+
+    # Sources (jour, montants) : agrégats pour les jours clos, `ventes` au-delà
+    _SALES_ROLLUP = """
+        SELECT r.jour as moment, r.ca as ca, r.nombre_ventes as ventes
+        FROM ventes_daily_rollup r
+        WHERE {where}
+        """
+    _SALES_RAW = """
+        SELECT v.date_vente as moment, v.montant_total as ca, 1 as ventes
+        FROM ventes v
+        WHERE {where}
+        """
+    _LINES_ROLLUP = """
+        SELECT r.produit_id, r.quantite, r.ca_lignes as ca, r.nombre_lignes as lignes
+        FROM ventes_daily_rollup r
+        WHERE {where} AND r.produit_id <> 0
+        """
+    _LINES_RAW = """
+        SELECT vd.produit_id, vd.quantite, vd.sous_total as ca, 1 as lignes
         FROM ventes_details vd
-        JOIN produits p ON vd.produit_id = p.id
-        LEFT JOIN categories c ON p.category_id = c.id
         JOIN ventes v ON vd.vente_id = v.id
-        WHERE YEAR(v.date_vente) = YEAR(NOW())
-        AND MONTH(v.date_vente) = MONTH(NOW())
+        WHERE {where}
+        """
+
+    @staticmethod
+    def _fetch_totals(cursor, bounds, watermark=None):
+        """CA et nombre de ventes sur [début, fin)"""
+        source, params = SalesRollup.union_sql(
+            bounds, watermark, Statistics._SALES_ROLLUP, Statistics._SALES_RAW
+        )
+        sql = f"""
+        SELECT COALESCE(SUM(s.ca), 0) as ca, COALESCE(ROUND(SUM(s.ventes)), 0) as ventes
+        FROM ({source}) s
+        """
+        cursor.execute(sql, params)
+        row = cursor.fetchone() or {}
+        return {'ca': float(row.get('ca') or 0), 'ventes': int(row.get('ventes') or 0)}
+
+    @staticmethod
+    def _fetch_period_totals(cursor, watermark=None):
+        """CA et nombre de ventes du jour, de la semaine et du mois (agrégation conditionnelle)"""
+        periods = ('today', 'week', 'month')
+        bounds = {period: resolve_period(period) for period in periods}
+
+        columns = []
+        params = []
+        for period in periods:
+            columns.append(
+                f"COALESCE(SUM(CASE WHEN s.moment >= %s AND s.moment < %s "
+                f"THEN s.ca END), 0) as ca_{period}"
+            )
+            columns.append(
+                f"COALESCE(ROUND(SUM(CASE WHEN s.moment >= %s AND s.moment < %s "
+                f"THEN s.ventes END)), 0) as sales_{period}"
+            )
+            params.extend(bounds[period] * 2)
+
+        # Un seul parcours sur l'union des trois périodes
+        union = (
+            min(start for start, _ in bounds.values()),
+            max(end for _, end in bounds.values())
+        )
+        source, source_params = SalesRollup.union_sql(
+            union, watermark, Statistics._SALES_ROLLUP, Statistics._SALES_RAW
+        )
+        sql = f"""
+        SELECT {', '.join(columns)}
+        FROM ({source}) s
+        """
+        params.extend(source_params)
+
+        cursor.execute(sql, params)
+        row = cursor.fetchone() or {}
+
+        totals = {}
+        for period in periods:
+            totals[f'ca_{period}'] = float(row.get(f'ca_{period}') or 0)
+            totals[f'sales_{period}'] = int(row.get(f'sales_{period}') or 0)
+        return totals
+
+    @staticmethod
+    def _fetch_top_products(cursor, bounds, limit, watermark=None):
+        source, params = SalesRollup.union_sql(
+            bounds, watermark, Statistics._LINES_ROLLUP, Statistics._LINES_RAW
+        )
+        sql = f"""
+        SELECT p.nom, p.category_id, c.nom as categorie, SUM(s.quantite) as quantite_vendue,
+               SUM(s.ca) as ca
+        FROM ({source}) s
+        JOIN produits p ON s.produit_id = p.id
+        LEFT JOIN categories c ON p.category_id = c.id
         GROUP BY p.id, p.nom, c.nom
         ORDER BY quantite_vendue DESC
         LIMIT %s
         """
-        
-        try:
-            cursor.execute(sql, (limit,))
-            products = cursor.fetchall()
-            conn.close()
-            return products
-        except Exception as e:
-            print(f"Erreur top produits : {e}")
-            conn.close()
-            return []
+        cursor.execute(sql, (*params, limit))
+        return cursor.fetchall()
 
     @staticmethod
-    def get_top_clients(limit=5):
-        """Récupérer les top clients du mois"""
-        conn = get_connection()
-        if not conn:
-            return []
-
-        cursor = conn.cursor()
+    def _fetch_top_clients(cursor, bounds, limit):
         sql = """
-        SELECT CONCAT(c.nom, ' ', c.prenom) as client_nom, 
+        SELECT CONCAT(c.nom, ' ', c.prenom) as client_nom,
                COUNT(v.id) as nombre_achats,
                SUM(v.montant_total) as ca_total
         FROM ventes v
         JOIN clients c ON v.client_id = c.id
-        WHERE YEAR(v.date_vente) = YEAR(NOW())
-        AND MONTH(v.date_vente) = MONTH(NOW())
+        WHERE v.date_vente >= %s AND v.date_vente < %s
         GROUP BY c.id, c.nom, c.prenom
         ORDER BY ca_total DESC
         LIMIT %s
         """
-        
-        try:
-            cursor.execute(sql, (limit,))
-            clients = cursor.fetchall()
-            conn.close()
-            return clients
-        except Exception as e:
-            print(f"Erreur top clients : {e}")
-            conn.close()
-            return []
+        cursor.execute(sql, (*bounds, limit))
+        return cursor.fetchall()
 
     @staticmethod
-    def get_low_stock_products():
-        """Récupérer les produits en rupture de stock critique"""
-        conn = get_connection()
-        if not conn:
-            return []
-
-        cursor = conn.cursor()
+    def _fetch_low_stock_products(cursor):
         sql = """
-        SELECT p.id, p.nom, c.nom as categorie, p.stock_actuel, p.stock_min, 
+        SELECT p.id, p.nom, c.nom as categorie, p.stock_actuel, p.stock_min,
                p.prix_vente, (p.stock_min - p.stock_actuel) as deficit
         FROM produits p
         LEFT JOIN categories c ON p.category_id = c.id
@@ -157,134 +331,336 @@ class Statistics:
         ORDER BY deficit DESC
         LIMIT 10
         """
-        
-        try:
-            cursor.execute(sql)
-            products = cursor.fetchall()
-            conn.close()
-            return products
-        except Exception as e:
-            print(f"Erreur stocks bas : {e}")
-            conn.close()
-            return []
+        cursor.execute(sql)
+        return cursor.fetchall()
 
     @staticmethod
-    def get_ca_by_category(period='month'):
-        """Récupérer le CA par catégorie"""
-        conn = get_connection()
-        if not conn:
-            return []
-
-        cursor = conn.cursor()
-        
-        if period == 'today':
-            date_filter = "DATE(v.date_vente) = CURDATE()"
-        elif period == 'week':
-            date_filter = "YEARWEEK(v.date_vente) = YEARWEEK(NOW())"
-        elif period == 'month':
-            date_filter = """YEAR(v.date_vente) = YEAR(NOW())
-            AND MONTH(v.date_vente) = MONTH(NOW())"""
-        else:
-            return []
-        
+    def _fetch_ca_by_category(cursor, bounds, watermark=None):
+        source, params = SalesRollup.union_sql(
+            bounds, watermark, Statistics._LINES_ROLLUP, Statistics._LINES_RAW
+        )
         sql = f"""
-        SELECT c.nom as categorie, SUM(vd.sous_total) as ca, COUNT(vd.id) as nombre_articles
-        FROM ventes_details vd
-        JOIN produits p ON vd.produit_id = p.id
+        SELECT c.nom as categorie, SUM(s.ca) as ca, CAST(SUM(s.lignes) AS SIGNED) as nombre_articles
+        FROM ({source}) s
+        JOIN produits p ON s.produit_id = p.id
         LEFT JOIN categories c ON p.category_id = c.id
-        JOIN ventes v ON vd.vente_id = v.id
-        WHERE {date_filter}
         GROUP BY c.id, c.nom
         ORDER BY ca DESC
         """
-        
-        try:
-            cursor.execute(sql)
-            data = cursor.fetchall()
-            conn.close()
-            return data
-        except Exception as e:
-            print(f"Erreur CA catégorie : {e}")
-            conn.close()
-            return []
+        cursor.execute(sql, params)
+        return cursor.fetchall()
 
     @staticmethod
-    def get_ca_evolution(days=30):
-        """Récupérer l'évolution du CA sur les 30 derniers jours"""
-        conn = get_connection()
-        if not conn:
-            return []
+    def _fetch_product_totals(cursor, bounds, watermark=None):
+        """Quantité, CA et nombre de lignes par produit sur [début, fin)"""
+        source, params = SalesRollup.union_sql(
+            bounds, watermark, Statistics._LINES_ROLLUP, Statistics._LINES_RAW
+        )
+        sql = f"""
+        SELECT s.produit_id, SUM(s.quantite) as quantite, SUM(s.ca) as ca,
+               CAST(SUM(s.lignes) AS SIGNED) as lignes
+        FROM ({source}) s
+        GROUP BY s.produit_id
+        """
+        cursor.execute(sql, params)
+        return cursor.fetchall()
 
-        cursor = conn.cursor()
+    @staticmethod
+    def _fetch_client_totals(cursor, bounds):
+        """Nombre d'achats et CA par client sur [début, fin)"""
         sql = """
-        SELECT DATE(date_vente) as date, SUM(montant_total) as ca, COUNT(*) as nombre_ventes
-        FROM ventes
-        WHERE date_vente >= DATE_SUB(NOW(), INTERVAL %s DAY)
-        GROUP BY DATE(date_vente)
-        ORDER BY date ASC
+        SELECT v.client_id, CONCAT(c.nom, ' ', c.prenom) as client_nom,
+               COUNT(v.id) as nombre_achats,
+               SUM(v.montant_total) as ca_total
+        FROM ventes v
+        JOIN clients c ON v.client_id = c.id
+        WHERE v.date_vente >= %s AND v.date_vente < %s
+        GROUP BY v.client_id, c.nom, c.prenom
         """
-        
-        try:
-            cursor.execute(sql, (days,))
-            data = cursor.fetchall()
-            conn.close()
-            return data
-        except Exception as e:
-            print(f"Erreur évolution : {e}")
-            conn.close()
-            return []
+        cursor.execute(sql, bounds)
+        return cursor.fetchall()
 
     @staticmethod
-    def get_payment_status():
-        """Récupérer les statuts de paiement"""
-        conn = get_connection()
-        if not conn:
-            return {}
+    def _fetch_ca_evolution(cursor, days, watermark=None):
+        # Jours entiers : le premier jour est lu dans les agrégats, comme les autres
+        start = datetime.combine(date.today() - timedelta(days=days), time.min)
+        return Statistics._fetch_daily_totals(cursor, (start, None), watermark)
 
-        cursor = conn.cursor()
+    @staticmethod
+    def _fetch_daily_totals(cursor, bounds, watermark=None):
+        """CA et nombre de ventes par jour sur [début, fin)"""
+        source, params = SalesRollup.union_sql(
+            bounds, watermark, Statistics._SALES_ROLLUP, Statistics._SALES_RAW
+        )
+        sql = f"""
+        SELECT DATE(s.moment) as date, SUM(s.ca) as ca,
+               CAST(ROUND(SUM(s.ventes)) AS SIGNED) as nombre_ventes
+        FROM ({source}) s
+        GROUP BY DATE(s.moment)
+        ORDER BY date ASC
+        """
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+    @staticmethod
+    def _fetch_payment_status(cursor):
         sql = """
-        SELECT 
+        SELECT
             statut,
             COUNT(*) as nombre,
             SUM(montant_total) as montant
         FROM ventes
-        WHERE DATE(date_vente) >= DATE_SUB(NOW(), INTERVAL 30 DAY)
+        WHERE date_vente >= %s AND date_vente < %s
         GROUP BY statut
         """
-        
-        try:
-            cursor.execute(sql)
-            results = cursor.fetchall()
-            conn.close()
-            
-            status_data = {}
-            for row in results:
-                status = row['statut']
-                status_data[status] = {
-                    'nombre': row['nombre'],
-                    'montant': float(row['montant'] or 0)
-                }
-            
-            return status_data
-        except Exception as e:
-            print(f"Erreur paiements : {e}")
-            conn.close()
-            return {}
+        # Les 30 derniers jours calendaires, aujourd'hui inclus
+        cursor.execute(sql, resolve_period('custom', date.today() - timedelta(days=29)))
+        results = cursor.fetchall()
+
+        status_data = {}
+        for row in results:
+            status = row['statut']
+            status_data[status] = {
+                'nombre': row['nombre'],
+                'montant': float(row['montant'] or 0)
+            }
+
+        return status_data
+
+
+class DashboardSnapshot:
+    """Résumé du dashboard tenu à jour par différences
+
+    Deux parties sont gardées en mémoire :
+    - les jours clos de la fenêtre du dashboard (semaine, mois, évolution
+      sur 30 jours) : totaux, ventes par produit et par client, CA par
+      jour ; calculés une fois par jour (agrégats journaliers + `ventes`) ;
+    - le jour courant, vente par vente (montant, client, lignes).
+
+    À chaque changement du repère, seules les ventes créées ou modifiées
+    depuis le repère précédent (id > dernière vente vue, ou updated_at >=
+    dernière modification vue) sont relues : celles du jour remplacent leur
+    entrée, une vente d'un jour clos de la fenêtre fait recalculer les
+    jours clos. Un nombre de ventes différent de celui en mémoire
+    (suppression, transaction validée après le repère) fait recalculer la
+    partie concernée.
+
+    Stocks bas et statuts de paiement, modifiés sur place, sont relus à
+    chaque fois (requêtes bornées). Noms et catégories des produits
+    viennent de ProductCatalog.
+    """
+
+    _lock = threading.Lock()
+    _day = None             # jour courant des deux parties
+    _closed = None          # jours clos ; None : à recalculer
+    _today = None           # vente_id -> vente du jour ; None : à relire
+    _last_id = 0            # dernière vente vue (repère)
+    _changed_since = None   # dernière modification vue (repère)
 
     @staticmethod
-    def get_dashboard_summary():
-        """Récupérer un résumé complet pour le dashboard"""
+    def summary(conn, watermark):
+        """Résumé au repère `watermark` (Statistics._fetch_dashboard_watermark)
+
+        Le repère doit avoir été lu avant l'appel : une vente concurrente
+        est relue au rafraîchissement suivant.
+        """
+        with DashboardSnapshot._lock:
+            return DashboardSnapshot._update(conn, watermark)
+
+    @staticmethod
+    def clear():
+        with DashboardSnapshot._lock:
+            DashboardSnapshot._day = None
+            DashboardSnapshot._closed = None
+            DashboardSnapshot._today = None
+
+    @staticmethod
+    def _windows(today):
+        """Bornes des parties closes : semaine, mois et évolution (jours entiers)"""
+        today_start = datetime.combine(today, time.min)
         return {
-            'ca_today': Statistics.get_ca_by_period('today'),
-            'ca_week': Statistics.get_ca_by_period('week'),
-            'ca_month': Statistics.get_ca_by_period('month'),
-            'sales_today': Statistics.get_sales_count('today'),
-            'sales_week': Statistics.get_sales_count('week'),
-            'sales_month': Statistics.get_sales_count('month'),
-            'top_products': Statistics.get_top_products(5),
-            'top_clients': Statistics.get_top_clients(5),
-            'low_stock': Statistics.get_low_stock_products(),
-            'ca_by_category': Statistics.get_ca_by_category('month'),
-            'ca_evolution': Statistics.get_ca_evolution(30),
-            'payment_status': Statistics.get_payment_status()
+            'week': (resolve_period('week')[0], today_start),
+            'month': (resolve_period('month')[0], today_start),
+            'evolution': (today_start - timedelta(days=30), today_start),
         }
+
+    @staticmethod
+    def _update(conn, watermark):
+        _, last_id, changed_since, _ = watermark
+        today = date.today()
+        today_start = datetime.combine(today, time.min)
+        windows = DashboardSnapshot._windows(today)
+        window_start = min(start for start, _ in windows.values())
+        cursor = conn.cursor()
+
+        if DashboardSnapshot._day != today:
+            DashboardSnapshot._day = today
+            DashboardSnapshot._closed = None
+            DashboardSnapshot._today = None
+
+        if DashboardSnapshot._today is not None:
+            changed = DashboardSnapshot._fetch_sales(
+                cursor, DashboardSnapshot._last_id, DashboardSnapshot._changed_since
+            )
+            for sale in changed.values():
+                if sale['date_vente'] >= today_start:
+                    DashboardSnapshot._today[sale['id']] = sale
+                elif sale['date_vente'] >= window_start:
+                    DashboardSnapshot._closed = None
+
+        closed_count, today_count = DashboardSnapshot._fetch_counts(cursor, window_start, today_start)
+        if DashboardSnapshot._closed is not None and DashboardSnapshot._closed['count'] != closed_count:
+            DashboardSnapshot._closed = None
+        if DashboardSnapshot._today is not None and len(DashboardSnapshot._today) != today_count:
+            DashboardSnapshot._today = None
+
+        if DashboardSnapshot._closed is None:
+            DashboardSnapshot._closed = DashboardSnapshot._fetch_closed(conn, windows)
+            DashboardSnapshot._closed['count'] = closed_count
+        if DashboardSnapshot._today is None:
+            DashboardSnapshot._today = DashboardSnapshot._fetch_sales(cursor, today_start=today_start)
+
+        DashboardSnapshot._last_id = last_id or 0
+        DashboardSnapshot._changed_since = changed_since
+
+        summary = DashboardSnapshot._assemble(today)
+        summary.update({
+            'low_stock': Statistics._fetch_low_stock_products(cursor),
+            'payment_status': Statistics._fetch_payment_status(cursor)
+        })
+        return summary
+
+    # ==================== Requêtes ====================
+
+    @staticmethod
+    def _fetch_closed(conn, windows):
+        """Jours clos de la fenêtre, lus dans les agrégats et `ventes`"""
+        rollup_watermark = SalesRollup.ensure_up_to_date(conn, READ_CATCH_UP_DAYS)
+        cursor = conn.cursor()
+
+        closed = {'totals': {}}
+        for period in ('week', 'month'):
+            closed['totals'][period] = Statistics._fetch_totals(cursor, windows[period], rollup_watermark)
+        closed['products'] = {
+            row['produit_id']: row
+            for row in Statistics._fetch_product_totals(cursor, windows['month'], rollup_watermark)
+        }
+        closed['clients'] = {
+            row['client_id']: row for row in Statistics._fetch_client_totals(cursor, windows['month'])
+        }
+        closed['days'] = Statistics._fetch_daily_totals(cursor, windows['evolution'], rollup_watermark)
+        return closed
+
+    @staticmethod
+    def _fetch_counts(cursor, window_start, today_start):
+        """Nombre de ventes (jours clos de la fenêtre, jour courant) ; idx_date seul"""
+        cursor.execute("""
+            SELECT COUNT(*) as total, COALESCE(SUM(date_vente >= %s), 0) as du_jour
+            FROM ventes
+            WHERE date_vente >= %s
+        """, (today_start, window_start))
+        row = cursor.fetchone() or {}
+        total, today = int(row.get('total') or 0), int(row.get('du_jour') or 0)
+        return total - today, today
+
+    @staticmethod
+    def _fetch_sales(cursor, after_id=None, changed_since=None, today_start=None):
+        """Ventes et leurs lignes : celles du jour, ou celles créées / modifiées depuis le repère"""
+        if today_start is not None:
+            where, params = "v.date_vente >= %s", [today_start]
+        elif changed_since is not None:
+            where, params = "(v.id > %s OR v.updated_at >= %s)", [after_id, changed_since]
+        else:
+            where, params = "v.id > %s", [after_id]
+
+        cursor.execute(f"""
+            SELECT v.id, v.date_vente, v.client_id, CONCAT(c.nom, ' ', c.prenom) as client_nom,
+                   v.montant_total
+            FROM ventes v
+            JOIN clients c ON v.client_id = c.id
+            WHERE {where}
+        """, params)
+        sales = {row['id']: dict(row, lignes=[]) for row in cursor.fetchall()}
+        if not sales:
+            return sales
+
+        placeholders = ", ".join(["%s"] * len(sales))
+        cursor.execute(f"""
+            SELECT vente_id, produit_id, quantite, sous_total
+            FROM ventes_details
+            WHERE vente_id IN ({placeholders})
+        """, list(sales))
+        for line in cursor.fetchall():
+            sales[line['vente_id']]['lignes'].append(line)
+        return sales
+
+    # ==================== Fusion ====================
+
+    @staticmethod
+    def _assemble(today):
+        closed = DashboardSnapshot._closed
+        sales = list(DashboardSnapshot._today.values())
+        ca_today = sum(sale['montant_total'] for sale in sales)
+
+        summary = {'ca_today': float(ca_today), 'sales_today': len(sales)}
+        for period in ('week', 'month'):
+            totals = closed['totals'][period]
+            summary[f'ca_{period}'] = totals['ca'] + float(ca_today)
+            summary[f'sales_{period}'] = totals['ventes'] + len(sales)
+
+        # Produits : jours clos + lignes du jour
+        products = {
+            product_id: [row['quantite'], row['ca'], row['lignes']]
+            for product_id, row in closed['products'].items()
+        }
+        for sale in sales:
+            for line in sale['lignes']:
+                totals = products.setdefault(line['produit_id'], [0, 0, 0])
+                totals[0] += line['quantite']
+                totals[1] += line['sous_total']
+                totals[2] += 1
+
+        top_products, categories = [], {}
+        for product_id, (quantite, ca, lignes) in products.items():
+            product = ProductCatalog.get(product_id)
+            if product is None:
+                continue
+            top_products.append({
+                'nom': product['nom'], 'category_id': product['category_id'],
+                'categorie': product['categorie'], 'quantite_vendue': quantite, 'ca': ca
+            })
+            key = product['category_id'] if product['categorie'] is not None else None
+            category = categories.setdefault(
+                key, {'categorie': product['categorie'], 'ca': 0, 'nombre_articles': 0}
+            )
+            category['ca'] += ca
+            category['nombre_articles'] += lignes
+        top_products.sort(key=lambda row: row['quantite_vendue'], reverse=True)
+
+        # Clients : jours clos du mois + ventes du jour
+        clients = {
+            client_id: dict(row) for client_id, row in closed['clients'].items()
+        }
+        for sale in sales:
+            client = clients.setdefault(sale['client_id'], {
+                'client_id': sale['client_id'], 'client_nom': sale['client_nom'],
+                'nombre_achats': 0, 'ca_total': 0
+            })
+            client['nombre_achats'] += 1
+            client['ca_total'] += sale['montant_total']
+        top_clients = sorted(clients.values(), key=lambda row: row['ca_total'], reverse=True)
+
+        evolution = [dict(row) for row in closed['days']]
+        if sales:
+            evolution.append({'date': today, 'ca': ca_today, 'nombre_ventes': len(sales)})
+
+        summary.update({
+            'top_products': top_products[:5],
+            'top_clients': [
+                {key: row[key] for key in ('client_nom', 'nombre_achats', 'ca_total')}
+                for row in top_clients[:5]
+            ],
+            'ca_by_category': sorted(categories.values(), key=lambda row: row['ca'], reverse=True),
+            'ca_evolution': evolution
+        })
+        return summary
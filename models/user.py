@@ -1,5 +1,5 @@
-import bcrypt
 from database.connection import get_connection
+from utils.passwords import hash_password, verify_password
 
 
 class User:
@@ -13,10 +13,7 @@ class User:
 
         cursor = conn.cursor()
 
-        password_hash = bcrypt.hashpw(
-            password.encode("utf-8"),
-            bcrypt.gensalt()
-        )
+        password_hash = hash_password(password)
 
         sql = """
         INSERT INTO users (username, password_hash, email, role)
@@ -153,10 +150,31 @@ class User:
     @staticmethod
     def verify_password(password, password_hash):
         """Verify password against hash"""
-        return bcrypt.checkpw(
-            password.encode("utf-8"),
-            password_hash.encode("utf-8") if isinstance(password_hash, str) else password_hash
-        )
+        return verify_password(password, password_hash)
+
+    @staticmethod
+    def rehash_password(user_id, password, old_hash):
+        """Recalculer le hash au coût configuré (mot de passe déjà vérifié)
+
+        Conditionné à l'ancien hash : sans effet si le mot de passe a été
+        changé entre-temps.
+        """
+        conn = get_connection()
+        if not conn:
+            return False
+
+        cursor = conn.cursor()
+        sql = "UPDATE users SET password_hash = %s WHERE id = %s AND password_hash = %s"
+
+        try:
+            cursor.execute(sql, (hash_password(password), user_id, old_hash))
+            conn.commit()
+            return cursor.rowcount == 1
+        except Exception as e:
+            print("Erreur mise à jour du hash :", e)
+            return False
+        finally:
+            conn.close()
 
     @staticmethod
     def change_password(user_id, new_password):
@@ -166,10 +184,7 @@ class User:
             return False
 
         cursor = conn.cursor()
-        password_hash = bcrypt.hashpw(
-            new_password.encode("utf-8"),
-            bcrypt.gensalt()
-        )
+        password_hash = hash_password(new_password)
 
         sql = "UPDATE users SET password_hash = %s WHERE id = %s"
 
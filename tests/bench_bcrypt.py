@@ -0,0 +1,61 @@
+"""Benchmark bcrypt : temps de hachage / vérification par coût
+
+Aide à choisir BCRYPT_ROUNDS sur le poste cible : le coût retenu est le
+plus élevé dont la vérification reste sous la cible (250 ms par défaut),
+la connexion étant faite dans un worker.
+
+Usage :
+    python -m tests.bench_bcrypt [cible_ms] [répétitions]
+
+Aucune base de données nécessaire.
+"""
+import statistics
+import sys
+import time
+
+import bcrypt
+
+import config
+
+
+ROUNDS = range(8, 16)
+PASSWORD = b"mot de passe de test"
+
+
+def measure(rounds, repeat):
+    hash_times, check_times = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        password_hash = bcrypt.hashpw(PASSWORD, bcrypt.gensalt(rounds=rounds))
+        hash_times.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        bcrypt.checkpw(PASSWORD, password_hash)
+        check_times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(hash_times), statistics.median(check_times)
+
+
+def main():
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else 250.0
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    print(f"{'coût':>5} {'hash (ms)':>11} {'vérif. (ms)':>12}")
+    recommended = None
+    for rounds in ROUNDS:
+        hash_ms, check_ms = measure(rounds, repeat)
+        marker = " <- BCRYPT_ROUNDS actuel" if rounds == config.BCRYPT_ROUNDS else ""
+        print(f"{rounds:>5} {hash_ms:>11.1f} {check_ms:>12.1f}{marker}")
+        if check_ms <= target:
+            recommended = rounds
+        elif check_ms > target * 4:
+            # Les coûts suivants doublent encore : inutile de les mesurer
+            break
+
+    if recommended:
+        print(f"\nCoût recommandé (vérification <= {target:.0f} ms) : BCRYPT_ROUNDS={recommended}")
+    else:
+        print(f"\nAucun coût mesuré sous {target:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark de l'export Excel : durée et mémoire selon le nombre de lignes
+
+Les ventes sont produites par un générateur, comme le curseur côté
+serveur de SaleController.iter_sales : le pic mémoire (tracemalloc) doit
+rester à peu près le même quel que soit le nombre de lignes.
+
+Usage :
+    python -m tests.bench_excel_export [lignes ...]
+
+Aucune base de données nécessaire.
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from utils.excel_exporter import export_sales_to_excel
+
+
+STATUTS = ('payee', 'partielle', 'en_cours', 'annulee')
+
+
+def fake_sales(count):
+    for i in range(count):
+        yield {
+            'numero_facture': f"FAC-{i:07d}", 'client_nom': f"Client {i % 5000}",
+            'date_vente': f"2026-{1 + i % 12:02d}-{1 + i % 28:02d} 10:00:00",
+            'montant_total': 15000, 'montant_paye': 10000, 'montant_reste': 5000,
+            'statut': STATUTS[i % 4]
+        }
+
+
+def measure(count, path):
+    tracemalloc.start()
+    started = time.perf_counter()
+    success, message = export_sales_to_excel(fake_sales(count), path)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if not success:
+        raise SystemExit(message)
+    return elapsed, peak / 1024 / 1024, os.path.getsize(path) / 1024 / 1024
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    print(f"{'lignes':>10} {'durée (s)':>10} {'pic (Mo)':>10} {'fichier (Mo)':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in counts:
+            elapsed, peak, size = measure(count, os.path.join(directory, f"ventes_{count}.xlsx"))
+            print(f"{count:>10} {elapsed:>10.2f} {peak:>10.1f} {size:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark de la recherche à la frappe (PrefixIndex) sur un gros catalogue
+
+Mesure la durée moyenne d'une recherche, par requête, sur `produits`
+libellés ; code de sortie 1 si l'une dépasse le budget (1 ms par frappe
+par défaut).
+
+Usage :
+    python -m tests.bench_prefix_index [produits] [budget_ms]
+
+Aucune base de données nécessaire.
+"""
+import sys
+import time
+
+from utils.prefix_index import PrefixIndex
+
+
+QUERIES = ("p", "prod", "produit 1", "lot 5", "produit lot 9", "lot 96 produit", "00042", "lto")
+
+
+def measure(index, query, repeat=50):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        index.search(query, limit=20)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40_000
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+
+    started = time.perf_counter()
+    index = PrefixIndex((i, f"Produit {i:05d} lot {i % 97}") for i in range(count))
+    print(f"Index de {count} produits construit en {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    slowest = 0.0
+    for query in QUERIES:
+        ms = measure(index, query)
+        slowest = max(slowest, ms)
+        print(f"{ms:8.3f} ms  {query!r}")
+
+    if slowest > budget:
+        print(f"❌ Régression : {slowest:.3f} ms > budget {budget:.3f} ms")
+        sys.exit(1)
+    print("✅ Recherche dans le budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark de Sale.create : latence par facture selon le nombre de lignes
+
+Compare le trigger ligne à ligne et la mise à jour ensembliste du stock
+(SALE_SET_BASED_STOCK) pour des factures de 1, 20 et 200 lignes.
+
+Usage :
+    python -m tests.bench_sale_create [nombre_de_factures]
+
+Nécessite une base MySQL configurée (.env) avec la migration
+003_trigger_stock_ensembliste.sql appliquée. Les ventes créées sont
+supprimées et le stock restauré à la fin.
+"""
+import statistics
+import sys
+import time
+import uuid
+
+from database.connection import get_connection
+from models.sale import Sale
+
+
+LINE_COUNTS = (1, 20, 200)
+
+
+def load_fixtures():
+    conn = get_connection()
+    if not conn:
+        return None
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM clients ORDER BY id LIMIT 1")
+    client = cursor.fetchone()
+    cursor.execute("SELECT id FROM users ORDER BY id LIMIT 1")
+    user = cursor.fetchone()
+    cursor.execute("SELECT id, prix_vente FROM produits ORDER BY id LIMIT 50")
+    products = cursor.fetchall()
+    conn.close()
+    if not (client and user and products):
+        return None
+    return client['id'], user['id'], products
+
+
+def cleanup(marker):
+    """Supprimer les ventes du benchmark et restaurer le stock"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE produits p
+        JOIN (
+            SELECT vd.produit_id, SUM(vd.quantite) as quantite
+            FROM ventes_details vd JOIN ventes v ON vd.vente_id = v.id
+            WHERE v.notes = %s
+            GROUP BY vd.produit_id
+        ) t ON t.produit_id = p.id
+        SET p.stock_actuel = p.stock_actuel + t.quantite
+    """, (marker,))
+    cursor.execute("""
+        DELETE m FROM mouvements_stock m
+        JOIN ventes v ON m.description = CONCAT('Vente facture: ', v.numero_facture)
+        WHERE v.notes = %s
+    """, (marker,))
+    cursor.execute("DELETE FROM ventes WHERE notes = %s", (marker,))
+    conn.close()
+
+
+def run(invoices=20):
+    fixtures = load_fixtures()
+    if not fixtures:
+        print("❌ Base indisponible ou sans client/utilisateur/produit")
+        return 1
+    client_id, user_id, products = fixtures
+
+    marker = f"bench-{uuid.uuid4().hex}"
+    print(f"{'lignes':>6} | {'mode':<12} | {'médiane (ms)':>12} | {'p95 (ms)':>9} | {'ms/ligne':>8}")
+    print("-" * 60)
+
+    try:
+        for lines in LINE_COUNTS:
+            articles = [
+                {
+                    'produit_id': products[i % len(products)]['id'],
+                    'quantite': 1,
+                    'prix_unitaire': float(products[i % len(products)]['prix_vente'])
+                }
+                for i in range(lines)
+            ]
+
+            for label, set_based in (('trigger', False), ('ensembliste', True)):
+                timings = []
+                for _ in range(invoices):
+                    started = time.perf_counter()
+                    success, message = Sale.create(
+                        client_id, user_id, articles, notes=marker, set_based_stock=set_based
+                    )
+                    timings.append((time.perf_counter() - started) * 1000)
+                    if not success:
+                        print(f"❌ {message}")
+                        return 1
+
+                timings.sort()
+                median = statistics.median(timings)
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(f"{lines:>6} | {label:<12} | {median:>12.2f} | {p95:>9.2f} | {median / lines:>8.3f}")
+    finally:
+        cleanup(marker)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
@@ -0,0 +1,78 @@
+"""Benchmark du démarrage à froid : lancement -> fenêtre de connexion affichée
+
+Lance `main.py --profile-startup --exit-after-startup` plusieurs fois et
+relève la chronologie (utils.startup). Échoue (code 1) si la médiane
+dépasse le budget ou si un module lourd (matplotlib, openpyxl,
+reportlab...) est chargé avant la connexion.
+
+Usage :
+    python -m tests.bench_startup [runs] [budget_ms]
+
+Sans écran, lancer avec QT_QPA_PLATFORM=offscreen. Aucune base de
+données nécessaire.
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASE = re.compile(r"^\[démarrage\]\s+([\d.]+) ms  (.+)$")
+HEAVY = re.compile(r"^Modules lourds chargés : (.+)$")
+
+
+def run_once():
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "main.py", "--profile-startup", "--exit-after-startup"],
+        cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    phases, heavy = {}, None
+    for line in result.stderr.splitlines():
+        match = PHASE.match(line)
+        if match:
+            phases[match.group(2)] = float(match.group(1))
+        match = HEAVY.match(line)
+        if match:
+            heavy = match.group(1)
+    if "Connexion affichée" not in phases:
+        raise RuntimeError(f"Démarrage incomplet :\n{result.stderr[-2000:]}")
+    return wall_ms, phases, heavy
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else 3000.0
+
+    walls, paints, heavy = [], [], set()
+    for _ in range(runs):
+        wall_ms, phases, loaded = run_once()
+        walls.append(wall_ms)
+        paints.append(phases["Connexion affichée"])
+        if loaded and loaded != "aucun":
+            heavy.add(loaded)
+
+    paint = statistics.median(paints)
+    print(f"Connexion affichée (depuis main.py) : médiane {paint:.0f} ms, min {min(paints):.0f} ms")
+    print(f"Processus complet (lancement -> sortie) : médiane {statistics.median(walls):.0f} ms")
+    print(f"Modules lourds chargés : {', '.join(sorted(heavy)) or 'aucun'}")
+
+    failed = False
+    if paint > budget:
+        print(f"❌ Régression : {paint:.0f} ms > budget {budget:.0f} ms")
+        failed = True
+    if heavy:
+        print("❌ Régression : module lourd importé avant la connexion")
+        failed = True
+    if not failed:
+        print("✅ Démarrage dans le budget")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import os
+import time
+
+import pytest
+
+# Tests des vues sans affichage (avant toute création de QApplication)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """QApplication partagée par les tests de vues"""
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def wait_idle(qapp):
+    """wait_idle(*loaders) : traiter les événements jusqu'à ce que les AsyncLoader aient fini"""
+    def wait(*loaders, timeout=5):
+        deadline = time.monotonic() + timeout
+        while any(loader.is_busy() for loader in loaders) and time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.005)
+        qapp.processEvents()
+        assert not any(loader.is_busy() for loader in loaders)
+    return wait
+
+
+class FakeDatabase:
+    """Base MySQL simulée pour les tests de modèles (remplace get_connection)
+
+    Les sous-classes répondent aux requêtes dans answer(sql, params), qui
+    retourne les lignes (dicts) lues ensuite par fetchone / fetchall.
+    Chaque requête est notée dans `queries`, espaces normalisés.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def connect(self):
+        return FakeConnection(self)
+
+    def answer(self, sql, params):
+        return []
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+        self.discarded = False
+
+    def cursor(self, cursorclass=None):
+        return FakeCursor(self.db)
+
+    def begin(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+    def discard(self):
+        self.discarded = True
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def execute(self, sql, params=()):
+        self.db.queries.append(' '.join(sql.split()))
+        self.result = self.db.answer(sql, params) or []
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return self.result
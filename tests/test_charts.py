@@ -0,0 +1,51 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from utils.charts import ChartRenderer
+
+
+EVOLUTION = [{'date': date(2026, 10, d), 'ca': Decimal('1500.00') * d} for d in range(1, 8)]
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+
+    def fake_rasterize(draw, data):
+        calls.append(draw.__name__)
+        return f"png-{len(calls)}".encode()
+
+    monkeypatch.setattr(ChartRenderer, '_rasterize', staticmethod(fake_rasterize))
+    ChartRenderer.clear()
+    yield calls
+    ChartRenderer.clear()
+
+
+def test_same_data_served_from_cache(renders):
+    first = ChartRenderer.render('ca_evolution', '30j', EVOLUTION)
+    again = ChartRenderer.render('ca_evolution', '30j', [dict(row) for row in EVOLUTION])
+    assert first == again and renders == ['_draw_ca_evolution']
+
+
+def test_changed_aggregates_are_rendered_again(renders):
+    ChartRenderer.render('ca_evolution', '30j', EVOLUTION)
+    changed = EVOLUTION[:-1] + [{'date': date(2026, 10, 7), 'ca': Decimal('1.00')}]
+    assert ChartRenderer.render('ca_evolution', '30j', changed) == b"png-2"
+    assert ChartRenderer.render('ca_evolution', 'month', EVOLUTION) == b"png-3"
+    assert ChartRenderer.render('ca_by_category', 'month', []) is None
+
+
+def test_cache_is_bounded(renders, monkeypatch):
+    monkeypatch.setattr(ChartRenderer, 'MAX_ENTRIES', 2)
+    for day in range(3):
+        ChartRenderer.render('ca_evolution', '30j', EVOLUTION[day:])
+    assert ChartRenderer.stats()['size'] == 2
+
+
+def test_real_render_is_png():
+    pytest.importorskip("matplotlib")
+    ChartRenderer.clear()
+    png = ChartRenderer.render('ca_by_category', 'month', [{'categorie': None, 'ca': 10}, {'categorie': 'Riz', 'ca': 30}])
+    assert png.startswith(b"\x89PNG")
@@ -0,0 +1,39 @@
+from models.client import Client
+
+
+def placeholders(query):
+    where, order, params = query
+    return (where + order).count('%s'), len(params)
+
+
+def test_phone_uses_normalized_prefix():
+    where, order, params = Client.build_search_query("+225 01-23 45")
+    assert where == "telephone_normalise LIKE %s"
+    assert params == ['225012345%']
+
+
+def test_words_use_fulltext_with_prefix_expansion():
+    query = Client.build_search_query("dup jean")
+    where, order, params = query
+    assert "MATCH(nom, prenom, email) AGAINST" in where
+    assert params == ['+dup* +jean*', '+dup* +jean*']
+    assert order.startswith("MATCH")
+    assert placeholders(query) == (2, 2)
+
+
+def test_short_words_fall_back_to_indexed_prefix():
+    query = Client.build_search_query("Li")
+    assert query[0] == "(nom LIKE %s OR prenom LIKE %s)"
+    assert query[2] == ['Li%', 'Li%']
+
+    # Avec un mot FULLTEXT, le mot court (ou vide) ne fait que filtrer
+    query = Client.build_search_query("jean.dupont@exemple.com")
+    assert query[2][0] == '+jean* +dupont* +exemple*'
+    assert '%com%' in query[2]
+    assert placeholders(query) == (3, 3)
+
+
+def test_like_wildcards_are_escaped_and_empty_input_ignored():
+    assert Client.build_search_query("a_")[2] == ['a\\_%', 'a\\_%']
+    assert Client.build_search_query("   ") is None
+    assert Client.build_search_query("?!") is None
@@ -0,0 +1,61 @@
+import pytest
+
+from controllers.statistics_controller import StatisticsController
+from utils.charts import ChartRenderer
+from views.dashboard_view import DashboardView
+
+
+def summary(top_product):
+    return {
+        'top_products': [{'nom': top_product, 'quantite_vendue': 3, 'ca': 4500}],
+        'top_clients': [], 'ca_evolution': [], 'ca_by_category': []
+    }
+
+
+class FakeStatistics:
+    def __init__(self):
+        self.watermark = 1
+        self.summary = summary("Riz 25kg")
+        self.calls = []
+
+    def changes(self, since=None):
+        self.calls.append(since)
+        if since == self.watermark:
+            return since, None
+        return self.watermark, self.summary
+
+
+@pytest.fixture
+def stats(monkeypatch, qapp):
+    fake = FakeStatistics()
+    monkeypatch.setattr(StatisticsController, 'get_dashboard_changes', staticmethod(fake.changes))
+    monkeypatch.setattr(ChartRenderer, '_rasterize', staticmethod(lambda draw, data: b""))
+    return fake
+
+
+def test_refresh_patches_tables_in_place(stats, wait_idle):
+    view = DashboardView()
+    wait_idle(view.loader, view.refresh_loader)
+    table = view.products_table
+    assert table.item(0, 0).text() == "Riz 25kg"
+
+    # Rien n'a changé : une seule requête de repère, aucun résumé
+    view.refresh()
+    wait_idle(view.loader, view.refresh_loader)
+    assert stats.calls == [None, 1] and view.products_table.item(0, 0).text() == "Riz 25kg"
+
+    stats.watermark, stats.summary = 2, summary("Huile 1L")
+    view.refresh()
+    wait_idle(view.loader, view.refresh_loader)
+    assert view.products_table is table
+    assert table.item(0, 0).text() == "Huile 1L"
+    assert view.watermark == 2
+
+
+def test_timer_runs_only_while_visible(stats, wait_idle):
+    view = DashboardView()
+    wait_idle(view.loader, view.refresh_loader)
+    view.show()
+    assert view.refresh_timer.isActive()
+    view.hide()
+    assert not view.refresh_timer.isActive()
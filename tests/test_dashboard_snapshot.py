@@ -0,0 +1,149 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import pytest
+
+import models.statistics as statistics_module
+from models.product_catalog import ProductCatalog
+from models.sales_rollup import SalesRollup
+from models.statistics import DashboardSnapshot, Statistics
+from tests.conftest import FakeDatabase
+
+
+TODAY = datetime.combine(date.today(), time.min)
+YESTERDAY = TODAY - timedelta(days=1)
+
+PRODUCTS = {
+    1: {'nom': "Riz 25kg", 'category_id': 1, 'categorie': "Céréales"},
+    2: {'nom': "Huile 1L", 'category_id': 2, 'categorie': "Huiles"},
+}
+
+
+class SalesDatabase(FakeDatabase):
+    """Ventes en mémoire ; les agrégats des jours clos sont fixes"""
+
+    def __init__(self):
+        super().__init__()
+        self.clock = TODAY
+        self.sales = {}
+
+    def sell(self, sale_id, day, client_id, montant, lignes):
+        self.clock += timedelta(seconds=1)
+        self.sales[sale_id] = {
+            'id': sale_id, 'date_vente': day, 'client_id': client_id,
+            'client_nom': f"Client {client_id}", 'montant_total': Decimal(montant),
+            'updated_at': self.clock,
+            'lignes': [
+                {'vente_id': sale_id, 'produit_id': produit_id, 'quantite': quantite,
+                 'sous_total': Decimal(sous_total)}
+                for produit_id, quantite, sous_total in lignes
+            ]
+        }
+
+    def touch(self, sale_id):
+        self.clock += timedelta(seconds=1)
+        self.sales[sale_id]['updated_at'] = self.clock
+
+    def answer(self, sql, params):
+        sql = ' '.join(sql.split())
+        assert sql.count('%s') == len(params)
+        sales = list(self.sales.values())
+        if 'derniere_vente' in sql:
+            return [{
+                'jour': TODAY.date(), 'derniere_vente': max(self.sales, default=None),
+                'ventes_modifiees': max((s['updated_at'] for s in sales), default=None),
+                'produits_modifies': None
+            }]
+        if 'FROM parametres' in sql:
+            return [{'valeur': YESTERDAY.date().isoformat()}]
+        if 'SUM(date_vente >= %s)' in sql:
+            window = [s for s in sales if s['date_vente'] >= params[1]]
+            return [{'total': len(window), 'du_jour': sum(s['date_vente'] >= params[0] for s in window)}]
+        if 'v.montant_total FROM ventes v' in sql:
+            if 'v.date_vente >= %s' in sql:
+                rows = [s for s in sales if s['date_vente'] >= params[0]]
+            elif 'updated_at' in sql:
+                rows = [s for s in sales if s['id'] > params[0] or s['updated_at'] >= params[1]]
+            else:
+                rows = [s for s in sales if s['id'] > params[0]]
+            return [{k: v for k, v in s.items() if k not in ('updated_at', 'lignes')} for s in rows]
+        if 'FROM ventes_details WHERE vente_id IN' in sql:
+            return [line for s in sales if s['id'] in params for line in s['lignes']]
+        # Jours clos : deux ventes d'hier, lues dans les agrégats
+        if 'as ca, COALESCE(ROUND(SUM(s.ventes)), 0) as ventes' in sql:
+            return [{'ca': Decimal(3000), 'ventes': 2}]
+        if 'GROUP BY s.produit_id' in sql:
+            return [{'produit_id': 1, 'quantite': Decimal(10), 'ca': Decimal(3000), 'lignes': 2}]
+        if 'GROUP BY v.client_id' in sql:
+            return [{'client_id': 1, 'client_nom': "Client 1", 'nombre_achats': 2, 'ca_total': Decimal(3000)}]
+        if 'GROUP BY DATE(s.moment)' in sql:
+            return [{'date': YESTERDAY.date(), 'ca': Decimal(3000), 'nombre_ventes': 2}]
+        return []
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = SalesDatabase()
+    database.sell(1, YESTERDAY, 1, 1000, [(1, 4, 1000)])
+    database.sell(2, YESTERDAY, 1, 2000, [(1, 6, 2000)])
+    database.sell(3, TODAY, 2, 500, [(2, 1, 500)])
+    monkeypatch.setattr(statistics_module, 'get_connection', database.connect)
+    monkeypatch.setattr(ProductCatalog, 'get', staticmethod(PRODUCTS.get))
+    monkeypatch.setattr(SalesRollup, '_watermark', None)
+    DashboardSnapshot.clear()
+    yield database
+    DashboardSnapshot.clear()
+
+
+def closed_day_queries(db):
+    return [q for q in db.queries if 'ventes_daily_rollup' in q or 'GROUP BY v.client_id' in q]
+
+
+def test_new_sale_reads_only_new_rows(db):
+    watermark, summary = Statistics.get_dashboard_changes()
+    assert (summary['ca_today'], summary['sales_today'], summary['sales_month']) == (500.0, 1, 3)
+
+    db.queries.clear()
+    db.sell(4, TODAY, 2, 12000, [(2, 20, 12000)])
+    watermark, summary = Statistics.get_dashboard_changes(watermark)
+
+    assert closed_day_queries(db) == []
+    sales_query, = [q for q in db.queries if 'v.montant_total FROM ventes v' in q]
+    assert 'v.id > %s' in sales_query and 'v.date_vente >= %s' not in sales_query
+    assert (summary['ca_today'], summary['sales_today']) == (12500.0, 2)
+    assert (summary['ca_month'], summary['sales_month']) == (15500.0, 4)
+    assert [(p['nom'], p['quantite_vendue']) for p in summary['top_products']] == [("Huile 1L", 21), ("Riz 25kg", 10)]
+    assert summary['top_clients'][0] == {'client_nom': "Client 2", 'nombre_achats': 2, 'ca_total': Decimal(12500)}
+    assert [c['categorie'] for c in summary['ca_by_category']] == ["Huiles", "Céréales"]
+    assert summary['ca_evolution'][-1] == {'date': TODAY.date(), 'ca': Decimal(12500), 'nombre_ventes': 2}
+
+
+def test_changed_sale_of_today_replaces_its_entry(db):
+    watermark, _ = Statistics.get_dashboard_changes()
+    db.sales[3]['montant_total'] = Decimal(0)
+    db.touch(3)
+    _, summary = Statistics.get_dashboard_changes(watermark)
+    assert (summary['ca_today'], summary['sales_today']) == (0.0, 1)
+
+
+def test_deleted_sale_reloads_today_only(db):
+    watermark, _ = Statistics.get_dashboard_changes()
+    db.sell(4, TODAY, 2, 12000, [(2, 20, 12000)])
+    watermark, _ = Statistics.get_dashboard_changes(watermark)
+
+    db.queries.clear()
+    del db.sales[3]
+    db.touch(4)
+    _, summary = Statistics.get_dashboard_changes(watermark)
+
+    assert closed_day_queries(db) == []
+    assert any('v.date_vente >= %s' in q for q in db.queries if 'v.montant_total FROM ventes v' in q)
+    assert (summary['ca_today'], summary['sales_today']) == (12000.0, 1)
+
+
+def test_change_to_closed_day_recomputes_closed_days(db):
+    watermark, _ = Statistics.get_dashboard_changes()
+    db.queries.clear()
+    db.touch(1)
+    Statistics.get_dashboard_changes(watermark)
+    assert closed_day_queries(db)
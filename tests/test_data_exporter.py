@@ -0,0 +1,132 @@
+import csv
+import gzip
+import json
+import os
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+import utils.data_exporter as data_exporter
+from utils.data_exporter import DataExporter
+
+
+FROM, TO = datetime(2026, 1, 1), datetime(2027, 1, 1)
+
+
+class FakeDatabase:
+    """stream_query sur des tables en mémoire (filtre id > dernier id)"""
+
+    def __init__(self, sizes):
+        self.tables = {
+            table: [{'id': i, 'montant': Decimal('1500.50'), 'date': datetime(2026, 3, 1, 9, 30)}
+                    for i in range(1, size + 1)]
+            for table, size in sizes.items()
+        }
+        self.queries = []
+        self.fail_after = None
+
+    def stream_query(self, sql, params):
+        table = sql.split(" FROM ")[1].split()[0]
+        self.queries.append((table, params))
+        for count, row in enumerate(r for r in self.tables[table] if r['id'] > params[2]):
+            if self.fail_after is not None and count >= self.fail_after:
+                raise ConnectionError("connexion perdue")
+            yield row
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeDatabase({'ventes': 25, 'ventes_details': 60, 'paiements': 0, 'mouvements_stock': 7})
+    monkeypatch.setattr(data_exporter, 'stream_query', fake.stream_query)
+    monkeypatch.setattr(data_exporter, 'query_columns', lambda sql: ['id', 'montant', 'date'])
+    monkeypatch.setattr(DataExporter, 'CHUNK_ROWS', 10)
+    return fake
+
+
+def read_csv(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def test_tables_exported_in_gzip_members(db, tmp_path):
+    success, message, counts = DataExporter(str(tmp_path), FROM, TO).run(workers=4)
+    assert success, message
+    assert counts == {'ventes': 25, 'ventes_details': 60, 'paiements': 0, 'mouvements_stock': 7}
+
+    rows = read_csv(tmp_path / "ventes_details.csv.gz")
+    assert rows[0] == ['id', 'montant', 'date']
+    assert rows[1] == ['1', '1500.50', '2026-03-01 09:30:00']
+    assert [int(r[0]) for r in rows[1:]] == list(range(1, 61))
+    # Aucune ligne sur la période : en-tête seul
+    assert read_csv(tmp_path / "paiements.csv.gz") == [['id', 'montant', 'date']]
+    assert not os.path.exists(tmp_path / data_exporter.CHECKPOINT_FILE)
+
+
+def test_jsonl_format(db, tmp_path):
+    DataExporter(str(tmp_path), FROM, TO, 'jsonl', ['ventes']).run()
+    with gzip.open(tmp_path / "ventes.jsonl.gz", 'rt', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == 25 and rows[0] == {'id': 1, 'montant': '1500.50', 'date': '2026-03-01 09:30:00'}
+    assert not os.path.exists(tmp_path / "ventes_details.jsonl.gz")
+
+
+def test_interrupted_export_resumes_from_last_chunk(db, tmp_path):
+    db.fail_after = 35
+    success, message, counts = DataExporter(str(tmp_path), FROM, TO, tables=['ventes_details']).run()
+    assert not success and "reprise possible" in message
+    assert counts == {'ventes_details': 30}
+
+    db.fail_after = None
+    success, _, counts = DataExporter(str(tmp_path), FROM, TO, tables=['ventes_details']).run()
+    assert success and counts == {'ventes_details': 60}
+    assert db.queries[-1] == ('ventes_details', (FROM, TO, 30))
+
+    rows = read_csv(tmp_path / "ventes_details.csv.gz")
+    assert rows[0] == ['id', 'montant', 'date']
+    assert [int(r[0]) for r in rows[1:]] == list(range(1, 61))
+
+
+def test_cancel_then_resume_and_partial_chunk_dropped(db, tmp_path):
+    exporter = DataExporter(str(tmp_path), FROM, TO, tables=['ventes'])
+    success, message, counts = exporter.run(progress=lambda table, rows: rows < 10)
+    assert not success and counts == {'ventes': 10}
+
+    # Lot à moitié écrit après le point de reprise : retiré à la reprise
+    with open(exporter.path('ventes'), 'ab') as f:
+        f.write(b"\x1f\x8b partiel")
+
+    success, _, counts = DataExporter(str(tmp_path), FROM, TO, tables=['ventes']).run()
+    assert success and counts == {'ventes': 25}
+    assert [int(r[0]) for r in read_csv(exporter.path('ventes'))[1:]] == list(range(1, 26))
+
+
+def test_other_period_starts_over(db, tmp_path):
+    DataExporter(str(tmp_path), FROM, TO, tables=['ventes']).run(progress=lambda table, rows: False)
+    success, _, counts = DataExporter(str(tmp_path), FROM, datetime(2026, 7, 1), tables=['ventes']).run()
+    assert success and counts == {'ventes': 25}
+    assert len(read_csv(tmp_path / "ventes.csv.gz")) == 26
+
+
+def test_unknown_table_or_format_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        DataExporter(str(tmp_path), FROM, TO, tables=['users'])
+    with pytest.raises(ValueError):
+        DataExporter(str(tmp_path), FROM, TO, fmt='parquet')
+
+
+def test_query_columns_reads_no_rows(monkeypatch):
+    import database.connection as connection
+    from tests.conftest import FakeConnection, FakeCursor, FakeDatabase
+
+    class DescribedCursor(FakeCursor):
+        description = (('id', 3), ('montant', 246))
+
+    class DescribedConnection(FakeConnection):
+        def cursor(self, cursorclass=None):
+            return DescribedCursor(self.db)
+
+    db = FakeDatabase()
+    monkeypatch.setattr(connection, 'get_connection', lambda: DescribedConnection(db))
+    assert connection.query_columns("SELECT p.* FROM paiements p") == ['id', 'montant']
+    assert db.queries == ["SELECT p.* FROM paiements p LIMIT 0"]
@@ -0,0 +1,117 @@
+import os
+
+import openpyxl
+import pytest
+
+import database.connection as connection
+from utils.excel_exporter import ClientExporter, PROGRESS_EVERY, export_sales_to_excel
+
+
+def sales(count):
+    """Générateur : comme SaleController.iter_sales, rien n'est pré-chargé"""
+    statuts = ['payee', 'partielle', 'en_cours', 'annulee']
+    for i in range(count):
+        yield {
+            'numero_facture': f"FAC-{i:06d}", 'client_nom': f"Client {i}",
+            'date_vente': f"2026-10-{1 + i % 28:02d} 10:00:00",
+            'montant_total': 1500, 'montant_paye': 1000, 'montant_reste': 500,
+            'statut': statuts[i % 4]
+        }
+
+
+def test_sales_export_styles_without_second_pass(tmp_path):
+    path = tmp_path / "ventes.xlsx"
+    success, message = export_sales_to_excel(sales(8), str(path))
+    assert success, message
+
+    ws = openpyxl.load_workbook(path)["Ventes"]
+    assert [c.value for c in ws[1]][:2] == ["N° Facture", "Client"]
+    assert ws["A1"].font.bold and ws.freeze_panes == "A2"
+    assert ws.column_dimensions["B"].width == 20
+    assert ws["C2"].value == "2026-10-01"
+    assert ws["D2"].value == 1500 and ws["D2"].number_format == '0.00'
+    fills = [ws.cell(row=r, column=7).fill.start_color.rgb for r in range(2, 6)]
+    assert fills[:3] == ["00C6EFCE", "00FFEB9C", "00FFC7CE"]
+    assert ws["G5"].fill.fill_type is None
+    assert ws.max_row == 9
+
+
+def test_progress_reported_and_cancel_leaves_no_file(tmp_path):
+    calls = []
+    path = tmp_path / "clients.xlsx"
+    clients = ({'id': i, 'nom': f"N{i}"} for i in range(PROGRESS_EVERY * 2 + 5))
+    success, _ = ClientExporter.export_to_excel(clients, str(path), 2005, lambda d, t: calls.append((d, t)))
+    assert success
+    assert calls == [(PROGRESS_EVERY, 2005), (PROGRESS_EVERY * 2, 2005), (PROGRESS_EVERY * 2 + 5, 2005)]
+    assert openpyxl.load_workbook(path)["Clients"]["A2"].alignment.horizontal == "center"
+
+    path = tmp_path / "annule.xlsx"
+    success, message = export_sales_to_excel(sales(PROGRESS_EVERY * 3), str(path), progress=lambda d, t: False)
+    assert not success and message == "Export annulé"
+    assert not os.path.exists(path)
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.closed = False
+
+    def execute(self, sql, params=None):
+        pass
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.cursor_obj = FakeCursor(rows)
+        self.returned = self.discarded = False
+
+    def cursor(self, cursorclass=None):
+        assert cursorclass is connection.pymysql.cursors.SSDictCursor
+        return self.cursor_obj
+
+    def close(self):
+        self.returned = True
+
+    def discard(self):
+        self.discarded = True
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    fake = FakeConnection([{'id': 1}, {'id': 2}, {'id': 3}])
+    monkeypatch.setattr(connection, 'get_connection', lambda: fake)
+    return fake
+
+
+def test_stream_query_returns_connection_when_exhausted(conn):
+    assert [row['id'] for row in connection.stream_query("SELECT")] == [1, 2, 3]
+    assert conn.cursor_obj.closed and conn.returned and not conn.discarded
+
+
+def test_abandoned_stream_discards_connection(conn):
+    rows = connection.stream_query("SELECT")
+    next(rows)
+    rows.close()
+    assert conn.discarded and not conn.returned
+
+
+def test_stream_query_without_connection_raises(monkeypatch):
+    monkeypatch.setattr(connection, 'get_connection', lambda: None)
+    with pytest.raises(ConnectionError):
+        list(connection.stream_query("SELECT"))
+
+
+def test_sales_export_without_connection_fails(tmp_path, monkeypatch):
+    from controllers.sale_controller import SaleController
+
+    monkeypatch.setattr(connection, 'get_connection', lambda: None)
+    path = tmp_path / "ventes.xlsx"
+    success, message = export_sales_to_excel(SaleController.iter_sales(), str(path))
+    assert not success and "connexion" in message
+    assert not os.path.exists(path)
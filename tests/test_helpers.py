@@ -0,0 +1,56 @@
+from datetime import date, datetime
+
+import pytest
+
+from utils.helpers import resolve_period
+
+
+NOW = datetime(2026, 10, 15, 14, 30)  # jeudi
+
+
+def test_today_is_half_open_day():
+    assert resolve_period('today', now=NOW) == (
+        datetime(2026, 10, 15), datetime(2026, 10, 16)
+    )
+
+
+def test_week_starts_on_sunday_like_yearweek():
+    assert resolve_period('week', now=NOW) == (
+        datetime(2026, 10, 11), datetime(2026, 10, 18)
+    )
+    sunday = datetime(2026, 10, 11, 9, 0)
+    assert resolve_period('week', now=sunday)[0] == datetime(2026, 10, 11)
+
+
+def test_month_rolls_over_year():
+    assert resolve_period('month', now=NOW) == (
+        datetime(2026, 10, 1), datetime(2026, 11, 1)
+    )
+    assert resolve_period('month', now=datetime(2026, 12, 31, 23, 59)) == (
+        datetime(2026, 12, 1), datetime(2027, 1, 1)
+    )
+
+
+def test_custom_end_date_is_inclusive():
+    assert resolve_period('custom', date(2026, 1, 1), date(2026, 1, 31), now=NOW) == (
+        datetime(2026, 1, 1), datetime(2026, 2, 1)
+    )
+
+
+def test_custom_end_datetime_is_exclusive():
+    end = datetime(2026, 1, 1, 12, 0)
+    assert resolve_period('custom', date(2026, 1, 1), end, now=NOW)[1] == end
+
+
+def test_custom_without_end_runs_through_today():
+    assert resolve_period('custom', date(2026, 10, 1), now=NOW)[1] == datetime(2026, 10, 16)
+
+
+@pytest.mark.parametrize('args', [
+    ('year',),
+    ('custom',),
+    ('custom', date(2026, 2, 1), date(2026, 1, 1)),
+])
+def test_invalid_periods(args):
+    with pytest.raises(ValueError):
+        resolve_period(*args, now=NOW)
@@ -0,0 +1,144 @@
+"""Attribution des numéros de facture
+
+Les tests de concurrence nécessitent une base MySQL configurée (.env) ;
+ils sont ignorés sinon.
+"""
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from database.connection import get_connection
+from models.invoice_number import InvoiceNumberAllocator, InvoiceNumberBlock
+from models.sale import Sale
+
+
+THREADS = 8
+PER_THREAD = 25
+
+
+@pytest.fixture
+def db():
+    conn = get_connection()
+    if not conn:
+        pytest.skip("Base de données indisponible")
+    conn.close()
+
+
+def test_format_number():
+    assert InvoiceNumberAllocator.format_number('', 2026, 3, 42) == "2026/03/000042"
+    assert InvoiceNumberAllocator.format_number('FAC', 2026, 3, 42) == "FAC/2026/03/000042"
+
+
+def test_block_hands_out_each_number_once():
+    now = datetime.now()
+    block = InvoiceNumberBlock('FAC', now.year, now.month, 1, THREADS * PER_THREAD)
+    taken = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(PER_THREAD):
+            number = block.take()
+            with lock:
+                taken.append(number)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(taken)) == THREADS * PER_THREAD
+    assert block.remaining() == 0
+    assert block.take() is None
+
+
+def test_block_refuses_other_month():
+    block = InvoiceNumberBlock('', 2026, 1, 1, 10)
+    assert block.take(when=datetime(2026, 2, 1)) is None
+    assert block.take(when=datetime(2026, 1, 31)) == "2026/01/000001"
+
+
+def test_concurrent_allocation_is_gapless(db):
+    prefix = f"T{uuid.uuid4().hex[:8]}"
+
+    def worker(_):
+        numbers = []
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            for _ in range(PER_THREAD):
+                conn.begin()
+                numbers.append(InvoiceNumberAllocator.allocate(cursor, 1, prefix=prefix)[3])
+                conn.commit()
+        finally:
+            conn.close()
+        return numbers
+
+    try:
+        with ThreadPoolExecutor(THREADS) as executor:
+            results = [n for numbers in executor.map(worker, range(THREADS)) for n in numbers]
+        assert sorted(results) == list(range(1, THREADS * PER_THREAD + 1))
+    finally:
+        conn = get_connection()
+        conn.cursor().execute("DELETE FROM compteurs_factures WHERE prefixe = %s", (prefix,))
+        conn.close()
+
+
+def test_concurrent_sales_get_distinct_numbers(db):
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM clients ORDER BY id LIMIT 1")
+    client = cursor.fetchone()
+    cursor.execute("SELECT id FROM users ORDER BY id LIMIT 1")
+    user = cursor.fetchone()
+    cursor.execute("SELECT id, prix_vente FROM produits ORDER BY id LIMIT 1")
+    product = cursor.fetchone()
+    conn.close()
+    if not (client and user and product):
+        pytest.skip("Il faut au moins un client, un utilisateur et un produit")
+
+    marker = f"test-concurrence-{uuid.uuid4().hex}"
+    per_thread = 5
+    articles = [{'produit_id': product['id'], 'quantite': 1, 'prix_unitaire': float(product['prix_vente'])}]
+
+    def worker(_):
+        return [
+            Sale.create(client['id'], user['id'], articles, notes=marker)[0]
+            for _ in range(per_thread)
+        ]
+
+    try:
+        with ThreadPoolExecutor(THREADS) as executor:
+            results = [ok for oks in executor.map(worker, range(THREADS)) for ok in oks]
+        assert all(results)
+
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT numero_facture FROM ventes WHERE notes = %s", (marker,))
+        numbers = [row['numero_facture'] for row in cursor.fetchall()]
+        conn.close()
+        assert len(numbers) == len(set(numbers)) == THREADS * per_thread
+    finally:
+        # Annuler l'effet des ventes de test (stock, mouvements, ventes)
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE produits p
+            JOIN (
+                SELECT vd.produit_id, SUM(vd.quantite) as quantite
+                FROM ventes_details vd JOIN ventes v ON vd.vente_id = v.id
+                WHERE v.notes = %s
+                GROUP BY vd.produit_id
+            ) t ON t.produit_id = p.id
+            SET p.stock_actuel = p.stock_actuel + t.quantite
+        """, (marker,))
+        cursor.execute("""
+            DELETE m FROM mouvements_stock m
+            JOIN ventes v ON m.description = CONCAT('Vente facture: ', v.numero_facture)
+            WHERE v.notes = %s
+        """, (marker,))
+        cursor.execute("DELETE FROM ventes WHERE notes = %s", (marker,))
+        conn.close()
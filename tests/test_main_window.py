@@ -0,0 +1,151 @@
+import threading
+import time
+
+import pytest
+from PyQt6.QtWidgets import QWidget
+
+import views.main_window as main_window_module
+from utils.permissions import Permission
+from utils.session import Session
+from views.main_window import MainWindow
+
+built = []
+
+
+class FakeView(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.reloads = 0
+        built.append(self)
+
+    def reload(self):
+        self.reloads += 1
+
+
+FAKE = f"{__name__}.FakeView"
+
+
+def open_window(monkeypatch, role='vendeur', prefetch=False, views=None):
+    monkeypatch.setattr(main_window_module, 'PREFETCH_VIEWS', prefetch)
+    monkeypatch.setattr(MainWindow, 'PREFETCH_DELAY', 0)
+    monkeypatch.setattr(MainWindow, 'VIEWS', views or {
+        'dashboard': (FAKE, Permission.VIEW_DASHBOARD, None),
+        'clients': (FAKE, Permission.VIEW_CLIENTS, 'reload'),
+        'settings': (FAKE, Permission.VIEW_SETTINGS, None),
+    })
+    built.clear()
+    Session.login({'id': 1, 'username': "awa", 'role': role})
+    return MainWindow(Session.get_user())
+
+
+def close_after(window):
+    yield window
+    # Arrêter un préchargement en cours (timers et imports de la fenêtre)
+    window._prefetch_queue.clear()
+    window.prefetch_loader.cancel()
+    Session.logout()
+
+
+@pytest.fixture
+def window(monkeypatch, qapp):
+    yield from close_after(open_window(monkeypatch))
+
+
+@pytest.fixture
+def admin_window(monkeypatch, qapp):
+    yield from close_after(open_window(monkeypatch, role='admin'))
+
+
+def test_only_home_view_is_built_up_front(window):
+    assert list(window.views) == ['dashboard']
+    assert window.stacked_widget.currentWidget() is window.views['dashboard']
+
+
+def test_view_built_on_first_navigation_then_reloaded(window):
+    window.show_clients()
+    clients = window.views['clients']
+    assert window.stacked_widget.currentWidget() is clients and clients.reloads == 0
+
+    window.show_dashboard()
+    window.show_clients()
+    assert clients.reloads == 1 and len(built) == 2
+
+
+def settle(qapp, condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+def prefetch_all(window, qapp):
+    window.start_prefetch()
+    settle(qapp, lambda: not window._prefetch_queue and not window.prefetch_loader.is_busy())
+
+
+def test_prefetch_builds_only_permitted_views(window, qapp):
+    prefetch_all(window, qapp)
+    # Un vendeur n'a pas accès aux paramètres
+    assert sorted(window.views) == ['clients', 'dashboard']
+    window.show_settings()
+    assert 'settings' not in window.views
+
+
+def test_prefetch_imports_off_the_gui_thread(admin_window, qapp, monkeypatch):
+    threads = []
+    import_module = main_window_module.importlib.import_module
+
+    def recording_import(name):
+        threads.append(threading.get_ident())
+        return import_module(name)
+
+    monkeypatch.setattr(main_window_module.importlib, 'import_module', recording_import)
+    admin_window.start_prefetch()
+    # Rien n'est construit avant la fin de l'import en arrière-plan
+    assert list(admin_window.views) == ['dashboard']
+
+    settle(qapp, lambda: not admin_window._prefetch_queue and not admin_window.prefetch_loader.is_busy())
+    assert list(admin_window.views) == ['dashboard', 'clients', 'settings']
+    # Un import par vue préchargée hors du thread de l'interface (celui-ci
+    # ne fait ensuite que retrouver le module déjà chargé)
+    assert len([t for t in threads if t != threading.get_ident()]) == 2
+
+
+def test_navigation_takes_view_out_of_prefetch_queue(admin_window, qapp):
+    admin_window.start_prefetch()
+    admin_window.show_settings()
+    assert admin_window.stacked_widget.currentWidget() is admin_window.views['settings']
+    prefetch_all(admin_window, qapp)
+    assert len(built) == 3
+
+
+def test_home_view_is_first_permitted_view(monkeypatch, qapp):
+    window = open_window(monkeypatch, views={
+        'settings': (FAKE, Permission.VIEW_SETTINGS, None),
+        'clients': (FAKE, Permission.VIEW_CLIENTS, None),
+    })
+    try:
+        assert window.home_view_name() == 'clients'
+        assert list(window.views) == ['clients']
+    finally:
+        Session.logout()
+
+
+def test_prefetch_starts_on_first_show_only(monkeypatch, qapp):
+    window = open_window(monkeypatch, prefetch=True)
+    try:
+        # Construite mais pas affichée : aucun préchargement
+        settle(qapp, lambda: False, timeout=0.1)
+        assert list(window.views) == ['dashboard']
+
+        window.show()
+        settle(qapp, lambda: len(window.views) == 2)
+        assert sorted(window.views) == ['clients', 'dashboard']
+
+        # Affichages suivants : pas de nouveau préchargement
+        window.hide()
+        window.show()
+        assert not window.prefetch_loader.is_busy() and not window._prefetch_queue
+    finally:
+        window.close()
+        Session.logout()
@@ -0,0 +1,29 @@
+import config
+from utils.passwords import hash_password, hash_rounds, needs_rehash, verify_password
+
+
+def test_hash_uses_configured_rounds(monkeypatch):
+    monkeypatch.setattr(config, 'BCRYPT_ROUNDS', 5)
+    password_hash = hash_password("secret")
+
+    assert isinstance(password_hash, str)
+    assert hash_rounds(password_hash) == 5
+    assert verify_password("secret", password_hash)
+    assert verify_password("secret", password_hash.encode("utf-8"))
+    assert not verify_password("autre", password_hash)
+
+
+def test_rehash_needed_when_rounds_change(monkeypatch):
+    monkeypatch.setattr(config, 'BCRYPT_ROUNDS', 4)
+    password_hash = hash_password("secret")
+    assert not needs_rehash(password_hash)
+
+    monkeypatch.setattr(config, 'BCRYPT_ROUNDS', 5)
+    assert needs_rehash(password_hash)
+    assert verify_password("secret", password_hash)
+
+
+def test_unreadable_hash():
+    assert hash_rounds("") is None
+    assert needs_rehash("pas-un-hash")
+    assert not verify_password("secret", "pas-un-hash")
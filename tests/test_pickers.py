@@ -0,0 +1,51 @@
+from controllers.client_controller import ClientController
+from views.pickers import ClientPicker
+
+
+CLIENTS = [
+    {'id': 1, 'nom': "Diop", 'prenom': "Awa", 'telephone': "77 123 45 67", 'telephone_normalise': "771234567"},
+    {'id': 2, 'nom': "Diallo", 'prenom': "Moussa", 'telephone': None, 'telephone_normalise': None},
+    {'id': 3, 'nom': "Ndiaye", 'prenom': "Fatou", 'telephone': "78-555-00-11", 'telephone_normalise': "785550011"},
+]
+
+
+def fake_clients(monkeypatch, remote=()):
+    calls = []
+    monkeypatch.setattr(ClientController, 'get_client_search_entries', staticmethod(lambda: CLIENTS))
+    monkeypatch.setattr(ClientController, 'get_recent_clients', staticmethod(lambda limit=20: [CLIENTS[1]]))
+    monkeypatch.setattr(ClientController, 'search_clients',
+                        staticmethod(lambda term, limit=None: calls.append(term) or list(remote)))
+    ClientPicker.invalidate()
+    return calls
+
+
+def test_client_picker_recent_first_and_phone_prefix(monkeypatch, wait_idle):
+    fake_clients(monkeypatch)
+    picker = ClientPicker()
+    picker.load()
+    wait_idle(picker.loader)
+
+    assert picker.search("di") == [2, 1]
+    assert picker.search("77 12") == [1]
+    assert picker.search("ndi fat") == [3]
+
+    # Client récent : ligne déjà connue, pas de relecture
+    picker.choose(2)
+    assert picker.current['prenom'] == "Moussa"
+
+
+def test_client_picker_falls_back_to_server(monkeypatch, wait_idle):
+    newcomer = {'id': 9, 'nom': "Sarr", 'prenom': "Ibou", 'telephone': None}
+    calls = fake_clients(monkeypatch, remote=[newcomer])
+    picker = ClientPicker()
+    picker.load()
+    wait_idle(picker.loader)
+
+    picker.setText("sarr")
+    picker.update_results("sarr")
+    assert picker.results.rowCount() == 0
+    picker.run_remote()
+    wait_idle(picker.loader)
+
+    assert calls == ["sarr"]
+    assert picker.results.item(0).text() == "Sarr Ibou"
@@ -0,0 +1,144 @@
+import threading
+import time
+
+import pytest
+
+from database.pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self):
+        self.open = True
+        self.server_status = 0x0002  # SERVER_STATUS_AUTOCOMMIT
+        self.pings = 0
+        self.alive = True
+
+    def ping(self, reconnect=False):
+        self.pings += 1
+        if not self.alive:
+            raise ConnectionError("server has gone away")
+
+    def get_autocommit(self):
+        return True
+
+    def rollback(self):
+        self.server_status &= ~0x0001
+
+    def close(self):
+        self.open = False
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def connect():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    return ConnectionPool(connect, **kwargs), created
+
+
+def test_connections_are_reused():
+    pool, created = make_pool(max_size=2)
+
+    for _ in range(10):
+        conn = pool.acquire()
+        conn.close()
+
+    stats = pool.stats()
+    assert len(created) == 1
+    assert stats['checkouts'] == 10
+    assert stats['creations'] == 1
+    assert stats['reuses'] == 9
+    assert stats['in_use'] == 0
+
+
+def test_close_is_idempotent():
+    pool, _ = make_pool(max_size=1)
+    conn = pool.acquire()
+    conn.close()
+    conn.close()
+    assert pool.stats()['idle'] == 1
+
+
+def test_checkout_waits_then_times_out():
+    pool, _ = make_pool(max_size=1, checkout_timeout=0.05)
+    conn = pool.acquire()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    stats = pool.stats()
+    assert stats['waits'] == 1
+    assert stats['timeouts'] == 1
+    conn.close()
+
+
+def test_waiter_gets_released_connection():
+    pool, created = make_pool(max_size=1, checkout_timeout=2)
+    conn = pool.acquire()
+    result = {}
+
+    def borrower():
+        other = pool.acquire()
+        result['raw'] = other.raw
+        other.close()
+
+    thread = threading.Thread(target=borrower)
+    thread.start()
+    time.sleep(0.05)
+    conn.close()
+    thread.join()
+
+    assert result['raw'] is created[0]
+    assert pool.stats()['waits'] == 1
+
+
+def test_dead_connection_is_replaced_on_checkout():
+    pool, created = make_pool(max_size=2, ping_interval=0)
+    conn = pool.acquire()
+    conn.close()
+    created[0].alive = False
+    time.sleep(0.01)
+
+    conn = pool.acquire()
+    assert conn.raw is created[1]
+    assert not created[0].open
+    assert pool.stats()['discards'] == 1
+    conn.close()
+
+
+def test_idle_connections_are_closed_above_min_size():
+    pool, created = make_pool(min_size=1, max_size=3, idle_timeout=0.01)
+    conns = [pool.acquire() for _ in range(3)]
+    for conn in conns:
+        conn.close()
+    time.sleep(0.03)
+
+    pool.acquire().close()
+
+    stats = pool.stats()
+    assert stats['size'] == 1
+    assert stats['idle_closed'] == 2
+
+
+def test_context_manager_rolls_back_on_error():
+    pool, created = make_pool(max_size=1)
+
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            conn.raw.server_status |= 0x0001  # SERVER_STATUS_IN_TRANS
+            raise RuntimeError("boom")
+
+    assert not created[0].server_status & 0x0001
+    assert pool.stats()['idle'] == 1
+
+
+def test_forgotten_connection_frees_its_slot():
+    pool, _ = make_pool(max_size=1, checkout_timeout=0.05)
+    pool.acquire()  # jamais rendue explicitement
+
+    conn = pool.acquire()
+    assert conn is not None
+    conn.close()
@@ -0,0 +1,92 @@
+from utils.prefix_index import PrefixIndex, normalize
+from views.pickers import TypeAheadPicker
+
+
+PRODUCTS = [
+    (1, "Riz parfumé 25kg", ("1",)),
+    (2, "Riz brisé 50kg", ("2",)),
+    (3, "Huile d'arachide 1L", ("3",)),
+    (4, "Sucre en poudre 1kg", ("4",)),
+    (5, "Farine de blé 50kg", ("5",)),
+    (12, "Parfum vanille", ("12",)),
+]
+
+
+def test_normalize_ignores_case_and_accents():
+    assert normalize("Riz PARFUMÉ") == "riz parfume"
+
+
+def test_word_prefixes_all_required():
+    index = PrefixIndex(PRODUCTS)
+    assert index.search("riz") == [2, 1]
+    assert index.search("riz par") == [1]
+    assert index.search("PARF") == [12, 1]
+    assert index.search("riz 25") == [1]
+
+
+def test_exact_code_first_then_trigram_fallback():
+    index = PrefixIndex(PRODUCTS)
+    assert index.search("12")[0] == 12
+    assert index.search("5kg") == [1]
+    assert index.search("arachyde") == [3]
+    assert index.search("zzzz") == []
+
+
+class CountingWords(dict):
+    """Mots par id, en comptant les libellés examinés par la recherche"""
+
+    reads = 0
+
+    def __getitem__(self, item_id):
+        self.reads += 1
+        return super().__getitem__(item_id)
+
+
+def test_frequent_prefix_stops_at_limit():
+    # Taille cible : 40k produits (durée : python -m tests.bench_prefix_index)
+    entries = [(i, f"Produit {i:05d} lot {i % 97}") for i in range(40000)]
+    index = PrefixIndex(entries)
+    index._words = CountingWords(index._words)
+
+    for query in ("p", "prod", "produit 1", "lot 5", "produit lot 9", "lot 96 produit"):
+        index._words.reads = 0
+        assert len(index.search(query, limit=20)) == 20
+        # Intervalle très large : parcours arrêté aux `limit` premiers candidats
+        assert index._words.reads == 20, query
+    assert index.search("produit 1", limit=5) == index.search("produit 1", limit=20)[:5]
+
+
+def test_multi_word_matches_all_words():
+    entries = [(i, f"Produit {i:05d} lot {i % 97}") for i in range(2000)]
+    index = PrefixIndex(entries)
+    results = index.search("lot 96 produit", limit=50)
+    assert results and all(i % 97 == 96 for i in results)
+
+
+class ListPicker(TypeAheadPicker):
+    def fetch_index(self):
+        return PrefixIndex(PRODUCTS), {i: label for i, label, _ in PRODUCTS}
+
+    def fetch_row(self, item_id):
+        return {'id': item_id, 'nom': dict((i, l) for i, l, _ in PRODUCTS)[item_id]}
+
+
+def test_picker_shows_top_results_and_loads_chosen_row(wait_idle):
+    picker = ListPicker(limit=5)
+    chosen = []
+    picker.chosen.connect(chosen.append)
+    picker.load()
+    wait_idle(picker.loader)
+
+    picker.update_results("riz")
+    assert picker.results.rowCount() == 2
+    assert picker.current is None
+
+    picker.choose_first()
+    wait_idle(picker.loader)
+    assert picker.text() == "Riz brisé 50kg"
+    assert chosen == [{'id': 2, 'nom': "Riz brisé 50kg"}]
+    assert picker.current['id'] == 2
+
+    picker.update_results("hui")
+    assert picker.current is None
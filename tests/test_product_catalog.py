@@ -0,0 +1,152 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import models.product_catalog as catalog_module
+from models.product_catalog import ProductCatalog
+from tests.conftest import FakeDatabase
+from utils.prefix_index import PrefixIndex
+
+
+class CatalogDatabase(FakeDatabase):
+    """Table produits en mémoire, interrogée par les requêtes du catalogue"""
+
+    def __init__(self):
+        super().__init__()
+        self.clock = datetime(2026, 10, 15, 9, 0)
+        self.rows = {}
+
+    def put(self, product_id, nom, category_id=1, categorie='Céréales'):
+        self.rows[product_id] = {
+            'id': product_id, 'nom': nom, 'category_id': category_id,
+            'categorie': categorie, 'updated_at': self.clock
+        }
+        self.clock += timedelta(seconds=1)
+
+    def answer(self, sql, params):
+        assert sql.count('%s') == len(params)
+        if 'NOW()' in sql:
+            return [{'maintenant': self.clock}]
+        if 'COUNT(*)' in sql:
+            return [{'total': len(self.rows)}]
+        if 'updated_at >=' in sql:
+            return [dict(r) for r in self.rows.values() if r['updated_at'] >= params[0]]
+        return [dict(r) for r in self.rows.values()]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = CatalogDatabase()
+    database.put(1, "Riz 25kg")
+    database.put(2, "Huile 1L", category_id=2, categorie='Huiles')
+    monkeypatch.setattr(catalog_module, 'get_connection', database.connect)
+    monkeypatch.setattr(catalog_module, 'CATALOG_MAX_AGE', 3600)
+    ProductCatalog.clear()
+    for key in ProductCatalog._stats:
+        ProductCatalog._stats[key] = 0
+    yield database
+    ProductCatalog.clear()
+
+
+def test_loaded_once_then_served_from_memory(db):
+    assert [p['nom'] for p in ProductCatalog.all()] == ["Riz 25kg", "Huile 1L"]
+    queries = len(db.queries)
+
+    assert ProductCatalog.get(2)['nom'] == "Huile 1L"
+    assert ProductCatalog.find_by_name("riz 25KG")['id'] == 1
+    assert [p['id'] for p in ProductCatalog.by_category(2)] == [2]
+    assert len(db.queries) == queries
+
+    stats = ProductCatalog.stats()
+    assert stats['full_loads'] == 1 and stats['hits'] == 3 and stats['size'] == 2
+
+
+def test_invalidate_reads_only_changed_rows(db):
+    ProductCatalog.all()
+    db.put(1, "Riz parfumé 25kg")
+    db.put(3, "Sucre 1kg")
+    ProductCatalog.invalidate()
+
+    assert ProductCatalog.find_by_name("Riz parfumé 25kg")['id'] == 1
+    assert ProductCatalog.find_by_name("Riz 25kg") is None
+    assert ProductCatalog.get(3)['nom'] == "Sucre 1kg"
+
+    stats = ProductCatalog.stats()
+    assert stats['refreshes'] == 1 and stats['rows_refreshed'] == 2 + 2
+
+
+def test_deletions_are_detected(db):
+    ProductCatalog.all()
+    del db.rows[2]
+    ProductCatalog.forget(2)
+    assert ProductCatalog.get(2) is None
+
+    # Suppression faite par un autre poste : rechargement complet
+    del db.rows[1]
+    ProductCatalog.invalidate()
+    assert ProductCatalog.all() == []
+    assert ProductCatalog.stats()['full_loads'] == 2
+
+
+def test_reads_are_not_blocked_by_a_refresh_in_progress(db):
+    ProductCatalog.all()
+    started, release = threading.Event(), threading.Event()
+    answer = db.answer
+
+    def slow_answer(sql, params):
+        if 'NOW()' in sql:
+            started.set()
+            release.wait(5)
+        return answer(sql, params)
+
+    db.answer = slow_answer
+    try:
+        # Cache trop ancien : un thread relit, les autres lisent la mémoire
+        ProductCatalog._checked_at = 0.0
+        refresher = threading.Thread(target=ProductCatalog.all)
+        refresher.start()
+        assert started.wait(5)
+
+        begin = time.monotonic()
+        assert ProductCatalog.get(2)['nom'] == "Huile 1L"
+        assert ProductCatalog.find_by_name("riz 25kg")['id'] == 1
+        assert time.monotonic() - begin < 0.5
+    finally:
+        release.set()
+        refresher.join(5)
+    assert ProductCatalog.stats()['refreshes'] == 1
+
+
+def test_index_is_built_outside_the_lock(db, monkeypatch):
+    ProductCatalog.all()
+    started, release = threading.Event(), threading.Event()
+
+    class SlowIndex(PrefixIndex):
+        def build(self, entries):
+            started.set()
+            release.wait(5)
+            super().build(entries)
+
+    monkeypatch.setattr(catalog_module, 'PrefixIndex', SlowIndex)
+    builder = threading.Thread(target=ProductCatalog.search_index)
+    builder.start()
+    try:
+        assert started.wait(5)
+        begin = time.monotonic()
+        assert ProductCatalog.get(1)['nom'] == "Riz 25kg"
+        assert time.monotonic() - begin < 0.5
+
+        # Nom modifié pendant la construction : l'index construit n'est pas gardé
+        db.put(1, "Riz parfumé 25kg")
+        ProductCatalog.invalidate()
+        ProductCatalog.get(1)
+    finally:
+        release.set()
+        builder.join(5)
+    assert ProductCatalog._index is None
+
+    monkeypatch.setattr(catalog_module, 'PrefixIndex', PrefixIndex)
+    assert ProductCatalog.search_index().search("parf") == [1]
+    assert ProductCatalog.search_index() is ProductCatalog.search_index()
@@ -0,0 +1,15 @@
+from models.product import Product
+
+
+def test_fulltext_ranked_and_paged_in_category():
+    where, order, params = Product.build_search_query("riz 5", category_id=3)
+    assert where.startswith("p.category_id = %s AND MATCH(p.nom, p.description)")
+    assert order.startswith("MATCH(p.nom, p.description)")
+    assert params == [3, '+riz*', '%5%', '+riz*']
+    assert (where + order).count('%s') == len(params)
+
+
+def test_category_only_and_short_terms():
+    assert Product.build_search_query("", category_id=3) == ("p.category_id = %s", "p.nom, p.id", [3])
+    assert Product.build_search_query("5L") == ("(p.nom LIKE %s)", "p.nom, p.id", ['5L%'])
+    assert Product.build_search_query("  ") is None
@@ -0,0 +1,123 @@
+from datetime import datetime
+
+import pymysql
+import pytest
+
+import models.sale_importer as sale_importer
+from models.sale_importer import SaleImporter
+from tests.conftest import FakeDatabase
+
+
+CSV = """ref;date;client_telephone;vendeur;produit;quantite;prix_unitaire;montant_paye
+T1;2026-10-14 09:15;01 23 45 67 89;caisse1;Riz 25kg;2;;
+T1;2026-10-14 09:15;01 23 45 67 89;caisse1;Huile 1L;3;1500;
+T2;2026-10-14 10:00;0000000000;caisse1;Riz 25kg;1;;
+T3;2026-10-14 11:00;0123456789;inconnu;Riz 25kg;1;;
+T4;2026-10-14 12:00;0123456789;caisse1;Riz 25kg;0;;
+T1;2026-10-14 13:00;0123456789;caisse1;Riz 25kg;1;;
+"""
+
+
+def make_importer():
+    importer = SaleImporter(chunk_size=2)
+    importer._clients = {1: {'id': 1}}
+    importer._clients_by_phone = {'0123456789': 1}
+    importer._users = {7: 7, 'caisse1': 7}
+    importer._products = {10: 20000.0, 11: 1200.0}
+    importer._products_by_name = {'riz 25kg': 10, 'huile 1l': 11}
+    return importer
+
+
+def test_csv_lines_are_grouped_and_resolved(tmp_path):
+    path = tmp_path / "ventes.csv"
+    path.write_text(CSV, encoding='utf-8')
+    importer = make_importer()
+
+    prepared = [p for p in map(importer._prepare, importer._read_sales(str(path))) if p]
+    valid = importer._validate(prepared)
+
+    assert [s['ref'] for s in valid] == ['T1']
+    t1 = valid[0]
+    assert t1['client_id'] == 1 and t1['user_id'] == 7
+    assert t1['date_vente'] == datetime(2026, 10, 14, 9, 15)
+    assert t1['articles'] == [
+        {'produit_id': 10, 'quantite': 2, 'prix_unitaire': 20000.0},
+        {'produit_id': 11, 'quantite': 3, 'prix_unitaire': 1500.0},
+    ]
+    assert t1['montant_total'] == round((40000 + 4500) * 1.18, 2)
+
+    errors = {(e['ref'], e['ligne']) for e in importer.errors}
+    assert errors == {('T2', 4), ('T3', 5), ('T4', 6), ('T1', 7)}
+
+
+def test_jsonl_sale_per_line(tmp_path):
+    path = tmp_path / "ventes.jsonl"
+    path.write_text(
+        '{"ref": "A", "client_id": 1, "user_id": 7, "date": "2026-10-14T08:00:00", '
+        '"montant_paye": 5000, "tva": 0, "lignes": [{"produit_id": 11, "quantite": 5}]}\n'
+        'pas du json\n',
+        encoding='utf-8'
+    )
+    importer = make_importer()
+
+    prepared = [p for p in map(importer._prepare, importer._read_sales(str(path))) if p]
+    valid = importer._validate(prepared)
+
+    assert len(valid) == 1
+    assert valid[0]['montant_total'] == 6000
+    assert SaleImporter._status(valid[0]) == 'partielle'
+    assert [e['ligne'] for e in importer.errors] == [2]
+
+
+class ImporterDatabase(FakeDatabase):
+    """Connexion perdue sur les requêtes contenant un des marqueurs `fail_on`"""
+
+    def __init__(self, fail_on=()):
+        super().__init__()
+        self.fail_on = fail_on
+
+    def answer(self, sql, params):
+        if any(marker in sql for marker in self.fail_on):
+            raise pymysql.OperationalError(2013, "Lost connection to MySQL server")
+        return []
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    conn = ImporterDatabase().connect()
+    monkeypatch.setattr(sale_importer, 'get_connection', lambda: conn)
+    monkeypatch.setattr(SaleImporter, '_load_lookups', lambda self, cursor: None)
+    return conn
+
+
+def test_non_utf8_file_is_reported(connection, tmp_path):
+    path = tmp_path / "caisse.csv"
+    path.write_bytes("ref;date;produit\nT1;2026-10-14;Caf\xe9 \xff\n".encode('latin-1'))
+    success, message = SaleImporter().run(str(path))
+    assert not success and "UTF-8" in message
+
+
+def test_database_error_is_reported(connection, monkeypatch, tmp_path):
+    def lost(self, cursor):
+        raise pymysql.OperationalError(2013, "Lost connection to MySQL server")
+
+    monkeypatch.setattr(SaleImporter, '_load_lookups', lost)
+    path = tmp_path / "caisse.csv"
+    path.write_text(CSV, encoding='utf-8')
+    success, message = SaleImporter().run(str(path))
+    assert not success and message.startswith("Erreur base de données")
+
+
+def test_failed_flag_reset_keeps_original_error(monkeypatch):
+    conn = ImporterDatabase(fail_on=("@ventes_stock_ensemble = NULL",)).connect()
+    cursor = conn.cursor()
+    importer = SaleImporter(set_based_stock=True)
+    sale = {'date_vente': datetime(2026, 10, 14), 'articles': []}
+
+    def allocate_fails(*args, **kwargs):
+        raise ValueError("compteur de factures")
+
+    monkeypatch.setattr(sale_importer.InvoiceNumberAllocator, 'allocate', allocate_fails)
+    with pytest.raises(ValueError, match="compteur"):
+        importer._insert(conn, cursor, [sale], "FAC")
+    assert conn.discarded
@@ -0,0 +1,111 @@
+from datetime import date, datetime, timedelta
+
+from models.sales_rollup import READ_CATCH_UP_DAYS, SalesRollup
+from tests.conftest import FakeDatabase
+
+
+WATERMARK = date(2026, 10, 14)  # hier
+
+
+def test_without_watermark_everything_is_raw():
+    bounds = (datetime(2026, 10, 1), datetime(2026, 11, 1))
+    assert SalesRollup.split_range(*bounds, None) == (None, [bounds])
+
+
+def test_month_reads_closed_days_from_rollup():
+    days, raw = SalesRollup.split_range(datetime(2026, 10, 1), datetime(2026, 11, 1), WATERMARK)
+    assert days == (date(2026, 10, 1), date(2026, 10, 15))
+    assert raw == [(datetime(2026, 10, 15), datetime(2026, 11, 1))]
+
+
+def test_today_is_raw_only():
+    bounds = (datetime(2026, 10, 15), datetime(2026, 10, 16))
+    assert SalesRollup.split_range(*bounds, WATERMARK) == (None, [bounds])
+
+
+def test_partial_first_day_is_raw():
+    days, raw = SalesRollup.split_range(datetime(2026, 9, 15, 14, 30), None, WATERMARK)
+    assert days == (date(2026, 9, 16), date(2026, 10, 15))
+    assert raw == [
+        (datetime(2026, 9, 15, 14, 30), datetime(2026, 9, 16)),
+        (datetime(2026, 10, 15), None),
+    ]
+
+
+def test_past_range_is_rollup_only():
+    days, raw = SalesRollup.split_range(datetime(2026, 1, 1), datetime(2026, 2, 1), WATERMARK)
+    assert days == (date(2026, 1, 1), date(2026, 2, 1))
+    assert raw == []
+
+
+def test_union_sql_params_follow_placeholders():
+    rollup = "SELECT r.jour FROM ventes_daily_rollup r WHERE {where}"
+    raw = "SELECT v.date_vente FROM ventes v WHERE {where}"
+    sql, params = SalesRollup.union_sql(
+        (datetime(2026, 9, 15, 14, 30), None), WATERMARK, rollup, raw
+    )
+    assert "UNION ALL" in sql
+    assert sql.count("%s") == len(params) == 5
+
+
+class RollupDatabase(FakeDatabase):
+    """Watermark (parametres) et première vente, agrégations notées dans `rebuilt`"""
+
+    def __init__(self, watermark, first_sale):
+        super().__init__()
+        self.watermark = watermark
+        self.first_sale = first_sale
+        self.rebuilt = []
+
+    def answer(self, sql, params):
+        if sql.startswith("DELETE FROM ventes_daily_rollup"):
+            self.rebuilt.append(params)
+        elif sql.lstrip().startswith("INSERT INTO parametres"):
+            self.watermark = date.fromisoformat(params[1])
+        elif "FROM parametres" in sql:
+            return [{'valeur': self.watermark.isoformat()}] if self.watermark else []
+        elif "MIN(date_vente)" in sql:
+            return [{'premiere': self.first_sale}]
+        return []
+
+
+def ensure(watermark, first_sale=None, max_days=None):
+    SalesRollup._watermark = None
+    db = RollupDatabase(watermark, first_sale)
+    result = SalesRollup.ensure_up_to_date(db.connect(), max_days)
+    SalesRollup._watermark = None
+    return result, db
+
+
+def test_read_path_builds_yesterday_only():
+    yesterday = date.today() - timedelta(days=1)
+    result, db = ensure(yesterday - timedelta(days=1), max_days=1)
+    assert result == yesterday and db.rebuilt == [(yesterday, yesterday)]
+
+
+def test_read_path_advances_a_gap_of_several_days():
+    yesterday = date.today() - timedelta(days=1)
+    behind = yesterday - timedelta(days=3)
+    result, db = ensure(behind, max_days=2)
+    assert db.rebuilt == [(behind + timedelta(days=1), behind + timedelta(days=2))]
+    assert result == db.watermark == behind + timedelta(days=2)
+
+    result, db = ensure(result, max_days=2)
+    assert result == db.watermark == yesterday
+
+
+def test_read_path_builds_one_slice_of_a_long_history():
+    old = date.today() - timedelta(days=400)
+    result, db = ensure(old, max_days=READ_CATCH_UP_DAYS)
+    assert len(db.rebuilt) == 1
+    assert result == db.watermark == old + timedelta(days=READ_CATCH_UP_DAYS)
+
+    result, db = ensure(None, datetime(2020, 1, 1, 9, 0), max_days=READ_CATCH_UP_DAYS)
+    assert db.rebuilt == [(date(2020, 1, 1), date(2020, 1, READ_CATCH_UP_DAYS))]
+    assert result == date(2020, 1, READ_CATCH_UP_DAYS)
+
+
+def test_unbounded_catch_up_builds_everything():
+    old = date.today() - timedelta(days=40)
+    result, db = ensure(old)
+    assert result == date.today() - timedelta(days=1) and len(db.rebuilt) == 2
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+from PyQt6.QtWidgets import QLineEdit
+
+from views.search import DebouncedSearch
+from views.workers import AsyncLoader
+
+
+@pytest.fixture
+def settle(qapp):
+    def wait(seconds):
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.005)
+    return wait
+
+
+def make_search(**kwargs):
+    calls = {'local': [], 'remote': [], 'results': [], 'cleared': 0}
+
+    def remote(text):
+        calls['remote'].append(text)
+        return [text.upper()]
+
+    def cleared():
+        calls['cleared'] += 1
+
+    line_edit = QLineEdit()
+    search = DebouncedSearch(
+        line_edit, AsyncLoader(), search=remote,
+        on_results=lambda text, rows: calls['results'].append((text, rows)),
+        local_filter=calls['local'].append, on_cleared=cleared, delay=50, **kwargs
+    )
+    return line_edit, search, calls
+
+
+def test_typing_filters_locally_then_queries_once(settle):
+    line_edit, _, calls = make_search()
+    for prefix in ("D", "Du", "Dup", "Dupo", "Dupon", "Dupont"):
+        line_edit.setText(prefix)
+    settle(0.3)
+
+    assert calls['local'] == ["D", "Du", "Dup", "Dupo", "Dupon", "Dupont"]
+    assert calls['remote'] == ["Dupont"]
+    assert calls['results'] == [("Dupont", ["DUPONT"])]
+
+
+def test_short_and_empty_text_do_not_query(settle):
+    line_edit, _, calls = make_search(min_length=3)
+    line_edit.setText("ab")
+    settle(0.15)
+    line_edit.setText("  ")
+    settle(0.15)
+
+    assert calls['remote'] == []
+    assert calls['cleared'] == 1
+
+
+def test_result_for_stale_text_is_dropped(settle):
+    release = threading.Event()
+    got = []
+
+    def slow(text):
+        release.wait(5)
+        return [text]
+
+    line_edit = QLineEdit()
+    DebouncedSearch(line_edit, AsyncLoader(), search=slow,
+                    on_results=lambda text, rows: got.append(text), delay=20, min_length=3)
+    line_edit.setText("Martin")
+    settle(0.1)  # la requête « Martin » est en cours
+    line_edit.setText("Ma")
+    release.set()
+    settle(0.2)
+
+    assert got == []
@@ -0,0 +1,105 @@
+import pytest
+
+import models.settings as settings_module
+from models.invoice_number import InvoiceNumberAllocator
+from models.settings import Settings
+from tests.conftest import FakeDatabase
+
+
+class SettingsDatabase(FakeDatabase):
+    """Table parametres en mémoire"""
+
+    def __init__(self, values):
+        super().__init__()
+        self.values = dict(values)
+
+    def answer(self, sql, params):
+        if sql.strip().startswith('INSERT'):
+            assert 'ON DUPLICATE KEY UPDATE' in sql
+            for i in range(0, len(params), 3):
+                self.values[params[i]] = params[i + 1]
+        keys = params if 'WHERE cle IN' in sql else self.values
+        return [{'cle': k, 'valeur': self.values[k]} for k in keys if k in self.values]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = SettingsDatabase({
+        'company_name': "Boutique Awa", 'currency': "XOF",
+        'tva_default': "18.5", 'invoice_prefix': "FAC/"
+    })
+    monkeypatch.setattr(settings_module, 'get_connection', database.connect)
+    monkeypatch.setattr(settings_module, 'SETTINGS_MAX_AGE', 3600)
+    Settings.invalidate()
+    yield database
+    Settings.invalidate()
+
+
+def test_all_settings_loaded_in_one_query(db):
+    assert Settings.get_company_info()['company_name'] == "Boutique Awa"
+    assert Settings.get_company_info()['company_logo'] == ""
+    assert Settings.get_general_settings()['currency'] == "XOF"
+    assert Settings.get_setting('timezone') is None
+    assert len(db.queries) == 1
+
+
+def test_typed_values_and_defaults(db):
+    assert Settings.tva_default() == 18.5
+    assert Settings.invoice_prefix() == "FAC"
+    assert InvoiceNumberAllocator.read_prefix() == "FAC"
+
+    db.values['tva_default'] = "abc"
+    del db.values['currency']
+    Settings.invalidate()
+    assert Settings.tva_default() == 18.0
+    assert Settings.currency() == "XOF"
+    assert len(db.queries) == 2
+
+
+def test_company_info_for_invoices(db):
+    info = Settings.get_invoice_company_info()
+    assert info['name'] == "Boutique Awa" and info['email'] == ""
+
+
+def test_bulk_upsert_writes_only_changed_keys(db):
+    Settings.all()
+    success, _, changed = Settings.set_many({
+        'company_name': "Boutique Awa", 'currency': "EUR", 'timezone': "Africa/Dakar"
+    })
+    assert success and changed == ['currency', 'timezone']
+    assert db.queries[1].startswith("SELECT cle, valeur FROM parametres WHERE cle IN")
+    assert len(db.queries) == 3 and db.queries[2].startswith("INSERT INTO parametres")
+    assert db.values['timezone'] == "Africa/Dakar"
+
+    # Cache mis à jour sans relecture complète ; rien à écrire la deuxième fois
+    assert Settings.currency() == "EUR"
+    assert Settings.set_many({'currency': "EUR"})[2] == []
+    assert len(db.queries) == 4 and not db.queries[3].startswith("INSERT")
+
+
+def test_stale_cache_does_not_hide_a_change(db):
+    assert Settings.currency() == "XOF"
+    # Modifié depuis un autre poste : le cache dit encore XOF
+    db.values['currency'] = "EUR"
+
+    success, message = Settings.update_general_settings(currency='XOF')
+    assert success and message == "Paramètres mis à jour"
+    assert db.values['currency'] == "XOF"
+    assert Settings.currency() == "XOF"
+
+
+def test_update_general_settings_is_one_write(db):
+    success, message = Settings.update_general_settings(tva=18.5, invoice_prefix="FAC/")
+    assert success and message == "Paramètres mis à jour"
+    assert sum(q.startswith("INSERT") for q in db.queries) == 1
+    assert db.values['date_format'] == "DD/MM/YYYY"
+
+
+def test_peek_never_queries(db):
+    assert Settings.peek('currency') == "XOF" and Settings.peek('tva_default') == 18.0
+    assert db.queries == []
+
+    Settings.all()
+    db.values['currency'] = "EUR"
+    assert Settings.peek('currency') == "XOF" and Settings.peek('tva_default') == 18.5
+    assert len(db.queries) == 1
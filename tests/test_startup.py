@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+import utils.startup as startup
+
+
+def test_login_view_does_not_import_heavy_modules():
+    # Processus séparé : les autres tests ont pu importer ces modules
+    code = (
+        "import sys; import views.login_view; "
+        "from utils.startup import HEAVY_MODULES; "
+        "print(','.join(m for m in HEAVY_MODULES + ('views.main_window', 'views.dashboard_view') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_import_profiler_records_nested_imports():
+    profiler = startup.ImportProfiler()
+    profiler.enter()
+    profiler.enter()
+    profiler.leave("parent.enfant")
+    profiler.leave("parent")
+
+    (depth_child, child, _, child_total), (depth_parent, parent, parent_self, parent_total) = profiler.records
+    assert (child, depth_child, parent, depth_parent) == ("parent.enfant", 1, "parent", 0)
+    assert parent_total >= child_total and parent_self <= parent_total
+
+
+def test_marks_are_ordered():
+    first = startup.mark("test A")
+    second = startup.mark("test B")
+    assert second >= first
+    assert [p for p, _ in startup.phases()][-2:] == ["test A", "test B"]
+
+
+def test_splash_message_does_not_add_a_phase(qapp):
+    from views.splash_screen import SplashScreen
+
+    before = startup.phases()
+    SplashScreen().update_message("Chargement des styles...")
+    assert startup.phases() == before
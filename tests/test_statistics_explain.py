@@ -0,0 +1,150 @@
+"""Vérifie que les filtres de période peuvent utiliser idx_date
+
+- sans base : le SQL généré filtre date_vente par un intervalle semi-ouvert
+  `date_vente >= %s AND date_vente < %s`, sans fonction autour de la colonne
+- avec une base MySQL configurée (.env) : EXPLAIN le confirme (ignoré sinon)
+"""
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+from database.connection import get_connection
+from models.statistics import DashboardSnapshot, Statistics
+from utils.helpers import resolve_period
+
+
+# Fonction appliquée à la colonne : DATE(v.date_vente), YEAR(date_vente)...
+WRAPPED_COLUMN = re.compile(r"\w+\(\s*(?:\w+\.)?date_vente\b", re.IGNORECASE)
+HALF_OPEN_RANGE = re.compile(r"(?:\w+\.)?date_vente >= %s AND (?:\w+\.)?date_vente < %s")
+
+
+class RecordingCursor:
+    """Curseur sans base : note le SQL de chaque requête"""
+
+    def __init__(self):
+        self.queries = []
+
+    def execute(self, sql, args=None):
+        self.queries.append(' '.join(sql.split()))
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+
+def generated_sql(fetch, *args):
+    cursor = RecordingCursor()
+    fetch(cursor, *args)
+    return cursor.queries[-1]
+
+
+def where_clauses(sql):
+    """Texte qui suit chaque WHERE (les agrégats du SELECT peuvent envelopper la colonne)"""
+    return ' '.join(sql.split(' WHERE ')[1:])
+
+
+MONTH = resolve_period('month')
+
+
+@pytest.mark.parametrize('fetch, args', [
+    (Statistics._fetch_totals, (MONTH,)),
+    (Statistics._fetch_period_totals, ()),
+    (Statistics._fetch_top_products, (MONTH, 5)),
+    (Statistics._fetch_top_clients, (MONTH, 5)),
+    (Statistics._fetch_ca_by_category, (MONTH,)),
+    (Statistics._fetch_product_totals, (MONTH,)),
+    (Statistics._fetch_client_totals, (MONTH,)),
+    (Statistics._fetch_daily_totals, (MONTH,)),
+    (Statistics._fetch_payment_status, ()),
+])
+def test_period_filter_is_a_half_open_range_on_the_bare_column(fetch, args):
+    sql = where_clauses(generated_sql(fetch, *args))
+    assert HALF_OPEN_RANGE.search(sql), sql
+    assert not WRAPPED_COLUMN.search(sql), sql
+
+
+def test_open_ended_and_dashboard_filters_leave_the_column_bare():
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    for sql in (
+        where_clauses(generated_sql(Statistics._fetch_ca_evolution, 30)),
+        where_clauses(generated_sql(DashboardSnapshot._fetch_counts, today - timedelta(days=30), today)),
+        where_clauses(generated_sql(DashboardSnapshot._fetch_sales, None, None, today)),
+    ):
+        assert re.search(r"date_vente >= %s", sql), sql
+        assert not WRAPPED_COLUMN.search(sql), sql
+
+
+def test_pattern_rejects_a_wrapped_column():
+    assert WRAPPED_COLUMN.search("WHERE DATE(v.date_vente) = CURDATE()")
+    assert WRAPPED_COLUMN.search("WHERE YEAR(date_vente) = %s")
+    assert not WRAPPED_COLUMN.search("SELECT v.date_vente as moment FROM ventes v")
+
+
+@pytest.fixture(scope='module')
+def mysql():
+    """Connexion MySQL, ou test ignoré (évalué seulement par les tests EXPLAIN)"""
+    conn = get_connection()
+    if not conn:
+        pytest.skip("Base de données indisponible")
+    conn.close()
+
+
+class ExplainCursor:
+    """Curseur qui exécute EXPLAIN à la place de chaque requête"""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.plans = []
+
+    def execute(self, sql, args=None):
+        self.cursor.execute("EXPLAIN " + sql, args)
+        self.plans.append(self.cursor.fetchall())
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+
+def explain(fetch, *args):
+    """Plan de la dernière requête de fetch (appelant : fixture mysql)"""
+    conn = get_connection()
+    try:
+        cursor = ExplainCursor(conn.cursor())
+        fetch(cursor, *args)
+        return cursor.plans[-1]
+    finally:
+        conn.close()
+
+
+def assert_ventes_uses_idx_date(plan):
+    ventes_rows = [row for row in plan if row['table'] in ('ventes', 'v')]
+    assert ventes_rows, plan
+    for row in ventes_rows:
+        # possible_keys est NULL dès qu'une fonction enveloppe date_vente
+        assert 'idx_date' in (row['possible_keys'] or ''), row
+
+
+def test_period_totals_use_idx_date(mysql):
+    assert_ventes_uses_idx_date(explain(Statistics._fetch_period_totals))
+
+
+@pytest.mark.parametrize('fetch', [
+    Statistics._fetch_top_products,
+    Statistics._fetch_top_clients,
+])
+def test_top_queries_use_idx_date(mysql, fetch):
+    assert_ventes_uses_idx_date(explain(fetch, resolve_period('month'), 5))
+
+
+def test_category_query_uses_idx_date(mysql):
+    assert_ventes_uses_idx_date(explain(Statistics._fetch_ca_by_category, resolve_period('week')))
+
+
+def test_evolution_and_payment_status_use_idx_date(mysql):
+    assert_ventes_uses_idx_date(explain(Statistics._fetch_ca_evolution, 30))
+    assert_ventes_uses_idx_date(explain(Statistics._fetch_payment_status))
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from views.table_models import (
+    SalesTableModel, DictTableModel, RowFilterProxyModel, Column, SORT_ROLE, SALES_COLUMNS
+)
+
+
+BASE = datetime(2026, 10, 1)
+SALES = [
+    {'id': i, 'numero_facture': f"2026/10/{i:06d}", 'date_vente': BASE - timedelta(hours=i // 2),
+     'montant_total': 100, 'montant_paye': 0, 'statut': 'en_cours', 'client_nom': 'Client'}
+    for i in range(1, 101)
+]
+# Même ordre que Sale.get_all : date_vente DESC, id DESC
+SALES.sort(key=lambda s: (s['date_vente'], s['id']), reverse=True)
+
+
+def make_fetch(calls):
+    def fetch(after, limit):
+        calls.append(after)
+        rows = SALES
+        if after:
+            rows = [s for s in SALES if (s['date_vente'], s['id']) < after]
+        return rows[:limit]
+    return fetch
+
+
+def test_pages_follow_keyset_without_gaps_or_duplicates():
+    calls = []
+    model = SalesTableModel(make_fetch(calls), page_size=30)
+    model.reload()
+    while model.canFetchMore():
+        model.fetchMore()
+
+    assert [s['id'] for s in model.rows()] == [s['id'] for s in SALES]
+    assert calls[0] is None
+    assert calls[1] == (SALES[29]['date_vente'], SALES[29]['id'])
+    assert len(calls) == 4  # 30 + 30 + 30 + 10
+
+
+def test_set_rows_disables_paging():
+    model = SalesTableModel(make_fetch([]), page_size=30)
+    model.set_rows(SALES[:3])
+    assert model.rowCount() == 3
+    assert not model.canFetchMore()
+    assert model.data(model.index(0, 0)) == SALES[0]['numero_facture']
+
+
+def test_proxy_filters_on_all_words_and_sorts_on_raw_values():
+    model = DictTableModel([
+        Column("Nom", 'nom'),
+        Column("Prix", 'prix', text=lambda p: f"{p['prix']:.2f} XOF"),
+    ])
+    model.set_rows([
+        {'nom': 'Riz parfumé 25kg', 'prix': 20000, 'categorie': 'Céréales'},
+        {'nom': 'Riz 5kg', 'prix': 4500, 'categorie': 'Céréales'},
+        {'nom': 'Huile 1L', 'prix': 1500, 'categorie': 'Huiles'},
+    ])
+    proxy = RowFilterProxyModel(('nom', 'categorie'))
+    proxy.setSourceModel(model)
+
+    proxy.set_text('riz CÉRÉALES')
+    assert proxy.rowCount() == 2
+
+    proxy.sort(1)
+    assert [proxy.row_at(i)['prix'] for i in range(proxy.rowCount())] == [4500, 20000]
+    assert proxy.index(0, 1).data(SORT_ROLE) == 4500
+
+    proxy.set_predicate(lambda p: p['prix'] > 10000)
+    assert proxy.rowCount() == 1
+
+    proxy.set_text('')
+    proxy.set_predicate(None)
+    assert proxy.rowCount() == 3
+
+
+def test_decimal_amounts_sort_numerically():
+    model = SalesTableModel()
+    model.set_rows([
+        dict(SALES[0], id=1, montant_total=Decimal('4500.00'), montant_paye=Decimal('150.00')),
+        dict(SALES[0], id=2, montant_total=Decimal('150.00'), montant_paye=Decimal('20000.00')),
+        dict(SALES[0], id=3, montant_total=Decimal('20000.00'), montant_paye=Decimal('4500.00')),
+    ])
+    proxy = RowFilterProxyModel(('numero_facture',))
+    proxy.setSourceModel(model)
+
+    for key in ('montant_total', 'montant_paye'):
+        column = next(i for i, c in enumerate(SALES_COLUMNS) if c.key == key)
+        proxy.sort(column)
+        assert [proxy.row_at(i)[key] for i in range(3)] == [Decimal('150.00'), Decimal('4500.00'), Decimal('20000.00')]
+
+
+def test_set_rows_continues_with_offset_pages():
+    offsets = []
+
+    def more(offset, limit):
+        offsets.append(offset)
+        return SALES[offset:offset + limit]
+
+    model = SalesTableModel(make_fetch([]), page_size=30)
+    model.set_rows(SALES[:30], fetch_more=more)
+    while model.canFetchMore():
+        model.fetchMore()
+
+    assert offsets == [30, 60, 90]
+    assert model.rows() == SALES
+
+    model.reload()  # retour à la liste paginée d'origine
+    assert model.rowCount() == 30 and model.canFetchMore()
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from views.table_models import SalesTableModel
+from views.workers import AsyncLoader
+
+
+def test_result_is_delivered_on_gui_thread(wait_idle):
+    loader = AsyncLoader()
+    got = []
+    loader.run('k', lambda x: (x * 2, threading.get_ident()), 21,
+               on_done=lambda result: got.append((result, threading.get_ident())))
+    wait_idle(loader)
+
+    ((value, worker_thread), gui_thread), = got
+    assert value == 42
+    assert worker_thread != threading.get_ident() and gui_thread == threading.get_ident()
+
+
+def test_superseded_request_is_ignored(qapp, wait_idle):
+    loader = AsyncLoader()
+    release = threading.Event()
+    got = []
+
+    def slow():
+        release.wait(5)
+        return 'ancien'
+
+    loader.run('k', slow, on_done=got.append)
+    loader.run('k', lambda: 'nouveau', on_done=got.append)
+    release.set()
+    wait_idle(loader)
+    time.sleep(0.05)
+    qapp.processEvents()
+
+    assert got == ['nouveau']
+
+
+def test_errors_and_busy_state(wait_idle):
+    loader = AsyncLoader()
+    states, errors = [], []
+    loader.busyChanged.connect(states.append)
+
+    def boom():
+        raise RuntimeError("base indisponible")
+
+    loader.run('k', boom, on_error=errors.append)
+    wait_idle(loader)
+
+    assert errors == ["base indisponible"]
+    assert states == [True, False]
+
+
+def test_model_pages_load_in_background(wait_idle):
+    loader = AsyncLoader()
+    sales = [{'id': i, 'date_vente': i} for i in range(50, 0, -1)]
+
+    def fetch(after, limit):
+        rows = [s for s in sales if after is None or (s['date_vente'], s['id']) < after]
+        return rows[:limit]
+
+    model = SalesTableModel(fetch, page_size=20, loader=loader)
+    model.reload()
+    assert model.rowCount() == 0 and not model.canFetchMore()
+    wait_idle(loader)
+    assert model.rowCount() == 20
+
+    while model.canFetchMore():
+        model.fetchMore()
+        wait_idle(loader)
+    assert [s['id'] for s in model.rows()] == [s['id'] for s in sales]
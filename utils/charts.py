@@ -0,0 +1,109 @@
+"""Graphiques du dashboard rendus hors écran (matplotlib Agg -> PNG)
+
+Le rendu n'utilise ni pyplot ni backend Qt : il peut donc tourner dans un
+worker. Le GUI n'a plus qu'à charger le PNG dans un QPixmap.
+
+Les images sont gardées en cache par (graphique, période, version des
+données) : tant que les agrégats ne changent pas, aucun nouveau rendu.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+
+def _draw_ca_evolution(figure, data):
+    dates = [str(item['date']) for item in data]
+    values = [float(item['ca']) for item in data]
+    ax = figure.add_subplot(111)
+    ax.plot(dates, values, marker='o', linestyle='-', color='#2196F3', linewidth=2)
+    ax.set_title('Évolution du CA (30 derniers jours)', fontweight='bold')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('CA (XOF)')
+    ax.grid(True, alpha=0.3)
+    # Une date sur ~6 : lisible quelle que soit la période
+    step = max(1, len(dates) // 6)
+    ax.set_xticks(range(0, len(dates), step))
+    ax.set_xticklabels(dates[::step], rotation=30, ha='right', fontsize=8)
+
+
+def _draw_ca_by_category(figure, data):
+    categories = [item['categorie'] or 'Non classé' for item in data]
+    values = [float(item['ca']) for item in data]
+    colors = ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF', '#FF9F40']
+    ax = figure.add_subplot(111)
+    ax.pie(values, labels=categories, autopct='%1.1f%%', colors=colors[:len(categories)])
+    ax.set_title('Répartition par Catégorie', fontweight='bold')
+
+
+class ChartRenderer:
+    """Rendu PNG des graphiques, avec cache (LRU) par version des données"""
+
+    # nom -> fonction de tracé (figure, données)
+    CHARTS = {
+        'ca_evolution': _draw_ca_evolution,
+        'ca_by_category': _draw_ca_by_category,
+    }
+    SIZE = (5, 3)       # pouces
+    DPI = 100
+    MAX_ENTRIES = 32
+
+    _lock = threading.Lock()
+    _cache = OrderedDict()      # (nom, période, version) -> PNG
+    _stats = {'hits': 0, 'renders': 0}
+
+    @staticmethod
+    def data_version(data):
+        """Empreinte des données d'un graphique"""
+        return hashlib.sha1(repr(data).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def render(name, period, data):
+        """PNG (bytes) du graphique `name`, None sans données
+
+        Servi depuis le cache si les mêmes données ont déjà été rendues.
+        """
+        if not data:
+            return None
+        key = (name, period, ChartRenderer.data_version(data))
+
+        with ChartRenderer._lock:
+            png = ChartRenderer._cache.get(key)
+            if png is not None:
+                ChartRenderer._cache.move_to_end(key)
+                ChartRenderer._stats['hits'] += 1
+                return png
+
+        png = ChartRenderer._rasterize(ChartRenderer.CHARTS[name], data)
+
+        with ChartRenderer._lock:
+            ChartRenderer._cache[key] = png
+            ChartRenderer._stats['renders'] += 1
+            while len(ChartRenderer._cache) > ChartRenderer.MAX_ENTRIES:
+                ChartRenderer._cache.popitem(last=False)
+        return png
+
+    @staticmethod
+    def _rasterize(draw, data):
+        # matplotlib importé au premier rendu, pas au démarrage
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        figure = Figure(figsize=ChartRenderer.SIZE, dpi=ChartRenderer.DPI)
+        FigureCanvasAgg(figure)
+        draw(figure, data)
+        figure.tight_layout()
+
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format='png')
+        return buffer.getvalue()
+
+    @staticmethod
+    def clear():
+        with ChartRenderer._lock:
+            ChartRenderer._cache.clear()
+
+    @staticmethod
+    def stats():
+        with ChartRenderer._lock:
+            return dict(ChartRenderer._stats, size=len(ChartRenderer._cache))
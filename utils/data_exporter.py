@@ -0,0 +1,235 @@
+"""Export brut des tables de ventes (CSV / JSONL compressés en gzip)
+
+Pour la comptabilité : ventes, ventes_details, paiements et
+mouvements_stock d'une période, ligne à ligne, sans mise en forme.
+
+- lecture par curseur côté serveur (database.connection.stream_query) :
+  la mémoire ne dépend que de la taille d'un lot, pas du nombre de lignes
+- CSV : en-tête en première ligne, même pour une table sans ligne sur la
+  période (colonnes lues par database.connection.query_columns) ; JSONL :
+  fichier vide dans ce cas
+- écriture par lots de CHUNK_ROWS lignes ; chaque lot est compressé
+  en un membre gzip ajouté en fin de fichier (un fichier gzip peut
+  enchaîner plusieurs membres : gzip, zcat et pandas les lisent d'un bloc)
+- une table par thread (workers), chacune sur sa propre connexion
+- reprise : après chaque lot, le dernier id écrit et la taille du
+  fichier sont notés dans le fichier de reprise ; un export interrompu
+  (erreur, annulation) repart de là, le fichier étant d'abord ramené à
+  la taille du dernier lot complet
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import DB_POOL_MAX_SIZE
+from database.connection import query_columns, stream_query
+
+
+# table -> (SELECT, colonne de date, clé primaire)
+TABLES = {
+    'ventes': (
+        "SELECT v.* FROM ventes v",
+        "v.date_vente", "v.id"
+    ),
+    'ventes_details': (
+        "SELECT vd.* FROM ventes_details vd JOIN ventes v ON vd.vente_id = v.id",
+        "v.date_vente", "vd.id"
+    ),
+    'paiements': (
+        "SELECT p.* FROM paiements p",
+        "p.date_paiement", "p.id"
+    ),
+    'mouvements_stock': (
+        "SELECT m.* FROM mouvements_stock m",
+        "m.date_mouvement", "m.id"
+    ),
+}
+
+FORMATS = ('csv', 'jsonl')
+CHECKPOINT_FILE = "reprise.json"
+
+
+class ExportCancelled(Exception):
+    """Export interrompu par le rappel de progression (reprise possible)"""
+
+
+class DataExporter:
+    """Export d'une période vers `directory` (un fichier .csv.gz / .jsonl.gz par table)
+
+    date_from / date_to : bornes semi-ouvertes [début, fin), comme
+    utils.helpers.resolve_period.
+    """
+
+    CHUNK_ROWS = 50_000
+    GZIP_LEVEL = 1          # rapide ; les données brutes se compressent bien
+
+    def __init__(self, directory, date_from, date_to, fmt='csv', tables=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"Format inconnu : {fmt} ({', '.join(FORMATS)})")
+        unknown = set(tables or ()) - set(TABLES)
+        if unknown:
+            raise ValueError(f"Table(s) inconnue(s) : {', '.join(sorted(unknown))}")
+
+        self.directory = directory
+        self.date_from = date_from
+        self.date_to = date_to
+        self.fmt = fmt
+        self.tables = list(tables or TABLES)
+
+        self._lock = threading.Lock()
+        self._checkpoint = None
+
+    # ==================== Export ====================
+
+    def run(self, workers=None, progress=None):
+        """Exporter les tables ; retourne (success, message, {table: lignes})
+
+        progress(table, lignes écrites) est appelé après chaque lot, depuis
+        le thread de la table ; s'il retourne False, l'export s'arrête
+        après ce lot et pourra être repris en relançant run().
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._checkpoint = self._load_checkpoint()
+
+        workers = workers or min(len(self.tables), max(1, DB_POOL_MAX_SIZE - 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {table: pool.submit(self.export_table, table, progress) for table in self.tables}
+
+        counts, errors, cancelled = {}, [], False
+        for table, future in futures.items():
+            try:
+                counts[table] = future.result()
+            except ExportCancelled:
+                cancelled = True
+            except Exception as e:
+                errors.append(f"{table} : {e}")
+            if table not in counts:
+                counts[table] = self._state(table)['rows']
+
+        total = sum(counts.values())
+        if errors:
+            return False, f"Erreur d'export ({'; '.join(errors)}), reprise possible", counts
+        if cancelled:
+            return False, f"Export interrompu après {total} lignes, reprise possible", counts
+
+        os.remove(self.checkpoint_path)
+        return True, f"Export réussi : {total} lignes dans {self.directory}", counts
+
+    def export_table(self, table, progress=None):
+        """Exporter une table (à partir du dernier lot écrit) ; retourne le nombre de lignes"""
+        state = self._state(table)
+        if state['done']:
+            return state['rows']
+
+        path = self.path(table)
+        self._truncate(path, state['size'])
+
+        select, date_column, key = TABLES[table]
+        rows = stream_query(
+            f"{select} WHERE {date_column} >= %s AND {date_column} < %s AND {key} > %s ORDER BY {key}",
+            (self.date_from, self.date_to, state['last_id'])
+        )
+
+        chunk = []
+        try:
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= self.CHUNK_ROWS:
+                    self._write_chunk(table, path, chunk, progress)
+                    chunk = []
+            if chunk or not state['size']:
+                # Dernier lot (ou en-tête seul pour une table vide)
+                self._write_chunk(table, path, chunk, progress)
+        finally:
+            rows.close()
+
+        with self._lock:
+            state['done'] = True
+            self._save_checkpoint()
+        return state['rows']
+
+    def _write_chunk(self, table, path, chunk, progress):
+        state = self._state(table)
+        header = None
+        if not state['size'] and self.fmt == 'csv':
+            header = list(chunk[0]) if chunk else query_columns(TABLES[table][0])
+        data = self._encode(chunk, header)
+        with open(path, 'ab') as f:
+            f.write(gzip.compress(data, compresslevel=self.GZIP_LEVEL))
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+
+        with self._lock:
+            if chunk:
+                state['last_id'] = chunk[-1]['id']
+            state['rows'] += len(chunk)
+            state['size'] = size
+            self._save_checkpoint()
+
+        if progress and progress(table, state['rows']) is False:
+            raise ExportCancelled()
+
+    def _encode(self, rows, header=None):
+        """Lignes encodées ; header : colonnes CSV à écrire en tête (premier lot)"""
+        buffer = io.StringIO()
+        if self.fmt == 'jsonl':
+            for row in rows:
+                buffer.write(json.dumps(row, default=str, ensure_ascii=False))
+                buffer.write("\n")
+        else:
+            writer = csv.writer(buffer)
+            if header:
+                writer.writerow(header)
+            writer.writerows(row.values() for row in rows)
+        return buffer.getvalue().encode('utf-8')
+
+    def path(self, table):
+        return os.path.join(self.directory, f"{table}.{self.fmt}.gz")
+
+    @staticmethod
+    def _truncate(path, size):
+        """Retirer un lot à moitié écrit (interruption après le dernier point de reprise)"""
+        if os.path.exists(path):
+            with open(path, 'r+b') as f:
+                f.truncate(size)
+
+    # ==================== Reprise ====================
+
+    @property
+    def checkpoint_path(self):
+        return os.path.join(self.directory, CHECKPOINT_FILE)
+
+    def _params(self):
+        return {'du': str(self.date_from), 'au': str(self.date_to), 'format': self.fmt}
+
+    def _load_checkpoint(self):
+        """Point de reprise d'un export identique interrompu, sinon départ à zéro"""
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            checkpoint = None
+
+        if not checkpoint or checkpoint.get('params') != self._params():
+            checkpoint = {'params': self._params(), 'tables': {}}
+            for table in self.tables:
+                self._truncate(self.path(table), 0)
+
+        for table in self.tables:
+            checkpoint['tables'].setdefault(table, {'last_id': 0, 'rows': 0, 'size': 0, 'done': False})
+        return checkpoint
+
+    def _state(self, table):
+        return self._checkpoint['tables'][table]
+
+    def _save_checkpoint(self):
+        """Écrire le point de reprise (appelant : self._lock)"""
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._checkpoint, f, indent=2)
+        os.replace(tmp, self.checkpoint_path)
@@ -1,64 +1,147 @@
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
+from collections import namedtuple
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from openpyxl.utils import get_column_letter
 from datetime import datetime
 
 
-class ClientExporter:
+# Une colonne d'export : valeur(ligne) et style nommé (ou fonction valeur -> style)
+ExcelColumn = namedtuple('ExcelColumn', 'header width value style', defaults=(None,))
 
-    @staticmethod
-    def export_to_excel(clients, filepath):
-        """Exporter la liste des clients en Excel"""
-        try:
-            # Créer un classeur
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Clients"
+# Appel de progress(lignes écrites, total) toutes les PROGRESS_EVERY lignes
+PROGRESS_EVERY = 1000
 
-            # En-têtes
-            headers = ["ID", "Nom", "Prénom", "Téléphone", "Email", "Adresse", "Ville", "Code Postal", "Date Création"]
-            ws.append(headers)
+STATUS_FILLS = {
+    'payee': "C6EFCE",
+    'partielle': "FFEB9C",
+    'en_cours': "FFC7CE",
+}
 
-            # Formater les en-têtes
-            header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
 
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
+class ExportCancelled(Exception):
+    """Export interrompu par le rappel de progression"""
 
-            # Ajouter les données
-            for client in clients:
-                ws.append([
-                    client.get('id', ''),
-                    client.get('nom', ''),
-                    client.get('prenom', ''),
-                    client.get('telephone', ''),
-                    client.get('email', ''),
-                    client.get('adresse', ''),
-                    client.get('ville', ''),
-                    client.get('code_postal', ''),
-                    client.get('created_at', '')
-                ])
 
-            # Ajuster les largeurs de colonnes
-            ws.column_dimensions['A'].width = 8
-            ws.column_dimensions['B'].width = 15
-            ws.column_dimensions['C'].width = 15
-            ws.column_dimensions['D'].width = 15
-            ws.column_dimensions['E'].width = 25
-            ws.column_dimensions['F'].width = 30
-            ws.column_dimensions['G'].width = 15
-            ws.column_dimensions['H'].width = 12
-            ws.column_dimensions['I'].width = 18
+def _named_styles(header_color):
+    """Styles des cellules, créés une fois par classeur
 
-            # Centrer les colonnes ID et Code Postal
-            for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=1):
-                for cell in row:
-                    cell.alignment = Alignment(horizontal="center")
+    Chaque cellule ne porte que le nom de son style : pas d'objet Font /
+    PatternFill par cellule, pas de seconde passe sur la feuille.
+    """
+    styles = [
+        NamedStyle(name="entete", font=Font(bold=True, color="FFFFFF"), fill=_solid(header_color),
+                   alignment=Alignment(horizontal="center", vertical="center")),
+        NamedStyle(name="centre", alignment=Alignment(horizontal="center")),
+        NamedStyle(name="montant", number_format='0.00', alignment=Alignment(horizontal="right")),
+    ]
+    styles += [NamedStyle(name=f"statut_{statut}", fill=_solid(color)) for statut, color in STATUS_FILLS.items()]
+    return styles
 
-            wb.save(filepath)
-            return True, f"Export réussi : {filepath}"
+
+def _solid(color):
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+def status_style(statut):
+    """Style de la cellule statut (couleur de fond), None si sans couleur"""
+    return f"statut_{statut}" if statut in STATUS_FILLS else None
+
+
+def write_sheet(filepath, title, columns, rows, total=None, progress=None, header_color="4472C4"):
+    """Écrire `rows` dans un classeur en mode écriture seule ; retourne le nombre de lignes
+
+    rows peut être un générateur (curseur côté serveur) : chaque ligne est
+    écrite puis oubliée, la mémoire ne dépend pas du nombre de lignes.
+    progress(lignes écrites, total) est appelé toutes les PROGRESS_EVERY
+    lignes et à la fin ; s'il retourne False, l'export s'arrête
+    (ExportCancelled) sans créer le fichier.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    for style in _named_styles(header_color):
+        wb.add_named_style(style)
+    ws = wb.create_sheet(title)
+
+    # En mode écriture seule, largeurs et volets avant la première ligne
+    for index, column in enumerate(columns, start=1):
+        ws.column_dimensions[get_column_letter(index)].width = column.width
+    ws.freeze_panes = "A2"
+
+    ws.append([_cell(ws, column.header, "entete") for column in columns])
+
+    count = 0
+    try:
+        for row in rows:
+            ws.append([_cell(ws, column.value(row), column.style) for column in columns])
+            count += 1
+            if progress and count % PROGRESS_EVERY == 0 and progress(count, total) is False:
+                raise ExportCancelled()
+    except BaseException:
+        _discard(ws)
+        raise
+
+    if progress:
+        progress(count, total)
+    wb.save(filepath)
+    return count
+
+
+def _discard(ws):
+    """Fermer une feuille abandonnée (son fichier temporaire est supprimé
+    par openpyxl à la sortie du programme)"""
+    try:
+        ws.close()
+    except Exception as e:
+        # Ne pas masquer l'erreur (ou l'annulation) en cours de traitement
+        print(f"Erreur fermeture feuille Excel : {e}")
+
+
+def _cell(ws, value, style):
+    if callable(style):
+        style = style(value)
+    if style is None:
+        return value
+    cell = WriteOnlyCell(ws, value)
+    cell.style = style
+    return cell
+
+
+CLIENT_COLUMNS = [
+    ExcelColumn("ID", 8, lambda c: c.get('id', ''), "centre"),
+    ExcelColumn("Nom", 15, lambda c: c.get('nom', '')),
+    ExcelColumn("Prénom", 15, lambda c: c.get('prenom', '')),
+    ExcelColumn("Téléphone", 15, lambda c: c.get('telephone', '')),
+    ExcelColumn("Email", 25, lambda c: c.get('email', '')),
+    ExcelColumn("Adresse", 30, lambda c: c.get('adresse', '')),
+    ExcelColumn("Ville", 15, lambda c: c.get('ville', '')),
+    ExcelColumn("Code Postal", 12, lambda c: c.get('code_postal', '')),
+    ExcelColumn("Date Création", 18, lambda c: c.get('created_at', '')),
+]
+
+SALE_COLUMNS = [
+    ExcelColumn("N° Facture", 15, lambda s: s.get('numero_facture', '')),
+    ExcelColumn("Client", 20, lambda s: s.get('client_nom', '')),
+    ExcelColumn("Date", 12, lambda s: str(s.get('date_vente', ''))[:10]),
+    ExcelColumn("Montant TTC", 14, lambda s: float(s.get('montant_total') or 0), "montant"),
+    ExcelColumn("Montant Payé", 14, lambda s: float(s.get('montant_paye') or 0), "montant"),
+    ExcelColumn("Montant Restant", 14, lambda s: float(s.get('montant_reste') or 0), "montant"),
+    ExcelColumn("Statut", 12, lambda s: s.get('statut', ''), status_style),
+]
+
+
+class ClientExporter:
+
+    @staticmethod
+    def export_to_excel(clients, filepath, total=None, progress=None):
+        """Exporter la liste des clients en Excel
+
+        clients : liste ou générateur (ClientController.iter_clients)
+        """
+        try:
+            count = write_sheet(filepath, "Clients", CLIENT_COLUMNS, clients, total, progress)
+            return True, f"Export réussi : {filepath} ({count} clients)"
+        except ExportCancelled:
+            return False, "Export annulé"
         except Exception as e:
             return False, f"Erreur d'export : {str(e)}"
 
@@ -109,64 +192,15 @@ class ClientExporter:
             return False, f"Erreur d'export : {str(e)}"
 
 
-def export_sales_to_excel(sales, filepath):
-    """Exporter les ventes en Excel"""
+def export_sales_to_excel(sales, filepath, total=None, progress=None):
+    """Exporter les ventes en Excel
+
+    sales : liste ou générateur (SaleController.iter_sales)
+    """
     try:
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Ventes"
-
-        # En-têtes
-        headers = ["N° Facture", "Client", "Date", "Montant TTC", "Montant Payé", "Montant Restant", "Statut"]
-        ws.append(headers)
-
-        # Formater les en-têtes
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # Ajouter les données
-        for sale in sales:
-            ws.append([
-                sale.get('numero_facture', ''),
-                sale.get('client_nom', ''),
-                str(sale.get('date_vente', ''))[:10],
-                float(sale.get('montant_total', 0)),
-                float(sale.get('montant_paye', 0)),
-                float(sale.get('montant_reste', 0)),
-                sale.get('statut', '')
-            ])
-
-        # Ajuster les largeurs de colonnes
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 12
-        ws.column_dimensions['D'].width = 14
-        ws.column_dimensions['E'].width = 14
-        ws.column_dimensions['F'].width = 14
-        ws.column_dimensions['G'].width = 12
-
-        # Formater les montants
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=4, max_col=6):
-            for cell in row:
-                cell.number_format = '0.00'
-                cell.alignment = Alignment(horizontal="right")
-
-        # Colorer le statut
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=7, max_col=7):
-            for cell in row:
-                if cell.value == 'payee':
-                    cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-                elif cell.value == 'partielle':
-                    cell.fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-                elif cell.value == 'en_cours':
-                    cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-
-        wb.save(filepath)
-        return True, f"Export réussi : {filepath}"
+        count = write_sheet(filepath, "Ventes", SALE_COLUMNS, sales, total, progress)
+        return True, f"Export réussi : {filepath} ({count} ventes)"
+    except ExportCancelled:
+        return False, "Export annulé"
     except Exception as e:
         return False, f"Erreur d'export : {str(e)}"
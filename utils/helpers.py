@@ -0,0 +1,65 @@
+from datetime import date, datetime, time, timedelta
+
+
+PERIODS = ('today', 'week', 'month', 'custom')
+
+
+def _start_of_day(value):
+    """Minuit du jour donné (date ou datetime)"""
+    if isinstance(value, datetime):
+        return datetime.combine(value.date(), time.min)
+    return datetime.combine(value, time.min)
+
+
+def resolve_period(period='today', start=None, end=None, now=None):
+    """Convertir une période en bornes semi-ouvertes [début, fin)
+
+    period: 'today', 'week', 'month' ou 'custom'
+    - week : semaine commençant le dimanche (comme YEARWEEK() de MySQL)
+    - custom : `start` obligatoire ; une date de fin est incluse (la borne
+      devient le lendemain à minuit), un datetime de fin est exclu tel quel.
+      Sans fin, la période s'étend jusqu'à la fin de la journée.
+
+    À utiliser sous la forme `col >= %s AND col < %s` pour que MySQL puisse
+    utiliser l'index de la colonne (pas de DATE()/YEAR() sur la colonne).
+    """
+    now = now or datetime.now()
+    today = _start_of_day(now)
+
+    if period == 'today':
+        return today, today + timedelta(days=1)
+
+    if period == 'week':
+        # weekday() : lundi = 0 ... dimanche = 6
+        week_start = today - timedelta(days=(today.weekday() + 1) % 7)
+        return week_start, week_start + timedelta(days=7)
+
+    if period == 'month':
+        month_start = today.replace(day=1)
+        if month_start.month == 12:
+            next_month = month_start.replace(year=month_start.year + 1, month=1)
+        else:
+            next_month = month_start.replace(month=month_start.month + 1)
+        return month_start, next_month
+
+    if period == 'custom':
+        if start is None:
+            raise ValueError("Période personnalisée : date de début obligatoire")
+
+        start_dt = start if isinstance(start, datetime) else _start_of_day(start)
+
+        if end is None:
+            end_dt = today + timedelta(days=1)
+        elif isinstance(end, datetime):
+            end_dt = end
+        elif isinstance(end, date):
+            end_dt = _start_of_day(end) + timedelta(days=1)
+        else:
+            raise ValueError(f"Date de fin invalide : {end!r}")
+
+        if end_dt <= start_dt:
+            raise ValueError("La date de fin doit être postérieure à la date de début")
+        return start_dt, end_dt
+
+    raise ValueError(f"Période inconnue : {period}")
+
@@ -0,0 +1,42 @@
+"""Hachage des mots de passe (bcrypt)
+
+Le coût (BCRYPT_ROUNDS) est lu dans la configuration. Un hash d'un autre
+coût reste valide ; needs_rehash() permet de le remplacer à la connexion,
+quand le mot de passe en clair est disponible.
+"""
+import bcrypt
+
+import config
+
+
+def hash_password(password, rounds=None):
+    """Hash bcrypt (texte) de `password` au coût configuré"""
+    salt = bcrypt.gensalt(rounds=rounds or config.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def verify_password(password, password_hash):
+    """Vérifier `password` contre un hash bcrypt (texte ou bytes)"""
+    if isinstance(password_hash, str):
+        password_hash = password_hash.encode("utf-8")
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), password_hash)
+    except ValueError:
+        # Hash illisible (colonne corrompue ou autre algorithme)
+        return False
+
+
+def hash_rounds(password_hash):
+    """Coût d'un hash bcrypt ($2b$12$...), None s'il est illisible"""
+    if isinstance(password_hash, bytes):
+        password_hash = password_hash.decode("utf-8", "replace")
+    parts = (password_hash or "").split("$")
+    try:
+        return int(parts[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(password_hash):
+    """Le hash a-t-il été calculé avec un autre coût que BCRYPT_ROUNDS ?"""
+    return hash_rounds(password_hash) != config.BCRYPT_ROUNDS
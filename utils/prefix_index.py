@@ -0,0 +1,172 @@
+"""Index de recherche en mémoire pour la saisie à la frappe
+
+PrefixIndex associe un identifiant à un libellé (nom de produit, de
+client...) et à des codes exacts (référence, téléphone...) :
+
+- préfixe de mots : liste triée des mots, parcourue par bisect — « riz par »
+  trouve « Riz parfumé 25kg » ; tous les mots saisis doivent correspondre
+- trigrammes : repli, quand aucun mot ne correspond, pour un fragment au
+  milieu d'un mot (« 5kg » dans « 25kg ») ou une faute de frappe
+
+La casse et les accents sont ignorés. Une recherche retourne les
+identifiants des `limit` meilleurs résultats, sans aucune requête.
+"""
+import bisect
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+
+def normalize(text):
+    """Minuscules sans accents"""
+    text = str(text or '').lower()
+    if text.isascii():
+        return text
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def words(text):
+    return re.findall(r'\w+', normalize(text))
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PrefixIndex:
+    """Index préfixe + trigrammes (voir le module)
+
+    Construit en une fois (build) ; à reconstruire quand les données changent.
+    """
+
+    # Au-delà, un préfixe trop fréquent (« r ») n'est pas trié par
+    # pertinence : on garde les premiers résultats dans l'ordre alphabétique
+    MAX_CANDIDATES = 300
+    # Part minimale des trigrammes de la saisie présents dans le libellé
+    MIN_TRIGRAM_SCORE = 0.5
+
+    def __init__(self, entries=()):
+        self._labels = {}       # id -> libellé normalisé
+        self._words = {}        # id -> mots du libellé
+        self._keys = []         # mots triés (pour bisect)
+        self._ids = []          # id du mot de même rang dans _keys
+        self._codes = defaultdict(list)     # code exact normalisé -> [id, ...]
+        self._trigrams = defaultdict(list)  # trigramme -> [id, ...]
+        if entries:
+            self.build(entries)
+
+    def __len__(self):
+        return len(self._labels)
+
+    def build(self, entries):
+        """entries : itérable de (id, libellé) ou (id, libellé, codes)"""
+        pairs = []
+        for entry in entries:
+            item_id, label = entry[0], entry[1]
+            codes = entry[2] if len(entry) > 2 else ()
+
+            label = normalize(label)
+            item_words = re.findall(r'\w+', label)
+            self._labels[item_id] = label
+            self._words[item_id] = item_words
+            pairs.extend((word, item_id) for word in set(item_words))
+
+            for code in codes:
+                if code:
+                    self._codes[normalize(code).strip()].append(item_id)
+
+            postings = self._trigrams
+            for trigram in trigrams(' '.join(item_words)):
+                postings[trigram].append(item_id)
+
+        pairs.sort()
+        self._keys = [word for word, _ in pairs]
+        self._ids = [item_id for _, item_id in pairs]
+
+    def _prefix_range(self, prefix):
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + '￿', start)
+        return start, end
+
+    def search(self, query, limit=20):
+        """Identifiants des meilleurs résultats pour `query`"""
+        query_words = words(query)
+        if not query_words:
+            return []
+
+        results = []
+        seen = set()
+
+        def add(item_id):
+            if item_id not in seen:
+                seen.add(item_id)
+                results.append(item_id)
+
+        # Codes exacts (référence, code-barres...)
+        for item_id in self._codes.get(normalize(query).strip(), ()):
+            add(item_id)
+
+        for item_id in self._prefix_matches(query_words, limit):
+            add(item_id)
+
+        text = ' '.join(query_words)
+        if not results and len(text) >= 3:
+            # Aucun mot ne correspond : fragment ou faute de frappe
+            for item_id in self._trigram_matches(text, limit):
+                add(item_id)
+
+        return results[:limit]
+
+    def _prefix_matches(self, query_words, limit):
+        ranges = sorted((self._prefix_range(word), word) for word in query_words)
+        # Parcours de l'intervalle du mot le plus rare ; les autres mots sont
+        # vérifiés sur le libellé de chaque candidat (pas d'ensembles complets)
+        (start, end), rarest = min(ranges, key=lambda r: r[0][1] - r[0][0])
+        if start == end:
+            return []
+        others = [word for _, word in ranges if word != rarest]
+
+        wide = end - start > self.MAX_CANDIDATES
+        candidates = []
+        seen = set()
+        for position in range(start, end):
+            item_id = self._ids[position]
+            if item_id in seen:
+                continue
+            seen.add(item_id)
+            item_words = self._words[item_id]
+            if others and not all(any(w.startswith(word) for w in item_words) for word in others):
+                continue
+            candidates.append(item_id)
+            if wide and len(candidates) >= limit:
+                # Préfixe très fréquent : ordre alphabétique des mots
+                return candidates
+
+        return self._rank(candidates, query_words, limit)
+
+    def _rank(self, candidates, query_words, limit):
+        text = ' '.join(query_words)
+
+        def rank(item_id):
+            label = self._labels[item_id]
+            return (
+                not label.startswith(text),                              # libellé commençant par la saisie
+                not self._words[item_id][0].startswith(query_words[0]),  # puis par le premier mot
+                len(label),
+                label,
+            )
+
+        return sorted(candidates, key=rank)[:limit]
+
+    def _trigram_matches(self, text, limit):
+        query_trigrams = trigrams(text)
+        counts = Counter()
+        for trigram in query_trigrams:
+            counts.update(self._trigrams.get(trigram, ()))
+
+        needed = len(query_trigrams) * self.MIN_TRIGRAM_SCORE
+        matches = [(count, item_id) for item_id, count in counts.items() if count >= needed]
+        matches.sort(key=lambda m: (-m[0], len(self._labels[m[1]])))
+        return [item_id for _, item_id in matches[:limit]]
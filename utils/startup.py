@@ -0,0 +1,139 @@
+"""Chronologie du démarrage et profil des imports
+
+main.py importe ce module en premier : mark(phase) note le temps écoulé
+depuis cet instant. Avec --profile-startup, chaque phase est affichée
+(console et splash) et report() écrit la chronologie puis le temps
+d'import de chaque module, au format de `python -X importtime`.
+"""
+import importlib.abc
+import sys
+import time
+
+
+_started = time.perf_counter()
+_phases = []            # (phase, ms depuis le démarrage)
+_profiler = None
+
+# Modules dont le chargement au démarrage est une régression
+HEAVY_MODULES = ('matplotlib', 'numpy', 'openpyxl', 'reportlab')
+
+
+def elapsed_ms():
+    return (time.perf_counter() - _started) * 1000
+
+
+def mark(phase):
+    """Noter la fin d'une phase ; retourne le temps écoulé (ms)"""
+    ms = elapsed_ms()
+    _phases.append((phase, ms))
+    if _profiler:
+        print(f"[démarrage] {ms:8.1f} ms  {phase}", file=sys.stderr)
+    return ms
+
+
+def phases():
+    return list(_phases)
+
+
+def profiling():
+    return _profiler is not None
+
+
+def enable_profile():
+    """Activer le profil des imports (à appeler avant les imports à mesurer)"""
+    global _profiler
+    if _profiler is None:
+        _profiler = ImportProfiler()
+        sys.meta_path.insert(0, _profiler)
+    return _profiler
+
+
+def heavy_modules_loaded():
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def report(file=None, top=15):
+    """Écrire la chronologie, les imports les plus coûteux et le détail"""
+    file = file or sys.stderr
+    print("\n=== Démarrage : chronologie ===", file=file)
+    previous = 0.0
+    for phase, ms in _phases:
+        print(f"{ms:8.1f} ms  (+{ms - previous:7.1f})  {phase}", file=file)
+        previous = ms
+
+    heavy = heavy_modules_loaded()
+    print(f"Modules lourds chargés : {', '.join(heavy) if heavy else 'aucun'}", file=file)
+
+    if not _profiler:
+        return
+    records = _profiler.records
+    print(f"\n=== Imports les plus coûteux (cumulé, top {top}) ===", file=file)
+    for depth, name, self_us, cumulative_us in sorted(records, key=lambda r: -r[3])[:top]:
+        print(f"{cumulative_us / 1000:8.1f} ms  {name}", file=file)
+
+    print("\nimport time: self [us] | cumulative | imported package", file=file)
+    for depth, name, self_us, cumulative_us in records:
+        print(f"import time: {self_us:>9} | {cumulative_us:>10} | {'  ' * depth}{name}", file=file)
+
+
+class _TimedLoader:
+    """Loader chronométrant exec_module ; le reste est délégué"""
+
+    def __init__(self, loader, name, profiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        create = getattr(self._loader, 'create_module', None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        self._profiler.enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.leave(self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """Mesure le temps d'exécution de chaque module importé
+
+    Les enregistrements (profondeur, module, propre µs, cumulé µs) sont
+    ajoutés à la fin de chaque import, comme -X importtime.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._stack = []        # [début, temps des imports imbriqués]
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, 'find_spec', None)
+            spec = find_spec(fullname, path, target) if find_spec else None
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, fullname, self)
+        return spec
+
+    def enter(self):
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def leave(self, name):
+        started, children = self._stack.pop()
+        cumulative = time.perf_counter() - started
+        if self._stack:
+            self._stack[-1][1] += cumulative
+        self.records.append((
+            len(self._stack), name,
+            int((cumulative - children) * 1e6), int(cumulative * 1e6)
+        ))
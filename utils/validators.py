@@ -247,3 +247,19 @@ class SaleValidator:
             return False, error
 
         return True, ""
+
+    @staticmethod
+    def validate_batch(sales):
+        """Valider un lot de ventes (import)
+
+        sales: liste de dicts avec client_id, articles, tva, remise, remise_type
+        Retourne la liste des (index, erreur) des ventes invalides.
+        """
+        errors = []
+        for index, sale in enumerate(sales):
+            is_valid, error = SaleValidator.validate_sale_form(
+                sale['client_id'], sale['articles'], sale['tva'], sale['remise'], sale['remise_type']
+            )
+            if not is_valid:
+                errors.append((index, error))
+        return errors
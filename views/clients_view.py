@@ -6,12 +6,26 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from controllers.client_controller import ClientController
 from utils.path import resource_path
+from views.workers import AsyncLoader, ExportProgress, LoadingOverlay
+from views.search import DebouncedSearch
+from views.pickers import ClientPicker
+from views.table_models import Column, DictTableModel, RowFilterProxyModel, ActionButtonDelegate
 from utils.validators import ClientValidator
-from utils.excel_exporter import ClientExporter
-from utils.pdf_generator import ClientPDFGenerator
 from datetime import datetime
 
 
+CLIENT_COLUMNS = [
+    Column("ID", 'id', width=60),
+    Column("Nom", 'nom', width=150),
+    Column("Prénom", 'prenom', width=150),
+    Column("Téléphone", 'telephone', width=130),
+    Column("Email", 'email', width=200),
+    Column("Ville", 'ville', width=120),
+    Column("Actions", actions=[('edit', "✏️ Modifier"), ('history', "📊 Historique"), ('delete', "🗑️ Supprimer")],
+           width=390),
+]
+
+
 class ClientsView(QWidget):
     def __init__(self):
         super().__init__()
@@ -19,12 +33,45 @@ class ClientsView(QWidget):
         uic.loadUi(resource_path("views/ui/clients.ui"), self)
         
         self.clients_data = []
+
+        # Lectures en arrière-plan : l'interface ne bloque pas sur MySQL
+        self.loader = AsyncLoader(self)
+
+        # Modèle + filtre local (la recherche masque des lignes, sans
+        # reconstruire le tableau)
+        self.clients_model = DictTableModel(CLIENT_COLUMNS, parent=self)
+        self.clients_proxy = RowFilterProxyModel(('nom', 'prenom', 'telephone', 'email', 'ville'), self)
+        self.clients_proxy.setSourceModel(self.clients_model)
+        self.clientsTable.setModel(self.clients_proxy)
+        self.clientsTable.setSortingEnabled(True)
+        self.clientsTable.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        self.clientsTable.verticalHeader().setDefaultSectionSize(44)
+        self.clientsTable.horizontalHeader().setStretchLastSection(True)
+        for index, column in enumerate(CLIENT_COLUMNS):
+            if column.width:
+                self.clientsTable.setColumnWidth(index, column.width)
+
+        self.actions_delegate = ActionButtonDelegate(CLIENT_COLUMNS[-1].actions, self.clientsTable)
+        self.actions_delegate.actionTriggered.connect(self.on_client_action)
+        self.clientsTable.setItemDelegateForColumn(len(CLIENT_COLUMNS) - 1, self.actions_delegate)
+
+        self.loading_overlay = LoadingOverlay(self.clientsTable)
+        self.loader.busyChanged.connect(self.loading_overlay.set_busy)
+        # Exports : sans voile, la progression a sa propre fenêtre
+        self.export_loader = AsyncLoader(self)
         
         # Connexions des signaux
         self.btnAdd.clicked.connect(self.open_add_dialog)
         self.btnExportExcel.clicked.connect(self.export_excel)
         self.btnExportPDF.clicked.connect(self.export_pdf)
-        self.searchInput.textChanged.connect(self.search_clients)
+        self.search = DebouncedSearch(
+            self.searchInput, self.loader,
+            search=ClientController.search_clients,
+            on_results=self.show_search_results,
+            local_filter=self.search_clients,
+            on_cleared=lambda: self.refresh_table(self.clients_data),
+            parent=self
+        )
         self.clientsTable.doubleClicked.connect(self.edit_client)
         
         # Menu contextuel
@@ -35,83 +82,41 @@ class ClientsView(QWidget):
         self.load_clients()
 
     def load_clients(self):
-        """Charger et afficher tous les clients"""
-        self.clients_data = ClientController.get_all_clients()
+        """Charger et afficher tous les clients (en arrière-plan)"""
+        self.loader.run('clients', ClientController.get_all_clients, on_done=self.show_clients)
+
+    def show_clients(self, clients):
+        """Afficher les clients chargés"""
+        self.clients_data = clients or []
         self.refresh_table(self.clients_data)
         self.update_stats()
+        if self.search.text():
+            # Recherche en cours : filtrer les lignes rechargées et relancer MySQL
+            self.clients_proxy.set_text(self.search.text())
+            self.search.trigger()
 
     def refresh_table(self, clients):
         """Rafraîchir le tableau avec les clients"""
-        self.clientsTable.setRowCount(0)
-        self.clientsTable.setColumnCount(7)
-        self.clientsTable.setHorizontalHeaderLabels(["ID", "Nom", "Prénom", "Téléphone", "Email", "Ville", "Actions"])
-        self.clientsTable.verticalHeader().setDefaultSectionSize(44)
-        
-        for row_idx, client in enumerate(clients):
-            self.clientsTable.insertRow(row_idx)
-            
-            # ID
-            id_item = QTableWidgetItem(str(client.get('id', '')))
-            id_item.setFlags(id_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.clientsTable.setItem(row_idx, 0, id_item)
-            
-            # Nom
-            self.clientsTable.setItem(row_idx, 1, QTableWidgetItem(client.get('nom', '')))
-            
-            # Prénom
-            self.clientsTable.setItem(row_idx, 2, QTableWidgetItem(client.get('prenom', '')))
-            
-            # Téléphone
-            self.clientsTable.setItem(row_idx, 3, QTableWidgetItem(client.get('telephone', '') or ''))
-            
-            # Email
-            self.clientsTable.setItem(row_idx, 4, QTableWidgetItem(client.get('email', '') or ''))
-            
-            # Ville
-            self.clientsTable.setItem(row_idx, 5, QTableWidgetItem(client.get('ville', '') or ''))
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout()
-            actions_layout.setSpacing(8)
-            
-            edit_btn = QPushButton("✏️ Modifier")
-            edit_btn.setProperty("variant", "tableAction")
-            edit_btn.setMinimumWidth(110)
-            edit_btn.clicked.connect(lambda checked, cid=client.get('id'): self.edit_client_by_id(cid))
-            
-            delete_btn = QPushButton("🗑️ Supprimer")
-            delete_btn.setProperty("variant", "tableAction")
-            delete_btn.setMinimumWidth(120)
-            delete_btn.clicked.connect(lambda checked, cid=client.get('id'): self.delete_client(cid))
-            
-            history_btn = QPushButton("📊 Historique")
-            history_btn.setProperty("variant", "tableAction")
-            history_btn.setMinimumWidth(120)
-            history_btn.clicked.connect(lambda checked, cid=client.get('id'): self.show_history(cid))
-            
-            actions_layout.addWidget(edit_btn)
-            actions_layout.addWidget(history_btn)
-            actions_layout.addWidget(delete_btn)
-            actions_layout.setContentsMargins(0, 0, 0, 0)
-            
-            actions_widget.setLayout(actions_layout)
-            self.clientsTable.setCellWidget(row_idx, 6, actions_widget)
-        
-        # Ajuster les largeurs
-        self.clientsTable.resizeColumnsToContents()
-        # NOTE: Qt may ignore cellWidget sizes during resizeColumnsToContents.
-        # Make sure the Actions column remains wide enough to show button text.
-        self.clientsTable.setColumnWidth(6, 390)
-        self.clientsTable.horizontalHeader().setStretchLastSection(True)
+        self.clients_model.set_rows(clients)
 
     def search_clients(self, search_term):
-        """Rechercher les clients"""
-        if search_term.strip():
-            results = ClientController.search_clients(search_term)
-            self.refresh_table(results)
-        else:
-            self.refresh_table(self.clients_data)
+        """Rechercher les clients (filtre local, en attendant la recherche MySQL)"""
+        self.clients_proxy.set_text(search_term)
+
+    def show_search_results(self, search_term, clients):
+        """Afficher le résultat de la recherche MySQL (par pertinence)"""
+        self.clients_proxy.set_text('')
+        self.clientsTable.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        self.refresh_table(clients)
+
+    def on_client_action(self, action, client):
+        """Clic sur un bouton de la colonne Actions"""
+        if action == 'edit':
+            self.edit_client_by_id(client['id'])
+        elif action == 'history':
+            self.show_history(client['id'])
+        elif action == 'delete':
+            self.delete_client(client['id'])
 
     def update_stats(self):
         """Mettre à jour les statistiques"""
@@ -122,13 +127,15 @@ class ClientsView(QWidget):
         """Ouvrir le dialogue pour ajouter un client"""
         dialog = ClientFormDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
+            ClientPicker.invalidate()
             self.load_clients()
 
     def edit_client(self, index):
         """Éditer un client (double-clic)"""
         if index.isValid():
-            client_id = int(self.clientsTable.item(index.row(), 0).text())
-            self.edit_client_by_id(client_id)
+            client = self.clients_proxy.row_at(index.row())
+            if client:
+                self.edit_client_by_id(client['id'])
 
     def edit_client_by_id(self, client_id):
         """Éditer un client par ID"""
@@ -136,6 +143,7 @@ class ClientsView(QWidget):
         if client:
             dialog = ClientFormDialog(self, client)
             if dialog.exec() == QDialog.DialogCode.Accepted:
+                ClientPicker.invalidate()
                 self.load_clients()
 
     def delete_client(self, client_id):
@@ -151,6 +159,7 @@ class ClientsView(QWidget):
             success, message = ClientController.delete_client(client_id)
             if success:
                 QMessageBox.information(self, "Succès", message)
+                ClientPicker.invalidate()
                 self.load_clients()
             else:
                 QMessageBox.warning(self, "Erreur", message)
@@ -166,20 +175,38 @@ class ClientsView(QWidget):
             dialog.exec()
 
     def export_excel(self):
-        """Exporter les clients en Excel"""
+        """Exporter les clients en Excel (lus au fil de l'eau depuis la base)"""
         filepath, _ = QFileDialog.getSaveFileName(
             self,
             "Exporter en Excel",
             f"clients_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
             "Excel Files (*.xlsx)"
         )
-        
-        if filepath:
-            success, message = ClientExporter.export_to_excel(self.clients_data, filepath)
-            if success:
-                QMessageBox.information(self, "Succès", message)
-            else:
-                QMessageBox.warning(self, "Erreur", message)
+        if not filepath:
+            return
+
+        progress = ExportProgress(self, "Export des clients")
+        self.export_loader.run(
+            'export', self.write_clients_export, filepath, progress,
+            on_done=lambda result: self.show_export_result(progress, result),
+            on_error=lambda message: self.show_export_result(progress, (False, message))
+        )
+
+    @staticmethod
+    def write_clients_export(filepath, progress):
+        """Écrire l'export (thread du worker)"""
+        from utils.excel_exporter import ClientExporter
+        return ClientExporter.export_to_excel(
+            ClientController.iter_clients(), filepath, ClientController.count_clients(), progress
+        )
+
+    def show_export_result(self, progress, result):
+        progress.finish()
+        success, message = result
+        if success:
+            QMessageBox.information(self, "Succès", message)
+        else:
+            QMessageBox.warning(self, "Erreur", message)
 
     def export_pdf(self):
         """Exporter les clients en PDF"""
@@ -191,6 +218,7 @@ class ClientsView(QWidget):
         )
         
         if filepath:
+            from utils.pdf_generator import ClientPDFGenerator
             success, message = ClientPDFGenerator.export_clients_list(self.clients_data, filepath)
             if success:
                 QMessageBox.information(self, "Succès", message)
@@ -199,11 +227,9 @@ class ClientsView(QWidget):
 
     def show_context_menu(self, position):
         """Afficher un menu contextuel"""
-        item = self.clientsTable.itemAt(position)
-        if item:
-            row = item.row()
-            client_id = int(self.clientsTable.item(row, 0).text())
-            
+        index = self.clientsTable.indexAt(position)
+        client = self.clients_proxy.row_at(index.row()) if index.isValid() else None
+        if client:
             menu = QMessageBox()
             menu.setWindowTitle("Options")
             menu.setText("Que voulez-vous faire ?")
@@ -215,6 +241,11 @@ class ClientsView(QWidget):
             
             menu.exec()
 
+            actions = {edit_btn: 'edit', delete_btn: 'delete', history_btn: 'history'}
+            action = actions.get(menu.clickedButton())
+            if action:
+                self.on_client_action(action, client)
+
 
 class ClientFormDialog(QDialog):
     """Dialogue pour ajouter/modifier un client"""
@@ -413,6 +444,7 @@ class HistoryDialog(QDialog):
         
         if filepath:
             client_name = f"{self.client['nom']} {self.client['prenom']}"
+            from utils.excel_exporter import ClientExporter
             success, message = ClientExporter.export_client_history(client_name, self.history, filepath)
             if success:
                 QMessageBox.information(self, "Succès", message)
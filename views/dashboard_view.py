@@ -2,19 +2,43 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, QFrame, QTableWidget, 
     QTableWidgetItem, QGroupBox, QGridLayout, QPushButton
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor, QFont, QIcon
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor, QFont, QIcon, QPixmap
 from controllers.statistics_controller import StatisticsController
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+from views.workers import AsyncLoader, LoadingOverlay
+from utils.charts import ChartRenderer
+from config import DASHBOARD_REFRESH_INTERVAL
+import time
 
 
 class DashboardView(QWidget):
-    """Vue du tableau de bord avec statistiques et rapports"""
+    """Vue du tableau de bord avec statistiques et rapports
+
+    Rafraîchie toutes les DASHBOARD_REFRESH_INTERVAL secondes tant qu'elle
+    est visible : le worker relit un repère de fraîcheur et ne recalcule
+    le résumé que s'il a bougé ; les tableaux et graphiques sont alors mis
+    à jour sur place.
+    """
     
+    # Graphiques affichés : (nom dans le résumé et ChartRenderer, période)
+    CHARTS = [('ca_evolution', '30j'), ('ca_by_category', 'month')]
+
     def __init__(self):
         super().__init__()
+        self.summary = None
+        self.charts = {}
+        self.chart_labels = {}
+        self.sections = []
+        self.watermark = None
+        self.refreshed_at = 0.0
+        self.loader = AsyncLoader(self)
+        # Rafraîchissements périodiques : sans voile de chargement
+        self.refresh_loader = AsyncLoader(self)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(int(DASHBOARD_REFRESH_INTERVAL * 1000))
+        self.refresh_timer.timeout.connect(self.refresh)
+
         self.init_ui()
 
     def init_ui(self):
@@ -38,35 +62,41 @@ class DashboardView(QWidget):
         scroll.setStyleSheet("QScrollArea { border: none; }")
         
         scroll_content = QWidget()
-        scroll_layout = QVBoxLayout(scroll_content)
-        scroll_layout.setContentsMargins(0, 0, 0, 0)
-        scroll_layout.setSpacing(12)
-        
-        # Section Top Products & Clients
-        scroll_layout.addWidget(self.create_top_section())
-        
-        # Section Charts
-        scroll_layout.addWidget(self.create_charts_section())
-        
-        # Section Low Stock
-        # scroll_layout.addWidget(self.create_low_stock_section())
-        
-        scroll_layout.addStretch()
+        self.scroll_layout = QVBoxLayout(scroll_content)
+        self.scroll_layout.setContentsMargins(0, 0, 0, 0)
+        self.scroll_layout.setSpacing(12)
+        self.scroll_layout.addStretch()
         scroll.setWidget(scroll_content)
         
         main_layout.addWidget(scroll)
         self.setLayout(main_layout)
+
+        # Les sections sont construites à l'arrivée des données
+        self.loading_overlay = LoadingOverlay(scroll)
+        self.loader.busyChanged.connect(self.loading_overlay.set_busy)
         
         # Charger les données
         self.load_data()
 
+    def build_sections(self):
+        """Construire les sections (première réception des données)"""
+        self.sections = [
+            # Section Top Products & Clients
+            self.create_top_section(),
+            # Section Charts
+            self.create_charts_section(),
+            # Section Low Stock
+            # self.create_low_stock_section(),
+        ]
+        for position, section in enumerate(self.sections):
+            self.scroll_layout.insertWidget(position, section)
+
     def create_kpi_section(self):
         """Créer la section des KPIs (Key Performance Indicators)"""
         group = QGroupBox("📈 Performances")
         layout = QGridLayout()
         
-        # Récupérer les données
-        summary = StatisticsController.get_dashboard_summary()
+        summary = self.summary
         
         # Cards de KPIs
         kpis = [
@@ -125,8 +155,7 @@ class DashboardView(QWidget):
         group = QGroupBox("🏆 Top Ventes")
         layout = QHBoxLayout()
         
-        # Récupérer les données
-        summary = StatisticsController.get_dashboard_summary()
+        summary = self.summary
         
         # Top Produits
         top_products_group = QGroupBox("🔥 Top 5 Produits")
@@ -137,16 +166,7 @@ class DashboardView(QWidget):
         products_table.setHorizontalHeaderLabels(["Produit", "Quantité", "CA"])
         products_table.setMaximumHeight(200)
         
-        products = summary.get('top_products', [])
-        products_table.setRowCount(len(products))
-        
-        for row, product in enumerate(products):
-            products_table.setItem(row, 0, QTableWidgetItem(product.get('nom', '')))
-            products_table.setItem(row, 1, QTableWidgetItem(str(product.get('quantite_vendue', ''))))
-            ca = float(product.get('ca', 0))
-            products_table.setItem(row, 2, QTableWidgetItem(f"{ca:.2f} XOF"))
-        
-        products_table.resizeColumnsToContents()
+        self.products_table = products_table
         top_products_layout.addWidget(products_table)
         top_products_group.setLayout(top_products_layout)
         
@@ -159,16 +179,8 @@ class DashboardView(QWidget):
         clients_table.setHorizontalHeaderLabels(["Client", "Achats", "CA"])
         clients_table.setMaximumHeight(200)
         
-        clients = summary.get('top_clients', [])
-        clients_table.setRowCount(len(clients))
-        
-        for row, client in enumerate(clients):
-            clients_table.setItem(row, 0, QTableWidgetItem(client.get('client_nom', '')))
-            clients_table.setItem(row, 1, QTableWidgetItem(str(client.get('nombre_achats', ''))))
-            ca = float(client.get('ca_total', 0))
-            clients_table.setItem(row, 2, QTableWidgetItem(f"{ca:.2f} XOF"))
-        
-        clients_table.resizeColumnsToContents()
+        self.clients_table = clients_table
+        self.fill_top_tables(summary)
         top_clients_layout.addWidget(clients_table)
         top_clients_group.setLayout(top_clients_layout)
         
@@ -178,51 +190,61 @@ class DashboardView(QWidget):
         group.setLayout(layout)
         return group
 
+    def fill_top_tables(self, summary):
+        """(Re)remplir les tops produits et clients"""
+        products = summary.get('top_products', [])
+        self.products_table.setRowCount(len(products))
+        
+        for row, product in enumerate(products):
+            self.products_table.setItem(row, 0, QTableWidgetItem(product.get('nom', '')))
+            self.products_table.setItem(row, 1, QTableWidgetItem(str(product.get('quantite_vendue', ''))))
+            ca = float(product.get('ca', 0))
+            self.products_table.setItem(row, 2, QTableWidgetItem(f"{ca:.2f} XOF"))
+        
+        self.products_table.resizeColumnsToContents()
+
+        clients = summary.get('top_clients', [])
+        self.clients_table.setRowCount(len(clients))
+        
+        for row, client in enumerate(clients):
+            self.clients_table.setItem(row, 0, QTableWidgetItem(client.get('client_nom', '')))
+            self.clients_table.setItem(row, 1, QTableWidgetItem(str(client.get('nombre_achats', ''))))
+            ca = float(client.get('ca_total', 0))
+            self.clients_table.setItem(row, 2, QTableWidgetItem(f"{ca:.2f} XOF"))
+        
+        self.clients_table.resizeColumnsToContents()
+
     def create_charts_section(self):
-        """Créer la section des graphiques"""
+        """Créer la section des graphiques (images rendues par le worker)"""
         group = QGroupBox("📈 Graphiques")
         layout = QHBoxLayout()
         
-        # Récupérer les données
-        summary = StatisticsController.get_dashboard_summary()
-        
-        # Graphique 1 : Évolution CA
-        ca_evolution = summary.get('ca_evolution', [])
-        if ca_evolution:
-            dates = [str(item['date']) for item in ca_evolution]
-            values = [float(item['ca']) for item in ca_evolution]
-            
-            fig1 = Figure(figsize=(5, 3), dpi=100)
-            ax1 = fig1.add_subplot(111)
-            ax1.plot(dates, values, marker='o', linestyle='-', color='#2196F3', linewidth=2)
-            ax1.set_title('Évolution du CA (30 derniers jours)', fontweight='bold')
-            ax1.set_xlabel('Date')
-            ax1.set_ylabel('CA (XOF)')
-            ax1.grid(True, alpha=0.3)
-            fig1.tight_layout()
-            
-            canvas1 = FigureCanvas(fig1)
-            layout.addWidget(canvas1)
-        
-        # Graphique 2 : Répartition par catégorie
-        ca_by_cat = summary.get('ca_by_category', [])
-        if ca_by_cat:
-            categories = [item['categorie'] or 'Non classé' for item in ca_by_cat]
-            values = [float(item['ca']) for item in ca_by_cat]
-            colors = ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF', '#FF9F40']
-            
-            fig2 = Figure(figsize=(5, 3), dpi=100)
-            ax2 = fig2.add_subplot(111)
-            ax2.pie(values, labels=categories, autopct='%1.1f%%', colors=colors[:len(categories)])
-            ax2.set_title('Répartition par Catégorie', fontweight='bold')
-            fig2.tight_layout()
-            
-            canvas2 = FigureCanvas(fig2)
-            layout.addWidget(canvas2)
+        self.chart_labels = {}
+        for name, _ in self.CHARTS:
+            label = QLabel()
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.chart_labels[name] = label
+            layout.addWidget(label)
+        self.show_charts(self.charts)
         
         group.setLayout(layout)
         return group
 
+    def show_charts(self, charts, previous=None):
+        """Afficher les PNG reçus ; graphique masqué sans données
+
+        previous : graphiques déjà affichés, non redécodés s'ils sont identiques
+        """
+        for name, label in self.chart_labels.items():
+            png = charts.get(name)
+            if previous is not None and png == previous.get(name):
+                continue
+            pixmap = QPixmap()
+            if png:
+                pixmap.loadFromData(png, 'PNG')
+            label.setPixmap(pixmap)
+            label.setVisible(not pixmap.isNull())
+
     # def create_low_stock_section(self):
     #     """Créer la section des stocks critiques"""
     #     group = QGroupBox("⚠️ Stocks Critiques")
@@ -268,6 +290,67 @@ class DashboardView(QWidget):
     #     return group
 
     def load_data(self):
-        """Charger les données du dashboard"""
-        # Les données sont chargées automatiquement lors de la création des widgets
-        pass
+        """Charger les données du dashboard (en arrière-plan)"""
+        self.refresh_loader.cancel()
+        self.loader.run('summary', DashboardView.fetch_dashboard, None, on_done=self.show_summary)
+
+    def refresh(self):
+        """Rafraîchissement périodique : seulement si les données ont changé"""
+        if self.summary is None or self.loader.is_busy() or self.refresh_loader.is_busy():
+            return
+        self.refresh_loader.run('refresh', DashboardView.fetch_dashboard, self.watermark,
+                                on_done=self.show_summary)
+
+    @staticmethod
+    def fetch_dashboard(since):
+        """Worker : résumé si le repère a bougé depuis `since`, puis graphiques
+
+        Retourne (repère, résumé, graphiques) ; résumé None si rien n'a
+        changé. Les graphiques dont les données n'ont pas changé sortent du
+        cache de ChartRenderer sans nouveau rendu.
+        """
+        watermark, summary = StatisticsController.get_dashboard_changes(since)
+        if summary is None:
+            if since is None:
+                # Base indisponible au premier chargement : sections vides
+                summary = StatisticsController.get_dashboard_summary()
+            else:
+                return watermark, None, None
+
+        charts = {}
+        for name, period in DashboardView.CHARTS:
+            try:
+                charts[name] = ChartRenderer.render(name, period, summary.get(name))
+            except Exception as e:
+                print(f"Erreur rendu graphique {name} : {e}")
+        return watermark, summary, charts
+
+    def show_summary(self, result):
+        """Afficher les données reçues : construction, puis mise à jour sur place"""
+        watermark, summary, charts = result
+        self.watermark = watermark
+        self.refreshed_at = time.monotonic()
+        if summary is None:
+            return
+
+        previous = self.charts
+        self.summary, self.charts = summary, charts
+        if not self.sections:
+            self.build_sections()
+        else:
+            self.fill_top_tables(summary)
+            self.show_charts(charts, previous)
+
+    # ==================== Rafraîchissement automatique ====================
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if DASHBOARD_REFRESH_INTERVAL > 0:
+            self.refresh_timer.start()
+            # Revenue à l'écran après une pause plus longue que l'intervalle
+            if time.monotonic() - self.refreshed_at > DASHBOARD_REFRESH_INTERVAL:
+                self.refresh()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
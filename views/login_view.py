@@ -1,8 +1,8 @@
 from PyQt6 import uic
-from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout
+from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout
 from PyQt6.QtCore import Qt
 from controllers.user_controller import UserController
-from views.main_window import MainWindow
+from views.workers import AsyncLoader
 from utils.session import Session
 from utils.path import resource_path
 
@@ -20,6 +20,10 @@ class LoginView(QMainWindow):
         
         # Get references to UI elements
         self.btn_login.clicked.connect(self.handle_login)
+
+        self.login_text = self.btn_login.text()
+        self.loader = AsyncLoader(self)
+        self.loader.busyChanged.connect(self.set_busy)
         
     #     # Center the window on screen
     #     self._center_window()
@@ -33,13 +37,37 @@ class LoginView(QMainWindow):
     #     self.move(x, y)
 
     def handle_login(self):
+        if self.loader.is_busy('login'):
+            return
+
         username = self.input_username.text().strip()
         password = self.input_password.text().strip()
 
-        user, error = UserController.login(username, password)
+        # Vérification bcrypt (coûteuse à dessein) hors du thread de l'interface
+        self.label_error.setText("")
+        self.loader.run('login', UserController.login, username, password,
+                        on_done=self.show_login_result, on_error=self.show_login_error)
+
+    def set_busy(self, busy):
+        """État « connexion en cours » : champs et bouton désactivés"""
+        self.btn_login.setEnabled(not busy)
+        self.input_username.setEnabled(not busy)
+        self.input_password.setEnabled(not busy)
+        self.btn_login.setText("Connexion..." if busy else self.login_text)
+        if busy:
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        else:
+            QApplication.restoreOverrideCursor()
+
+    def show_login_error(self, message):
+        self.label_error.setText(f"Erreur de connexion : {message}")
+
+    def show_login_result(self, result):
+        user, error = result
 
         if error:
             self.label_error.setText(error)
+            self.input_password.setFocus()
             return
             
         # Sauvegarde session
@@ -49,6 +77,8 @@ class LoginView(QMainWindow):
         self.open_main_window(user)
 
     def open_main_window(self, user):
+        # Importée après la connexion : rien des vues métier au démarrage
+        from views.main_window import MainWindow
         self.main_window = MainWindow(user)
         self.main_window.showMaximized()
         self.close()
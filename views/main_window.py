@@ -1,15 +1,36 @@
+import importlib
+
 from PyQt6.QtWidgets import QMainWindow, QLabel, QPushButton, QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
+from config import PREFETCH_VIEWS
+from utils import startup
 from utils.session import Session
 from utils.permissions import check_permission, check_role, Permission
-from views.clients_view import ClientsView
-from views.products_view import ProductsView
-from views.sales_view import SalesView
-from views.dashboard_view import DashboardView
-from views.settings_view import SettingsView
+from views.workers import AsyncLoader
 
 
 class MainWindow(QMainWindow):
+    """Fenêtre principale
+
+    Les vues sont créées à la première navigation (registre VIEWS) : seule
+    la vue d'accueil est construite avant l'affichage, et le module d'une
+    vue n'est importé qu'à sa construction. Les autres peuvent être
+    préchargées une à une après le premier affichage (PREFETCH_VIEWS) :
+    le module est importé en arrière-plan, seule la construction du
+    widget a lieu dans le thread de l'interface.
+    """
+
+    # nom -> ("module.Classe", permission, méthode de rechargement aux affichages suivants)
+    VIEWS = {
+        'dashboard': ('views.dashboard_view.DashboardView', Permission.VIEW_DASHBOARD, None),
+        'clients': ('views.clients_view.ClientsView', Permission.VIEW_CLIENTS, 'load_clients'),
+        'products': ('views.products_view.ProductsView', Permission.VIEW_PRODUCTS, 'load_products'),
+        'sales': ('views.sales_view.SalesView', Permission.VIEW_SALES, 'load_sales'),
+        'settings': ('views.settings_view.SettingsView', Permission.VIEW_SETTINGS, None),
+    }
+    # Délai après le premier affichage avant le préchargement (ms)
+    PREFETCH_DELAY = 1500
+
     def __init__(self, user):
         super().__init__()
 
@@ -17,10 +38,22 @@ class MainWindow(QMainWindow):
             raise Exception("Accès refusé : utilisateur non authentifié")
 
         self.user = user
+        self.views = {}
+        self._prefetch_queue = []
+        self._prefetch_scheduled = False
+        self.prefetch_loader = AsyncLoader(self)
         self.setWindowTitle("Gestion Commerciale")
         self.setMinimumSize(1000, 700)
 
         self.build_ui()
+        self.stacked_widget.setCurrentWidget(self.view(self.home_view_name()))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Préchargement compté à partir du premier affichage, pas de la construction
+        if PREFETCH_VIEWS and not self._prefetch_scheduled:
+            self._prefetch_scheduled = True
+            QTimer.singleShot(self.PREFETCH_DELAY, self.start_prefetch)
 
     def build_ui(self):
         central = QWidget()
@@ -104,29 +137,9 @@ class MainWindow(QMainWindow):
         
         sidebar.addStretch()
         
-        # Stack Widget pour les différentes vues
+        # Stack Widget pour les différentes vues (créées à la demande)
         self.stacked_widget = QStackedWidget()
         
-        # Vue d'accueil - Dashboard
-        self.home_view = DashboardView()
-        self.stacked_widget.addWidget(self.home_view)
-        
-        # Vue Clients
-        self.clients_view = ClientsView()
-        self.stacked_widget.addWidget(self.clients_view)
-        
-        # Vue Produits
-        self.products_view = ProductsView()
-        self.stacked_widget.addWidget(self.products_view)
-        
-        # Vue Ventes
-        self.sales_view = SalesView()
-        self.stacked_widget.addWidget(self.sales_view)
-        
-        # Vue Paramètres
-        self.settings_view = SettingsView()
-        self.stacked_widget.addWidget(self.settings_view)
-        
         # Ajouter au layout
         sidebar_widget.setMinimumWidth(220)
         content_layout.addWidget(sidebar_widget)
@@ -146,33 +159,95 @@ class MainWindow(QMainWindow):
         }
         return role_names.get(role, role)
 
+    # ==================== Registre des vues ====================
+
+    def home_view_name(self):
+        """Vue d'accueil : le dashboard, sinon la première vue autorisée"""
+        for name, (_, permission, _) in self.VIEWS.items():
+            if check_permission(permission):
+                return name
+        return 'dashboard'
+
+    def view(self, name):
+        """Vue `name`, construite et ajoutée au stack à la première demande"""
+        widget = self.views.get(name)
+        if widget is None:
+            module_name, _, class_name = self.VIEWS[name][0].rpartition('.')
+            view_class = getattr(importlib.import_module(module_name), class_name)
+            widget = view_class()
+            startup.mark(f"vue {name}")
+            self.views[name] = widget
+            self.stacked_widget.addWidget(widget)
+        return widget
+
+    def show_view(self, name):
+        """Afficher une vue ; rechargée si elle existait déjà"""
+        _, permission, reload = self.VIEWS[name]
+        if not check_permission(permission):
+            return
+
+        if name in self._prefetch_queue:
+            self._prefetch_queue.remove(name)
+
+        created = name not in self.views
+        widget = self.view(name)
+        self.stacked_widget.setCurrentWidget(widget)
+        if reload and not created:
+            getattr(widget, reload)()
+
+    def start_prefetch(self):
+        """Précharger les vues autorisées restantes, une à la fois"""
+        self._prefetch_queue = [
+            name for name, (_, permission, _) in self.VIEWS.items()
+            if name not in self.views and check_permission(permission)
+        ]
+        self.prefetch_next()
+
+    def prefetch_next(self):
+        """Importer le module de la vue suivante en arrière-plan, puis la construire"""
+        if not self._prefetch_queue:
+            return
+        name = self._prefetch_queue[0]
+        module_name = self.VIEWS[name][0].rpartition('.')[0]
+        self.prefetch_loader.run(
+            'prefetch', importlib.import_module, module_name,
+            on_done=lambda _: self.prefetch_view(name),
+            on_error=lambda message: self.prefetch_failed(name, message)
+        )
+
+    def prefetch_view(self, name):
+        # Vue déjà ouverte entre-temps : show_view l'a retirée de la file
+        if name in self._prefetch_queue:
+            self._prefetch_queue.remove(name)
+            self.view(name)
+        # Rendre la main à l'interface entre deux constructions
+        QTimer.singleShot(0, self.prefetch_next)
+
+    def prefetch_failed(self, name, message):
+        print(f"Préchargement de la vue {name} impossible : {message}")
+        if name in self._prefetch_queue:
+            self._prefetch_queue.remove(name)
+        QTimer.singleShot(0, self.prefetch_next)
+
     def show_dashboard(self):
         """Afficher le dashboard"""
-        if check_permission(Permission.VIEW_DASHBOARD):
-            self.stacked_widget.setCurrentWidget(self.home_view)
+        self.show_view('dashboard')
 
     def show_clients(self):
         """Afficher la vue clients"""
-        if check_permission(Permission.VIEW_CLIENTS):
-            self.stacked_widget.setCurrentWidget(self.clients_view)
-            self.clients_view.load_clients()
+        self.show_view('clients')
 
     def show_products(self):
         """Afficher la vue produits"""
-        if check_permission(Permission.VIEW_PRODUCTS):
-            self.stacked_widget.setCurrentWidget(self.products_view)
-            self.products_view.load_products()
+        self.show_view('products')
 
     def show_sales(self):
         """Afficher la vue ventes"""
-        if check_permission(Permission.VIEW_SALES):
-            self.stacked_widget.setCurrentWidget(self.sales_view)
-            self.sales_view.load_sales()
+        self.show_view('sales')
 
     def show_settings(self):
         """Afficher la vue paramètres"""
-        if check_permission(Permission.VIEW_SETTINGS):
-            self.stacked_widget.setCurrentWidget(self.settings_view)
+        self.show_view('settings')
 
     def logout(self):
         Session.logout()
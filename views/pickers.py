@@ -0,0 +1,269 @@
+import threading
+import time
+
+from PyQt6.QtCore import Qt, QModelIndex, QTimer, pyqtSignal
+from PyQt6.QtGui import QStandardItem, QStandardItemModel
+from PyQt6.QtWidgets import QCompleter, QLineEdit
+
+from controllers.client_controller import ClientController
+from controllers.product_controller import ProductController
+from utils.prefix_index import PrefixIndex
+from views.workers import AsyncLoader
+
+
+class TypeAheadPicker(QLineEdit):
+    """Champ de sélection à la frappe (QCompleter sur un PrefixIndex)
+
+    L'index (utils.prefix_index) et les libellés affichés sont chargés une
+    fois par le loader, hors du thread de l'interface ; chaque frappe
+    n'interroge ensuite que l'index en mémoire et n'affiche que les `limit`
+    meilleurs résultats. La ligne complète n'est lue qu'au choix d'un
+    résultat, puis émise par `chosen`.
+
+    Sous-classes : fetch_index() -> (PrefixIndex, {id: libellé}) et
+    fetch_row(id) -> ligne complète, tous deux exécutés dans un worker.
+    Optionnel :
+    - fetch_remote(texte) -> lignes : recherche côté serveur, lancée (après
+      REMOTE_DELAY ms sans frappe) tant que l'index n'est pas chargé ou
+      quand il ne trouve rien
+    - fetch_recent() -> lignes : proposées champ vide, et placées en tête
+      des résultats qui les contiennent
+    """
+
+    chosen = pyqtSignal(object)
+
+    LOADING_TEXT = "Chargement..."
+    PLACEHOLDER = "Rechercher..."
+    REMOTE_DELAY = 300
+    REMOTE_MIN_LENGTH = 2
+
+    def __init__(self, loader=None, limit=20, parent=None):
+        super().__init__(parent)
+        self.loader = loader or AsyncLoader(self)
+        self.limit = limit
+        self.index = None
+        self.labels = {}
+        self.rows = {}      # lignes complètes déjà lues (récents, recherche serveur)
+        self.recent = []
+        self.current = None
+
+        self.results = QStandardItemModel(self)
+        self.completer = QCompleter(self.results, self)
+        # Résultats déjà filtrés et classés par l'index : affichés tels quels
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.setWidget(self)
+        self.completer.activated[QModelIndex].connect(self.on_activated)
+
+        self._remote_timer = QTimer(self)
+        self._remote_timer.setSingleShot(True)
+        self._remote_timer.setInterval(self.REMOTE_DELAY)
+        self._remote_timer.timeout.connect(self.run_remote)
+
+        self.textEdited.connect(self.update_results)
+        self.returnPressed.connect(self.choose_first)
+        self.setPlaceholderText(self.LOADING_TEXT)
+
+    def fetch_index(self):
+        raise NotImplementedError
+
+    def fetch_row(self, item_id):
+        raise NotImplementedError
+
+    def describe(self, row):
+        """Libellé affiché pour une ligne"""
+        return str(row.get('id'))
+
+    fetch_remote = None
+    fetch_recent = None
+
+    # ==================== Chargement ====================
+
+    def load(self):
+        """(Re)charger l'index (et les récents) en arrière-plan"""
+        self.loader.run('index', self.fetch_index, on_done=self.set_index, on_error=self.on_load_error)
+        if self.fetch_recent:
+            self.loader.run('recent', self.fetch_recent, on_done=self.set_recent)
+
+    def on_load_error(self, message):
+        print(f"Erreur lors du chargement de l'index de recherche : {message}")
+        self.setPlaceholderText("⚠️ Erreur de connexion")
+
+    def set_index(self, result):
+        self.index, labels = result
+        self.labels.update(labels)
+        self.setPlaceholderText(self.PLACEHOLDER)
+        if self.text() and self.current is None:
+            self.update_results(self.text())
+
+    def set_recent(self, rows):
+        self.remember(rows)
+        self.recent = [row['id'] for row in rows]
+
+    def remember(self, rows):
+        for row in rows:
+            self.rows[row['id']] = row
+            self.labels[row['id']] = self.describe(row)
+
+    # ==================== Recherche ====================
+
+    def search(self, text):
+        """Identifiants des meilleurs résultats pour `text` (récents d'abord)"""
+        if self.index is None:
+            return []
+        ids = self.index.search(text, self.limit * 2 if self.recent else self.limit)
+        if self.recent:
+            rank = {item_id: position for position, item_id in enumerate(self.recent)}
+            ids.sort(key=lambda item_id: rank.get(item_id, len(rank)))
+        return ids[:self.limit]
+
+    def update_results(self, text):
+        self.current = None
+        self._remote_timer.stop()
+        self.loader.cancel('row')
+        self.loader.cancel('remote')
+
+        text = text.strip()
+        ids = self.search(text) if text else self.recent[:self.limit]
+        self.show_results(ids)
+
+        if (self.fetch_remote and not ids and len(text) >= self.REMOTE_MIN_LENGTH):
+            self._remote_timer.start()
+
+    def run_remote(self):
+        text = self.text().strip()
+        self.loader.run('remote', self.fetch_remote, text,
+                        on_done=lambda rows: self.show_remote(text, rows))
+
+    def show_remote(self, text, rows):
+        if text != self.text().strip() or self.current is not None:
+            return
+        self.remember(rows)
+        self.show_results([row['id'] for row in rows[:self.limit]])
+
+    def show_results(self, ids):
+        self.results.clear()
+        for item_id in ids:
+            item = QStandardItem(self.labels.get(item_id, str(item_id)))
+            item.setData(item_id, Qt.ItemDataRole.UserRole)
+            self.results.appendRow(item)
+
+        if ids and self.hasFocus():
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+
+    def focusInEvent(self, event):
+        super().focusInEvent(event)
+        if not self.text() and self.recent:
+            self.show_results(self.recent[:self.limit])
+
+    # ==================== Sélection ====================
+
+    def on_activated(self, index):
+        self.choose(index.data(Qt.ItemDataRole.UserRole))
+
+    def choose_first(self):
+        if self.current is None and self.results.rowCount():
+            self.choose(self.results.item(0).data(Qt.ItemDataRole.UserRole))
+
+    def choose(self, item_id):
+        """Sélectionner un résultat : affiche son libellé et lit sa ligne"""
+        self.completer.popup().hide()
+        self._remote_timer.stop()
+        self.setText(self.labels.get(item_id, str(item_id)))
+        if item_id in self.rows:
+            self.set_current(self.rows[item_id])
+        else:
+            self.loader.run('row', self.fetch_row, item_id, on_done=self.set_current)
+
+    def set_current(self, row):
+        self.current = row
+        if row:
+            self.chosen.emit(row)
+
+    def clear_selection(self):
+        self.loader.cancel('row')
+        self.current = None
+        self.results.clear()
+        self.clear()
+
+
+class ProductPicker(TypeAheadPicker):
+    """Sélection d'un produit par nom (ou ID exact)"""
+
+    LOADING_TEXT = "Chargement des produits..."
+    PLACEHOLDER = "Rechercher un produit (nom ou code)"
+
+    def describe(self, product):
+        try:
+            prix = float(product.get('prix_vente') or 0)
+        except (ValueError, TypeError):
+            prix = 0.0
+        return f"{product.get('nom', 'Produit sans nom')} ({product.get('categorie') or 'N/A'}) - {prix:.2f} XOF"
+
+    def fetch_index(self):
+        labels = {p['id']: self.describe(p) for p in ProductController.get_all_products()}
+        return ProductController.get_product_index(), labels
+
+    def fetch_row(self, product_id):
+        return ProductController.get_product(product_id)
+
+
+class ClientPicker(TypeAheadPicker):
+    """Sélection d'un client par nom, prénom ou téléphone
+
+    Index partagé entre les dialogues, relu après INDEX_MAX_AGE secondes
+    ou invalidate() ; un client créé entre-temps ailleurs est trouvé par
+    la recherche serveur. Les clients des dernières ventes passent en tête.
+    """
+
+    LOADING_TEXT = "Chargement des clients..."
+    PLACEHOLDER = "Rechercher un client (nom, prénom ou téléphone)"
+    INDEX_MAX_AGE = 300
+
+    _cache_lock = threading.Lock()
+    _cache = None           # (index, libellés, monotonic du chargement)
+
+    @classmethod
+    def invalidate(cls):
+        with cls._cache_lock:
+            cls._cache = None
+
+    def describe(self, client):
+        text = f"{client.get('nom') or ''} {client.get('prenom') or ''}".strip()
+        if client.get('telephone'):
+            text += f" — {client['telephone']}"
+        return text
+
+    def fetch_index(self):
+        with ClientPicker._cache_lock:
+            cache = ClientPicker._cache
+            if cache and time.monotonic() - cache[2] < self.INDEX_MAX_AGE:
+                return cache[0], cache[1]
+
+            entries, labels = [], {}
+            for client in ClientController.get_client_search_entries():
+                # Numéro normalisé indexé comme un mot : préfixe de chiffres
+                entries.append((
+                    client['id'],
+                    f"{client.get('nom') or ''} {client.get('prenom') or ''} {client.get('telephone_normalise') or ''}"
+                ))
+                labels[client['id']] = self.describe(client)
+            index = PrefixIndex(entries)
+            ClientPicker._cache = (index, labels, time.monotonic())
+            return index, labels
+
+    def search(self, text):
+        digits = ''.join(c for c in text if c.isdigit())
+        if digits and ClientController.is_phone_query(text):
+            text = digits
+        return super().search(text)
+
+    def fetch_row(self, client_id):
+        return ClientController.get_client(client_id)
+
+    def fetch_remote(self, text):
+        return ClientController.search_clients(text, self.limit)
+
+    def fetch_recent(self):
+        return ClientController.get_recent_clients(self.limit)
@@ -4,14 +4,46 @@ from PyQt6.QtWidgets import (
     QLabel, QLineEdit, QComboBox, QPushButton, QMessageBox, QFileDialog, QTextEdit
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor
 from controllers.product_controller import ProductController
 from utils.path import resource_path
+from views.workers import AsyncLoader, LoadingOverlay
+from views.search import DebouncedSearch
+from views.table_models import (
+    Column, DictTableModel, RowFilterProxyModel, ActionButtonDelegate,
+    ALIGN_RIGHT, LOW_STOCK_COLOR, money
+)
 from utils.validators import ProductValidator
 from utils.session import Session
 from datetime import datetime
 
 
+def _margin(product):
+    return ProductController.calculate_margin(
+        float(product.get('prix_achat') or 0),
+        float(product.get('prix_vente') or 0)
+    )
+
+
+def _low_stock(product):
+    return (product.get('stock_actuel') or 0) <= (product.get('stock_min') or 0)
+
+
+PRODUCT_COLUMNS = [
+    Column("ID", 'id', width=60),
+    Column("Catégorie", 'categorie', width=140),
+    Column("Produit", 'nom', width=220),
+    Column("P. Achat", 'prix_achat', text=money('prix_achat'), sort=lambda p: float(p.get('prix_achat') or 0),
+           align=ALIGN_RIGHT, width=120),
+    Column("P. Vente", 'prix_vente', text=money('prix_vente'), sort=lambda p: float(p.get('prix_vente') or 0),
+           align=ALIGN_RIGHT, width=120),
+    Column("Marge %", text=lambda p: f"{_margin(p):.1f}%", sort=_margin, align=ALIGN_RIGHT, width=90),
+    Column("Stock", 'stock_actuel', text=lambda p: f"{p.get('stock_actuel', 0)}/{p.get('stock_min', 0)}",
+           background=lambda p: LOW_STOCK_COLOR if _low_stock(p) else None, width=90),
+    Column("Actions", actions=[('edit', "✏️ Modifier"), ('stock', "📦 Stock"), ('delete', "🗑️ Supprimer")],
+           width=360),
+]
+
+
 class ProductsView(QWidget):
     def __init__(self):
         super().__init__()
@@ -20,11 +52,43 @@ class ProductsView(QWidget):
         
         self.products_data = []
         self.categories = []
+        self.search_category = None
+
+        # Lectures en arrière-plan : l'interface ne bloque pas sur MySQL
+        self.loader = AsyncLoader(self)
+
+        # Modèle + filtre local : la recherche et le filtre catégorie ne
+        # reconstruisent plus le tableau, ils masquent des lignes
+        self.products_model = DictTableModel(PRODUCT_COLUMNS, parent=self, loader=self.loader)
+        self.products_proxy = RowFilterProxyModel(('nom', 'categorie', 'description'), self)
+        self.products_proxy.setSourceModel(self.products_model)
+        self.productsTable.setModel(self.products_proxy)
+        self.productsTable.setSortingEnabled(True)
+        self.productsTable.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        self.productsTable.verticalHeader().setDefaultSectionSize(44)
+        self.productsTable.horizontalHeader().setStretchLastSection(True)
+        for index, column in enumerate(PRODUCT_COLUMNS):
+            if column.width:
+                self.productsTable.setColumnWidth(index, column.width)
+
+        self.actions_delegate = ActionButtonDelegate(PRODUCT_COLUMNS[-1].actions, self.productsTable)
+        self.actions_delegate.actionTriggered.connect(self.on_product_action)
+        self.productsTable.setItemDelegateForColumn(len(PRODUCT_COLUMNS) - 1, self.actions_delegate)
+
+        self.loading_overlay = LoadingOverlay(self.productsTable)
+        self.loader.busyChanged.connect(self.loading_overlay.set_busy)
         
         # Connexions
         self.btnAdd.clicked.connect(self.open_add_dialog)
         self.btnLowStock.clicked.connect(self.show_low_stock)
-        self.searchInput.textChanged.connect(self.search_products)
+        self.search = DebouncedSearch(
+            self.searchInput, self.loader,
+            search=self.search_products_remote,
+            on_results=self.show_search_results,
+            local_filter=self.search_products,
+            on_cleared=lambda: self.refresh_table(self.products_data),
+            parent=self
+        )
         self.categoryFilter.currentIndexChanged.connect(self.filter_by_category)
         self.productsTable.doubleClicked.connect(self.edit_product)
         
@@ -38,143 +102,81 @@ class ProductsView(QWidget):
 
     def load_categories(self):
         """Charger les catégories"""
-        self.categories = ProductController.get_all_categories()
+        self.loader.run('categories', ProductController.get_all_categories, on_done=self.show_categories)
+
+    def show_categories(self, categories):
+        """Remplir le filtre catégorie"""
+        self.categories = categories or []
+        current = self.categoryFilter.currentData()
+        self.categoryFilter.blockSignals(True)
         self.categoryFilter.clear()
         self.categoryFilter.addItem("Toutes les catégories", -1)
         for cat in self.categories:
             self.categoryFilter.addItem(cat.get('nom', ''), cat.get('id'))
+        self.categoryFilter.setCurrentIndex(max(0, self.categoryFilter.findData(current)))
+        self.categoryFilter.blockSignals(False)
+        self.filter_by_category()
 
     def load_products(self):
-        """Charger et afficher tous les produits"""
-        self.products_data = ProductController.get_all_products()
+        """Charger et afficher tous les produits (en arrière-plan)"""
+        self.loader.run('products', ProductController.get_all_products, on_done=self.show_products)
+
+    def show_products(self, products):
+        """Afficher les produits chargés"""
+        self.products_data = products or []
         self.refresh_table(self.products_data)
         self.update_stats()
+        if self.search.text():
+            self.products_proxy.set_text(self.search.text())
+            self.search.trigger()
 
     def refresh_table(self, products):
-        """Rafraîchir le tableau"""
-        self.productsTable.setRowCount(0)
-        self.productsTable.setColumnCount(8)
-        self.productsTable.setHorizontalHeaderLabels(
-            ["ID", "Catégorie", "Produit", "P. Achat", "P. Vente", "Marge %", "Stock", "Actions"]
-        )
-        self.productsTable.verticalHeader().setDefaultSectionSize(44)
-        
-        for row_idx, product in enumerate(products):
-            self.productsTable.insertRow(row_idx)
-            
-            # ID
-            id_item = QTableWidgetItem(str(product.get('id', '')))
-            id_item.setFlags(id_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.productsTable.setItem(row_idx, 0, id_item)
-            
-            # Catégorie
-            cat_item = QTableWidgetItem(product.get('categorie', ''))
-            cat_item.setFlags(cat_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.productsTable.setItem(row_idx, 1, cat_item)
-            
-            # Produit
-            prod_item = QTableWidgetItem(product.get('nom', ''))
-            prod_item.setFlags(prod_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.productsTable.setItem(row_idx, 2, prod_item)
-            
-            # Prix achat
-            pa_item = QTableWidgetItem(f"{product.get('prix_achat', 0):.2f} XOF")
-            pa_item.setFlags(pa_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.productsTable.setItem(row_idx, 3, pa_item)
-            
-            # Prix vente
-            pv_item = QTableWidgetItem(f"{product.get('prix_vente', 0):.2f} XOF")
-            pv_item.setFlags(pv_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.productsTable.setItem(row_idx, 4, pv_item)
-            
-            # Marge %
-            margin = ProductController.calculate_margin(
-                product.get('prix_achat', 0),
-                product.get('prix_vente', 0)
-            )
-            margin_item = QTableWidgetItem(f"{margin:.1f}%")
-            margin_item.setFlags(margin_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.productsTable.setItem(row_idx, 5, margin_item)
-            
-            # Stock
-            stock = product.get('stock_actuel', 0)
-            stock_min = product.get('stock_min', 0)
-            stock_item = QTableWidgetItem(f"{stock}/{stock_min}")
-            
-            # Colorer si stock bas
-            if stock <= stock_min:
-                stock_item.setBackground(QColor(255, 200, 200))
-            
-            stock_item.setFlags(stock_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.productsTable.setItem(row_idx, 6, stock_item)
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout()
-            actions_layout.setSpacing(8)
-            
-            edit_btn = QPushButton("✏️ Modifier")
-            edit_btn.setProperty("variant", "tableAction")
-            edit_btn.setMinimumWidth(110)
-            edit_btn.clicked.connect(lambda checked, pid=product.get('id'): self.edit_product_by_id(pid))
-            
-            stock_btn = QPushButton("📦 Stock")
-            stock_btn.setProperty("variant", "tableAction")
-            stock_btn.setMinimumWidth(90)
-            stock_btn.clicked.connect(lambda checked, pid=product.get('id'): self.manage_stock(pid))
-            
-            delete_btn = QPushButton("🗑️ Supprimer")
-            delete_btn.setProperty("variant", "tableAction")
-            delete_btn.setMinimumWidth(120)
-            delete_btn.clicked.connect(lambda checked, pid=product.get('id'): self.delete_product(pid))
-            
-            actions_layout.addWidget(edit_btn)
-            actions_layout.addWidget(stock_btn)
-            actions_layout.addWidget(delete_btn)
-            actions_layout.setContentsMargins(0, 0, 0, 0)
-            
-            actions_widget.setLayout(actions_layout)
-            self.productsTable.setCellWidget(row_idx, 7, actions_widget)
-        
-        self.productsTable.resizeColumnsToContents()
-        # Ensure actions column stays readable (cell widgets aren't always considered by autosize)
-        self.productsTable.setColumnWidth(7, 360)
-        self.productsTable.horizontalHeader().setStretchLastSection(True)
+        """Rafraîchir le tableau (recherche et filtre catégorie conservés)"""
+        self.products_model.set_rows(products)
 
     def search_products(self, search_term):
-        """Rechercher les produits"""
-        if search_term.strip():
-            results = ProductController.search_products(search_term)
-        else:
-            results = self.products_data
-        
-        # Appliquer aussi le filtre catégorie si nécessaire
-        if self.categoryFilter.currentData() != -1:
-            cat_id = self.categoryFilter.currentData()
-            results = [p for p in results if p.get('category_id') == cat_id]
-        
-        self.refresh_table(results)
+        """Rechercher les produits (filtre local, en attendant la recherche MySQL)"""
+        self.products_proxy.set_text(search_term)
+
+    def search_products_remote(self, search_term, offset=0, limit=None):
+        """Recherche MySQL dans la catégorie filtrée (thread du loader)
+
+        Ne lit pas les widgets : la catégorie est figée dans search_category.
+        """
+        return ProductController.search_products(
+            search_term, self.search_category, limit or self.products_model.page_size, offset
+        )
+
+    def show_search_results(self, search_term, products):
+        """Afficher la première page du résultat MySQL (par pertinence)"""
+        category_id = self.search_category
+        self.products_proxy.set_text('')
+        self.productsTable.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        self.products_model.set_rows(
+            products,
+            fetch_more=lambda offset, limit: ProductController.search_products(
+                search_term, category_id, limit, offset
+            )
+        )
 
     def filter_by_category(self):
         """Filtrer par catégorie"""
         cat_id = self.categoryFilter.currentData()
         
-        if cat_id == -1:
-            results = self.products_data
+        if cat_id is None or cat_id == -1:
+            self.search_category = None
+            self.products_proxy.set_predicate(None)
         else:
-            results = ProductController.get_products_by_category(cat_id)
-        
-        # Appliquer aussi la recherche si nécessaire
-        if self.searchInput.text().strip():
-            search = self.searchInput.text().strip()
-            results = [p for p in results if search.lower() in p.get('nom', '').lower()]
-        
-        self.refresh_table(results)
+            self.search_category = cat_id
+            self.products_proxy.set_predicate(lambda p: p.get('category_id') == cat_id)
+
+        # Recherche en cours : la catégorie est un critère de la requête
+        self.search.trigger()
 
     def update_stats(self):
         """Mettre à jour les statistiques"""
         total = len(self.products_data)
-        low_stock = len(ProductController.get_low_stock_products())
+        low_stock = sum(1 for p in self.products_data if _low_stock(p))
         self.statsLabel.setText(f"Total produits : {total} | Stocks bas : {low_stock}")
 
     def open_add_dialog(self):
@@ -183,11 +185,21 @@ class ProductsView(QWidget):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.load_products()
 
+    def on_product_action(self, action, product):
+        """Clic sur un bouton de la colonne Actions"""
+        if action == 'edit':
+            self.edit_product_by_id(product['id'])
+        elif action == 'stock':
+            self.manage_stock(product['id'])
+        elif action == 'delete':
+            self.delete_product(product['id'])
+
     def edit_product(self, index):
         """Éditer un produit (double-clic)"""
         if index.isValid():
-            product_id = int(self.productsTable.item(index.row(), 0).text())
-            self.edit_product_by_id(product_id)
+            product = self.products_proxy.row_at(index.row())
+            if product:
+                self.edit_product_by_id(product['id'])
 
     def edit_product_by_id(self, product_id):
         """Éditer un produit par ID"""
@@ -224,7 +236,10 @@ class ProductsView(QWidget):
 
     def show_low_stock(self):
         """Afficher les produits en rupture de stock"""
-        low_stock = ProductController.get_low_stock_products()
+        self.loader.run('products', ProductController.get_low_stock_products, on_done=self.show_low_stock_results)
+
+    def show_low_stock_results(self, low_stock):
+        low_stock = low_stock or []
         self.refresh_table(low_stock)
         QMessageBox.information(
             self,
@@ -234,11 +249,9 @@ class ProductsView(QWidget):
 
     def show_context_menu(self, position):
         """Menu contextuel"""
-        item = self.productsTable.itemAt(position)
-        if item:
-            row = item.row()
-            product_id = int(self.productsTable.item(row, 0).text())
-            
+        index = self.productsTable.indexAt(position)
+        product = self.products_proxy.row_at(index.row()) if index.isValid() else None
+        if product:
             menu = QMessageBox()
             menu.setWindowTitle("Options")
             menu.setText("Que voulez-vous faire ?")
@@ -250,6 +263,11 @@ class ProductsView(QWidget):
             
             menu.exec()
 
+            actions = {edit_btn: 'edit', stock_btn: 'stock', delete_btn: 'delete'}
+            action = actions.get(menu.clickedButton())
+            if action:
+                self.on_product_action(action, product)
+
 
 class ProductFormDialog(QDialog):
     """Dialogue pour ajouter/modifier un produit"""
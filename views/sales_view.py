@@ -2,17 +2,18 @@ from PyQt6 import uic
 from PyQt6.QtWidgets import (
     QWidget, QTableWidgetItem, QDialog, QVBoxLayout, QHBoxLayout, QSpinBox, QDoubleSpinBox,
     QLabel, QLineEdit, QComboBox, QPushButton, QMessageBox, QFileDialog, QTextEdit,
-    QTableWidget, QHeaderView
+    QTableWidget, QHeaderView, QAbstractItemView
 )
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QColor
 from controllers.sale_controller import SaleController
 from utils.path import resource_path
-from controllers.product_controller import ProductController
-from controllers.client_controller import ClientController
+from views.table_models import SalesTableModel, SALES_COLUMNS, ActionButtonDelegate, RowFilterProxyModel
+from views.search import DebouncedSearch
+from views.workers import AsyncLoader, ExportProgress, LoadingOverlay
+from views.pickers import ClientPicker, ProductPicker
+from controllers.settings_controller import SettingsController
 from utils.validators import SaleValidator
 from utils.session import Session
-from utils.excel_exporter import export_sales_to_excel
 from datetime import datetime
 
 
@@ -22,16 +23,44 @@ class SalesView(QWidget):
         
         uic.loadUi(resource_path("views/ui/sales.ui"), self)
 
-        # Make sure row height is enough for embedded action widgets
         self.salesTable.verticalHeader().setDefaultSectionSize(44)
-        
-        self.sales_data = []
+
+        # Lectures en arrière-plan : l'interface ne bloque pas sur MySQL
+        self.loader = AsyncLoader(self)
+        self.loading_overlay = LoadingOverlay(self.salesTable)
+        self.loader.busyChanged.connect(self.loading_overlay.set_busy)
+        # Exports : sans voile, la progression a sa propre fenêtre
+        self.export_loader = AsyncLoader(self)
+        self.page_status = None
+
+        # Tableau virtuel : les ventes sont chargées par pages au défilement
+        self.sales_model = SalesTableModel(self.fetch_sales_page, parent=self, loader=self.loader)
+        # Filtre local : la recherche masque d'abord les ventes déjà chargées
+        self.sales_proxy = RowFilterProxyModel(('numero_facture', 'client_nom'), self)
+        self.sales_proxy.setSourceModel(self.sales_model)
+        self.salesTable.setModel(self.sales_proxy)
+        self.salesTable.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.salesTable.horizontalHeader().setStretchLastSection(True)
+        for index, column in enumerate(SALES_COLUMNS):
+            if column.width:
+                self.salesTable.setColumnWidth(index, column.width)
+
+        self.actions_delegate = ActionButtonDelegate(SALES_COLUMNS[-1].actions, self.salesTable)
+        self.actions_delegate.actionTriggered.connect(lambda action, sale: self.show_sale_menu(sale))
+        self.salesTable.setItemDelegateForColumn(SalesTableModel.ACTIONS_COLUMN, self.actions_delegate)
         
         # Connexions
         self.btnNewSale.clicked.connect(self.open_new_sale_dialog)
         self.btnUnpaid.clicked.connect(self.show_unpaid_sales)
         self.btnExport.clicked.connect(self.export_excel)
-        self.searchInput.textChanged.connect(self.search_sales)
+        self.search = DebouncedSearch(
+            self.searchInput, self.loader,
+            search=self.search_sales,
+            on_results=self.show_search_results,
+            local_filter=self.sales_proxy.set_text,
+            on_cleared=self.load_sales,
+            parent=self
+        )
         self.statusFilter.currentIndexChanged.connect(self.filter_by_status)
         self.salesTable.doubleClicked.connect(self.view_sale_details)
         
@@ -43,72 +72,28 @@ class SalesView(QWidget):
         self.load_sales()
 
     def load_sales(self):
-        """Charger toutes les ventes"""
-        self.sales_data = SaleController.get_all_sales(limit=1000)
-        self.refresh_table(self.sales_data)
+        """Charger les ventes (première page, les suivantes au défilement)"""
+        self.search.cancel()
+        self.sales_proxy.set_text(self.search.text())
+        self.page_status = self.selected_status()
+        self.sales_model.reload()
         self.update_stats()
 
-    def refresh_table(self, sales):
-        """Rafraîchir le tableau"""
-        self.salesTable.setRowCount(len(sales))
-        
-        for row_idx, sale in enumerate(sales):
-            # Numéro facture
-            numero = sale.get('numero_facture', '')
-            self.salesTable.setItem(row_idx, 0, QTableWidgetItem(str(numero)))
-            
-            # Client
-            client = sale.get('client_nom', 'N/A')
-            self.salesTable.setItem(row_idx, 1, QTableWidgetItem(str(client)))
-            
-            # Date
-            date_str = str(sale.get('date_vente', ''))[:10]
-            self.salesTable.setItem(row_idx, 2, QTableWidgetItem(date_str))
-            
-            # Montant total
-            montant = float(sale.get('montant_total', 0))
-            item_montant = QTableWidgetItem(f"{montant:.2f} XOF")
-            item_montant.setTextAlignment(Qt.AlignmentFlag.AlignRight)
-            self.salesTable.setItem(row_idx, 3, item_montant)
-            
-            # Montant payé
-            paye = float(sale.get('montant_paye', 0))
-            item_paye = QTableWidgetItem(f"{paye:.2f} XOF")
-            item_paye.setTextAlignment(Qt.AlignmentFlag.AlignRight)
-            self.salesTable.setItem(row_idx, 4, item_paye)
-            
-            # Statut
-            statut = sale.get('statut', 'en_cours')
-            item_statut = QTableWidgetItem(statut)
-            
-            # Colorer le statut
-            if statut == 'payee':
-                item_statut.setBackground(QColor(144, 238, 144))  # Vert clair
-            elif statut == 'partielle':
-                item_statut.setBackground(QColor(255, 218, 185))  # Orange clair
-            elif statut == 'en_cours':
-                item_statut.setBackground(QColor(255, 200, 200))  # Rouge clair
-            elif statut == 'annulee':
-                item_statut.setBackground(QColor(200, 200, 200))  # Gris
-            
-            self.salesTable.setItem(row_idx, 5, item_statut)
-            
-            # Actions
-            btn_actions = QPushButton("⋮ Actions")
-            btn_actions.setProperty("variant", "tableAction")
-            btn_actions.setMinimumWidth(110)
-            btn_actions.clicked.connect(lambda checked, s=sale: self.show_sale_menu(s))
-            self.salesTable.setCellWidget(row_idx, 6, btn_actions)
-        
-        self.salesTable.resizeColumnsToContents()
-        self.salesTable.horizontalHeader().setStretchLastSection(True)
-        # Ensure the actions column stays readable
-        self.salesTable.setColumnWidth(6, 140)
+    def fetch_sales_page(self, after, limit):
+        """Page suivante de ventes pour le modèle du tableau
+
+        Appelé dans un thread du loader : ne lit pas les widgets, le statut
+        filtré est figé dans page_status au lancement du chargement.
+        """
+        return SaleController.get_all_sales(limit=limit, after=after, statut=self.page_status)
 
     def update_stats(self):
         """Mettre à jour les statistiques"""
-        stats = SaleController.get_sales_statistics()
-        
+        self.loader.run('stats', SaleController.get_sales_statistics, on_done=self.show_stats)
+
+    def show_stats(self, stats):
+        """Afficher les statistiques du jour"""
+        stats = stats or {}
         total_ventes = stats.get('total_ventes', 0)
         ca_total = stats.get('ca_total', 0)
         ticket_moyen = stats.get('ticket_moyen', 0)
@@ -121,40 +106,45 @@ class SalesView(QWidget):
         )
 
     def search_sales(self, query):
-        """Rechercher une vente"""
-        if not query:
-            self.load_sales()
-            return
-        
-        # Rechercher par numéro ou client
-        if query.isdigit():
-            results = SaleController.search_sales(query, 'numero')
-        else:
-            results = SaleController.search_sales(query, 'client')
-        
-        filtered = self.filter_by_status_internal(results)
-        self.refresh_table(filtered)
+        """Rechercher une vente par numéro ou client (thread du loader)"""
+        search_type = 'numero' if query.isdigit() else 'client'
+        return SaleController.search_sales(query, search_type)
+
+    def show_search_results(self, query, results):
+        """Afficher le résultat d'une recherche, filtré par statut"""
+        # Le résultat MySQL remplace le filtrage local des lignes chargées
+        self.sales_proxy.set_text('')
+        self.sales_model.set_rows(self.filter_by_status_internal(results))
 
     def filter_by_status(self):
         """Filtrer par statut"""
-        filtered = self.filter_by_status_internal(self.sales_data)
-        self.refresh_table(filtered)
+        if self.search.text():
+            self.search.trigger()
+        else:
+            # Le filtre est appliqué côté base, page par page
+            self.search.cancel()
+            self.page_status = self.selected_status()
+            self.sales_model.reload()
 
-    def filter_by_status_internal(self, sales):
-        """Filtrer les ventes par statut sélectionné"""
-        status_text = self.statusFilter.currentText()
-        
+    def visible_sales(self):
+        """Ventes affichées (après filtrage local)"""
+        return [self.sales_proxy.row_at(row) for row in range(self.sales_proxy.rowCount())]
+
+    def selected_status(self):
+        """Statut sélectionné dans le filtre (None pour tous)"""
         status_map = {
             'En cours': 'en_cours',
             'Payées': 'payee',
             'Partielles': 'partielle',
             'Annulées': 'annulee'
         }
-        
-        if status_text == 'Tous les statuts':
+        return status_map.get(self.statusFilter.currentText())
+
+    def filter_by_status_internal(self, sales):
+        """Filtrer les ventes par statut sélectionné"""
+        target_status = self.selected_status()
+        if not target_status:
             return sales
-        
-        target_status = status_map.get(status_text)
         return [s for s in sales if s.get('statut') == target_status]
 
     def open_new_sale_dialog(self):
@@ -165,30 +155,55 @@ class SalesView(QWidget):
 
     def view_sale_details(self, index):
         """Afficher les détails d'une vente"""
-        if index.row() < len(self.sales_data):
-            sale = self.sales_data[index.row()]
+        sale = self.sales_proxy.row_at(index.row())
+        if sale:
             dialog = SaleDetailsDialog(sale, self)
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 self.load_sales()
 
     def show_unpaid_sales(self):
         """Afficher les ventes impayées"""
-        unpaid = SaleController.get_unpaid_sales()
-        self.sales_data = unpaid
-        self.refresh_table(unpaid)
+        self.search.cancel()
+        self.loader.run('search', SaleController.get_unpaid_sales,
+                        on_done=lambda unpaid: self.sales_model.set_rows(unpaid or []))
 
     def export_excel(self):
-        """Exporter les ventes en Excel"""
+        """Exporter les ventes en Excel
+
+        Sans recherche, toutes les ventes du statut filtré sont lues au fil
+        de l'eau depuis la base ; sinon, les résultats affichés.
+        """
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Exporter les ventes", "", "Excel Files (*.xlsx)"
         )
-        
-        if file_path:
-            try:
-                export_sales_to_excel(self.sales_data, file_path)
-                QMessageBox.information(self, "Succès", f"Export réussi : {file_path}")
-            except Exception as e:
-                QMessageBox.warning(self, "Erreur", f"Erreur export : {str(e)}")
+        if not file_path:
+            return
+
+        progress = ExportProgress(self, "Export des ventes")
+        rows = self.visible_sales() if self.search.text() else None
+        self.export_loader.run(
+            'export', self.write_sales_export, file_path, self.page_status, rows, progress,
+            on_done=lambda result: self.show_export_result(progress, result),
+            on_error=lambda message: self.show_export_result(progress, (False, message))
+        )
+
+    @staticmethod
+    def write_sales_export(file_path, statut, rows, progress):
+        """Écrire l'export (thread du worker)"""
+        from utils.excel_exporter import export_sales_to_excel
+        if rows is None:
+            return export_sales_to_excel(
+                SaleController.iter_sales(statut), file_path, SaleController.count_sales(statut), progress
+            )
+        return export_sales_to_excel(rows, file_path, len(rows), progress)
+
+    def show_export_result(self, progress, result):
+        progress.finish()
+        success, message = result
+        if success:
+            QMessageBox.information(self, "Succès", message)
+        else:
+            QMessageBox.warning(self, "Erreur", message)
 
     def show_sale_menu(self, sale):
         """Afficher le menu d'actions pour une vente"""
@@ -198,11 +213,10 @@ class SalesView(QWidget):
 
     def show_context_menu(self, position):
         """Afficher le menu contextuel"""
-        item = self.salesTable.itemAt(position)
-        if item:
-            row = item.row()
-            if row < len(self.sales_data):
-                self.show_sale_menu(self.sales_data[row])
+        index = self.salesTable.indexAt(position)
+        sale = self.sales_proxy.row_at(index.row()) if index.isValid() else None
+        if sale:
+            self.show_sale_menu(sale)
 
 
 class SaleFormDialog(QDialog):
@@ -212,8 +226,15 @@ class SaleFormDialog(QDialog):
         self.setWindowTitle("Nouvelle Vente")
         self.setGeometry(100, 100, 900, 600)
         self.articles = []
+        # Valeurs du cache (sans requête sur le thread de l'interface),
+        # confirmées par le loader
+        defaults = SettingsController.get_sale_defaults(cached=True)
+        self.currency = defaults['currency']
+        self.default_tva = defaults['tva']
+        self.loader = AsyncLoader(self)
         try:
             self.init_ui()
+            self.loader.run('settings', SettingsController.get_sale_defaults, on_done=self.apply_sale_defaults)
         except Exception as e:
             print(f"Erreur lors de l'initialisation du formulaire de vente : {e}")
             QMessageBox.critical(self, "Erreur", f"Erreur lors de l'initialisation : {str(e)}")
@@ -225,17 +246,20 @@ class SaleFormDialog(QDialog):
         # Sélection client
         client_layout = QHBoxLayout()
         client_layout.addWidget(QLabel("Client *"))
-        self.client_combo = QComboBox()
-        self.load_clients()
-        client_layout.addWidget(self.client_combo)
+        # Clients récents proposés d'abord, index chargé en arrière-plan
+        self.client_picker = ClientPicker(parent=self)
+        self.client_picker.load()
+        client_layout.addWidget(self.client_picker, 1)
         layout.addLayout(client_layout)
         
         # Sélection produits
         product_layout = QHBoxLayout()
         product_layout.addWidget(QLabel("Produit à ajouter"))
-        self.product_combo = QComboBox()
-        self.load_products()
-        product_layout.addWidget(self.product_combo)
+        # Recherche à la frappe : index chargé en arrière-plan, ligne
+        # complète lue seulement au choix d'un produit
+        self.product_picker = ProductPicker(parent=self)
+        self.product_picker.load()
+        product_layout.addWidget(self.product_picker, 1)
         
         product_layout.addWidget(QLabel("Quantité"))
         self.quantity_input = QSpinBox()
@@ -262,8 +286,8 @@ class SaleFormDialog(QDialog):
         
         calc_layout.addWidget(QLabel("TVA (%) :"))
         self.tva_input = QDoubleSpinBox()
-        self.tva_input.setValue(18)
         self.tva_input.setMaximum(100)
+        self.tva_input.setValue(self.default_tva)
         self.tva_input.valueChanged.connect(self.update_totals)
         calc_layout.addWidget(self.tva_input)
         
@@ -285,15 +309,15 @@ class SaleFormDialog(QDialog):
         totals_layout = QHBoxLayout()
         totals_layout.addStretch()
         totals_layout.addWidget(QLabel("Total HT :"))
-        self.total_ht_label = QLabel("0.00XOF")
+        self.total_ht_label = QLabel(f"0.00 {self.currency}")
         self.total_ht_label.setStyleSheet("font-weight: bold")
         totals_layout.addWidget(self.total_ht_label)
         totals_layout.addWidget(QLabel("TVA :"))
-        self.tva_label = QLabel("0.00XOF")
+        self.tva_label = QLabel(f"0.00 {self.currency}")
         self.tva_label.setStyleSheet("font-weight: bold")
         totals_layout.addWidget(self.tva_label)
         totals_layout.addWidget(QLabel("Total TTC :"))
-        self.total_ttc_label = QLabel("0.00XOF")
+        self.total_ttc_label = QLabel(f"0.00 {self.currency}")
         self.total_ttc_label.setStyleSheet("font-weight: bold; color: green")
         totals_layout.addWidget(self.total_ttc_label)
         layout.addLayout(totals_layout)
@@ -319,100 +343,25 @@ class SaleFormDialog(QDialog):
         
         self.setLayout(layout)
 
-    def load_clients(self):
-        """Charger la liste des clients"""
-        try:
-            clients = ClientController.get_all_clients()
-            self.client_combo.clear()
-            
-            if not clients:
-                self.client_combo.addItem("Aucun client disponible", None)
-                QMessageBox.warning(self, "Base de données", "Aucun client trouvé. Vérifiez que la base de données est connectée et contient des clients.")
-                return
-            
-            for client in clients:
-                try:
-                    nom = client.get('nom', 'N/A')
-                    prenom = client.get('prenom', 'N/A')
-                    client_id = client.get('id')
-                    
-                    if client_id is None:
-                        continue
-                    
-                    nom_complet = f"{nom} {prenom}"
-                    self.client_combo.addItem(nom_complet, client_id)
-                except Exception as e:
-                    print(f"Erreur lors du chargement du client : {e}")
-                    continue
-        except Exception as e:
-            error_msg = str(e)
-            print(f"Erreur lors du chargement des clients : {error_msg}")
-            self.client_combo.clear()
-            self.client_combo.addItem("⚠️ Erreur de connexion", None)
-            QMessageBox.critical(self, "Erreur de connexion", 
-                f"Impossible de charger les clients.\n\n"
-                f"Vérifiez que le serveur MySQL est démarré.\n\n"
-                f"Détails: {error_msg}")
-
-    def load_products(self):
-        """Charger la liste des produits"""
-        try:
-            products = ProductController.get_all_products()
-            self.product_combo.clear()
-            
-            if not products:
-                self.product_combo.addItem("Aucun produit disponible", None)
-                QMessageBox.warning(self, "Base de données", "Aucun produit trouvé. Vérifiez que la base de données est connectée et contient des produits.")
-                return
-            
-            for prod in products:
-                try:
-                    # Récupérer les données avec gestion des valeurs manquantes
-                    nom = prod.get('nom', 'Produit sans nom')
-                    categorie = prod.get('categorie', 'N/A')
-                    prix_vente = prod.get('prix_vente', 0)
-                    produit_id = prod.get('id')
-                    
-                    # Vérifier les valeurs
-                    if produit_id is None:
-                        continue
-                    
-                    # Convertir le prix en float
-                    try:
-                        prix = float(prix_vente) if prix_vente else 0.0
-                    except (ValueError, TypeError):
-                        prix = 0.0
-                    
-                    # Ajouter au combo box
-                    display_text = f"{nom} ({categorie}) - {prix:.2f} XOF"
-                    self.product_combo.addItem(display_text, (produit_id, prix))
-                except Exception as e:
-                    print(f"Erreur lors du chargement du produit : {e}")
-                    continue
-        except Exception as e:
-            error_msg = str(e)
-            print(f"Erreur lors du chargement des produits : {error_msg}")
-            self.product_combo.clear()
-            self.product_combo.addItem("⚠️ Erreur de connexion", None)
-            QMessageBox.critical(self, "Erreur de connexion", 
-                f"Impossible de charger les produits.\n\n"
-                f"Vérifiez que le serveur MySQL est démarré.\n\n"
-                f"Détails: {error_msg}")
+    def apply_sale_defaults(self, defaults):
+        """Paramètres lus par le loader : devise, et TVA si elle n'a pas été modifiée"""
+        if self.tva_input.value() == self.default_tva:
+            self.tva_input.setValue(defaults['tva'])
+        self.default_tva = defaults['tva']
+        self.currency = defaults['currency']
+        self.update_articles_table()
+        self.update_totals()
 
     def add_product(self):
         """Ajouter un produit aux articles"""
-        if self.product_combo.currentIndex() < 0:
+        product = self.product_picker.current
+        if not product:
             QMessageBox.warning(self, "Erreur", "Sélectionnez un produit")
             return
         
-        current_data = self.product_combo.currentData()
-        if current_data is None or not isinstance(current_data, tuple):
-            QMessageBox.warning(self, "Erreur", "Produit invalide")
-            return
-        
         try:
-            product_id, prix_unitaire = current_data
-            prix_unitaire = float(prix_unitaire)
+            product_id = product['id']
+            prix_unitaire = float(product.get('prix_vente') or 0)
             quantite = self.quantity_input.value()
             
             # Vérifier si produit déjà présent
@@ -423,20 +372,12 @@ class SaleFormDialog(QDialog):
                     self.update_totals()
                     return
             
-            # Extraire le nom du produit de manière sécurisée
-            combo_text = self.product_combo.currentText()
-            # Format: "Nom (Catégorie) - PrixXOF"
-            if '(' in combo_text:
-                nom = combo_text.split('(')[0].strip()
-            else:
-                nom = combo_text
-            
             # Ajouter nouvel article
             self.articles.append({
                 'produit_id': product_id,
                 'quantite': quantite,
                 'prix_unitaire': prix_unitaire,
-                'nom': nom
+                'nom': product.get('nom', 'Produit sans nom')
             })
             
             self.update_articles_table()
@@ -455,10 +396,10 @@ class SaleFormDialog(QDialog):
             self.articles_table.setItem(row, 1, QTableWidgetItem(str(article['quantite'])))
             
             prix = article['prix_unitaire']
-            self.articles_table.setItem(row, 2, QTableWidgetItem(f"{prix:.2f} XOF"))
+            self.articles_table.setItem(row, 2, QTableWidgetItem(f"{prix:.2f} {self.currency}"))
             
             total = article['quantite'] * prix
-            self.articles_table.setItem(row, 3, QTableWidgetItem(f"{total:.2f} XOF"))
+            self.articles_table.setItem(row, 3, QTableWidgetItem(f"{total:.2f} {self.currency}"))
             
             btn_remove = QPushButton("✗")
             btn_remove.clicked.connect(lambda checked, r=row: self.remove_article(r))
@@ -487,20 +428,22 @@ class SaleFormDialog(QDialog):
         montant_tva = montant_ht_net * (tva_pct / 100)
         montant_ttc = montant_ht_net + montant_tva
         
-        self.total_ht_label.setText(f"{montant_ht_net:.2f} XOF")
-        self.tva_label.setText(f"{montant_tva:.2f} XOF")
-        self.total_ttc_label.setText(f"{montant_ttc:.2f} XOF")
+        self.total_ht_label.setText(f"{montant_ht_net:.2f} {self.currency}")
+        self.tva_label.setText(f"{montant_tva:.2f} {self.currency}")
+        self.total_ttc_label.setText(f"{montant_ttc:.2f} {self.currency}")
 
     def open_new_client_dialog(self):
         """Ouvrir le dialogue de création de client"""
         from views.clients_view import ClientFormDialog
         dialog = ClientFormDialog(None, self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_clients()
+            ClientPicker.invalidate()
+            self.client_picker.load()
 
     def save_sale(self):
         """Créer la vente"""
-        if self.client_combo.currentIndex() < 0:
+        client = self.client_picker.current
+        if not client:
             QMessageBox.warning(self, "Erreur", "Client obligatoire")
             return
         
@@ -508,7 +451,7 @@ class SaleFormDialog(QDialog):
             QMessageBox.warning(self, "Erreur", "Au moins un article obligatoire")
             return
         
-        client_id = self.client_combo.currentData()
+        client_id = client['id']
         user = Session.get_user()
         user_id = user.get('id') if user else None
         
@@ -631,13 +574,8 @@ class SaleDetailsDialog(QDialog):
             )
             
             if file_path:
-                # Informations entreprise (à adapter selon vos besoins)
-                company_info = {
-                    'name': 'Votre Entreprise',
-                    'address': '123 Rue de la Paix, 75000 Paris',
-                    'phone': '01 23 45 67 89',
-                    'email': 'contact@entreprise.fr'
-                }
+                # Informations entreprise (paramètres, en cache)
+                company_info = SettingsController.get_invoice_company_info()
                 
                 success, message = SaleController.export_sale_to_pdf(
                     self.sale['id'],
@@ -781,13 +719,8 @@ class SaleActionsDialog(QDialog):
             )
             
             if file_path:
-                # Informations entreprise (à adapter selon vos besoins)
-                company_info = {
-                    'name': 'Votre Entreprise',
-                    'address': '123 Rue de la Paix, 75000 Paris',
-                    'phone': '01 23 45 67 89',
-                    'email': 'contact@entreprise.fr'
-                }
+                # Informations entreprise (paramètres, en cache)
+                company_info = SettingsController.get_invoice_company_info()
                 
                 success, message = SaleController.export_sale_to_pdf(
                     self.sale['id'],
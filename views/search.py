@@ -0,0 +1,76 @@
+from PyQt6.QtCore import QObject, QTimer
+
+
+class DebouncedSearch(QObject):
+    """Recherche à la frappe pour un QLineEdit
+
+    - local_filter(texte) : appelé à chaque frappe, filtre les lignes déjà
+      chargées (aucune requête)
+    - search(texte) : requête MySQL, lancée seulement quand la saisie est
+      stable depuis `delay` ms et fait au moins `min_length` caractères.
+      Exécutée par le loader (views.workers.AsyncLoader) ; une nouvelle
+      frappe annule la requête en attente et un résultat périmé est ignoré.
+    - on_results(texte, lignes) : résultat de search pour le texte courant
+    - on_cleared() : champ vidé
+    """
+
+    def __init__(self, line_edit, loader=None, search=None, on_results=None, local_filter=None,
+                 on_cleared=None, delay=300, min_length=2, key='search', parent=None):
+        super().__init__(parent or line_edit)
+        self.line_edit = line_edit
+        self.loader = loader
+        self.search = search
+        self.on_results = on_results
+        self.local_filter = local_filter
+        self.on_cleared = on_cleared
+        self.min_length = min_length
+        self.key = key
+
+        self._text = ''
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.run_remote)
+
+        line_edit.textChanged.connect(self.on_text_changed)
+
+    def text(self):
+        return self._text
+
+    def on_text_changed(self, text):
+        text = (text or '').strip()
+        if text == self._text:
+            return
+        self._text = text
+
+        self._timer.stop()
+        if self.loader:
+            self.loader.cancel(self.key)
+
+        if self.local_filter:
+            self.local_filter(text)
+
+        if not text:
+            if self.on_cleared:
+                self.on_cleared()
+        elif self.search and len(text) >= self.min_length:
+            self._timer.start()
+
+    def trigger(self):
+        """Relancer immédiatement la recherche du texte courant (ex. filtre modifié)"""
+        self._timer.stop()
+        if self._text and self.search and len(self._text) >= self.min_length:
+            self.run_remote()
+
+    def cancel(self):
+        self._timer.stop()
+        if self.loader:
+            self.loader.cancel(self.key)
+
+    def run_remote(self):
+        text = self._text
+        self.loader.run(self.key, self.search, text, on_done=lambda rows: self._deliver(text, rows))
+
+    def _deliver(self, text, rows):
+        if text == self._text and self.on_results:
+            self.on_results(text, rows or [])
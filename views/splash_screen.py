@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import QSplashScreen, QApplication
 from PyQt6.QtGui import QPixmap, QColor, QPainter, QLinearGradient, QFont
 from PyQt6.QtCore import Qt, QTimer, QSize
 import os
+from utils import startup
 
 
 class SplashScreen(QSplashScreen):
@@ -60,6 +61,9 @@ class SplashScreen(QSplashScreen):
     
     def update_message(self, message):
         """Update the splash screen message"""
+        # Affichage seul : les fins de phase sont notées par main.py (startup.mark)
+        if startup.profiling():
+            message = f"{message}  [{startup.elapsed_ms():.0f} ms]"
         self.showMessage(
             message,
             alignment=Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter,
@@ -0,0 +1,386 @@
+from decimal import Decimal
+
+from PyQt6.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QRect, QEvent, pyqtSignal
+)
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyleOptionButton, QStyle, QPushButton
+
+
+SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+ALIGN_RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+ALIGN_CENTER = Qt.AlignmentFlag.AlignCenter
+
+STATUS_COLORS = {
+    'payee': QColor(144, 238, 144),      # Vert clair
+    'partielle': QColor(255, 218, 185),  # Orange clair
+    'en_cours': QColor(255, 200, 200),   # Rouge clair
+    'annulee': QColor(200, 200, 200),    # Gris
+}
+LOW_STOCK_COLOR = QColor(255, 200, 200)
+
+
+def money(key):
+    """Formateur « 1234.50 XOF » pour une colonne de montant"""
+    return lambda row: f"{float(row.get(key) or 0):.2f} XOF"
+
+
+class Column:
+    """Description d'une colonne de tableau
+
+    - key : clé du dict ligne (texte affiché par défaut, et tri)
+    - text : fonction(ligne) -> texte affiché, à la place de key
+    - sort : fonction(ligne) -> valeur de tri (par défaut la valeur de key)
+    - align : alignement du texte
+    - background : fonction(ligne) -> QColor ou None
+    - width : largeur initiale en pixels
+    - actions : [(clé, libellé), ...] pour une colonne de boutons
+      (peinte par ActionButtonDelegate)
+    """
+
+    def __init__(self, header, key=None, text=None, sort=None, align=None, background=None,
+                 width=None, actions=None):
+        self.header = header
+        self.key = key
+        self.text = text
+        self.sort = sort
+        self.align = align
+        self.background = background
+        self.width = width
+        self.actions = actions
+
+    def display(self, row):
+        if self.actions:
+            return None
+        if self.text:
+            return self.text(row)
+        value = row.get(self.key)
+        return '' if value is None else str(value)
+
+    def sort_value(self, row):
+        if self.sort:
+            return self.sort(row)
+        value = row.get(self.key) if self.key else self.display(row)
+        if isinstance(value, Decimal):
+            # Qt ne connaît pas Decimal : il serait trié comme du texte
+            return float(value)
+        return '' if value is None else value
+
+
+class DictTableModel(QAbstractTableModel):
+    """Modèle de tableau générique sur une liste de dicts (lignes SQL)
+
+    Les colonnes sont décrites par des Column. Rien n'est calculé à
+    l'avance : data() formate uniquement les cellules que la vue peint, et
+    remplacer toutes les lignes (set_rows) ne coûte qu'un reset du modèle.
+
+    Avec fetch_page(after, limit), le modèle se charge par pages au
+    défilement (canFetchMore/fetchMore) ; `after` vaut page_key(dernière
+    ligne chargée), ou None pour la première page. Avec un loader
+    (views.workers.AsyncLoader), les pages sont lues en arrière-plan et
+    ajoutées à leur arrivée.
+    """
+
+    def __init__(self, columns, fetch_page=None, page_key=None, page_size=200, parent=None,
+                 loader=None):
+        super().__init__(parent)
+        self.columns = columns
+        self._fetch_page = fetch_page
+        self._page_key = page_key or (lambda row: row['id'])
+        self._page_size = page_size
+        self._loader = loader
+        self._fetching = False
+        self._fetch_more = None
+        self._rows = []
+        self._search_texts = {}
+        self._has_more = fetch_page is not None
+
+    # ==================== Chargement ====================
+
+    def reload(self):
+        """Repartir de la première page"""
+        self._cancel_fetch()
+        self._fetch_more = None
+        self.beginResetModel()
+        self._rows = []
+        self._search_texts = {}
+        self._has_more = self._fetch_page is not None
+        self.endResetModel()
+        if self.canFetchMore():
+            self.fetchMore()
+
+    def set_rows(self, rows, fetch_more=None):
+        """Afficher une liste fixe
+
+        fetch_more(offset, limit) : suite de la liste (ex. pages suivantes
+        d'un résultat de recherche), lue au défilement si `rows` est une
+        page complète. reload() revient à la liste paginée d'origine.
+        """
+        self._cancel_fetch()
+        self._fetch_more = fetch_more
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._search_texts = {}
+        self._has_more = fetch_more is not None and len(self._rows) >= self._page_size
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+
+        if self._fetch_more:
+            fetch, after = self._fetch_more, len(self._rows)
+        else:
+            fetch = self._fetch_page
+            after = self._page_key(self._rows[-1]) if self._rows else None
+
+        if self._loader is None:
+            self._append_page(fetch(after, self._page_size))
+            return
+
+        self._fetching = True
+        self._loader.run(
+            self, fetch, after, self._page_size,
+            on_done=self._append_page, on_error=self._page_failed
+        )
+
+    def _cancel_fetch(self):
+        if self._fetching:
+            self._loader.cancel(self)
+            self._fetching = False
+
+    def _page_failed(self, message):
+        self._fetching = False
+        self._has_more = False
+
+    def _append_page(self, rows):
+        self._fetching = False
+        rows = rows or []
+        self._has_more = len(rows) == self._page_size
+        if not rows:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    # ==================== Accès ====================
+
+    @property
+    def page_size(self):
+        return self._page_size
+
+    def row_at(self, row):
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def rows(self):
+        return list(self._rows)
+
+    def search_text(self, row, keys):
+        """Texte en minuscules des champs `keys` d'une ligne (mis en cache)"""
+        text = self._search_texts.get(row)
+        if text is None:
+            values = self._rows[row]
+            text = ' '.join(str(values.get(key) or '') for key in keys).lower()
+            self._search_texts[row] = text
+        return text
+
+    def column_index(self, header):
+        for index, column in enumerate(self.columns):
+            if column.header == header:
+                return index
+        return -1
+
+    # ==================== QAbstractTableModel ====================
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.columns[section].header
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = self._rows[index.row()]
+        column = self.columns[index.column()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return column.display(row)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column.align is not None:
+            return int(column.align)
+        if role == Qt.ItemDataRole.BackgroundRole and column.background:
+            return column.background(row)
+        if role == Qt.ItemDataRole.UserRole:
+            return row
+        if role == SORT_ROLE:
+            return column.sort_value(row)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+
+class RowFilterProxyModel(QSortFilterProxyModel):
+    """Filtrage / tri local d'un DictTableModel
+
+    - set_text : ne garder que les lignes dont les champs `search_keys`
+      contiennent tous les mots saisis
+    - set_predicate : filtre supplémentaire fonction(ligne) -> bool
+    """
+
+    def __init__(self, search_keys, parent=None):
+        super().__init__(parent)
+        self.search_keys = search_keys
+        self._words = []
+        self._predicate = None
+        self.setSortRole(SORT_ROLE)
+        self.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+    def set_text(self, text):
+        words = (text or '').lower().split()
+        if words != self._words:
+            self._words = words
+            self.invalidateFilter()
+
+    def set_predicate(self, predicate):
+        self._predicate = predicate
+        self.invalidateFilter()
+
+    def row_at(self, proxy_row):
+        source = self.mapToSource(self.index(proxy_row, 0))
+        return self.sourceModel().row_at(source.row())
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        if self._predicate and not self._predicate(model.row_at(source_row)):
+            return False
+        if self._words:
+            text = model.search_text(source_row, self.search_keys)
+            return all(word in text for word in self._words)
+        return True
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """Boutons d'action peints dans une cellule (aucun widget par ligne)
+
+    actions : [(clé, libellé), ...]. Un clic émet actionTriggered(clé, ligne)
+    où ligne est le dict de la ligne (Qt.ItemDataRole.UserRole).
+    """
+
+    actionTriggered = pyqtSignal(str, object)
+
+    SPACING = 8
+    PADDING = 20
+
+    def __init__(self, actions, parent=None):
+        super().__init__(parent)
+        self.actions = actions
+        self._pressed = None
+        # Bouton modèle jamais affiché : porte le style QSS "tableAction"
+        self._template = QPushButton()
+        self._template.setProperty("variant", "tableAction")
+
+    def _button_rects(self, option):
+        metrics = option.fontMetrics
+        rects = []
+        x = option.rect.x() + 4
+        height = min(option.rect.height() - 8, metrics.height() + 14)
+        y = option.rect.y() + (option.rect.height() - height) // 2
+        for _, label in self.actions:
+            width = metrics.horizontalAdvance(label) + self.PADDING
+            rects.append(QRect(x, y, width, height))
+            x += width + self.SPACING
+        return rects
+
+    def paint(self, painter, option, index):
+        self.initStyleOption(option, index)
+        style = self._template.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, option.widget)
+
+        for (key, label), rect in zip(self.actions, self._button_rects(option)):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = label
+            button.state = QStyle.StateFlag.State_Enabled
+            if self._pressed == (index.row(), key):
+                button.state |= QStyle.StateFlag.State_Sunken
+            else:
+                button.state |= QStyle.StateFlag.State_Raised
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, self._template)
+
+    def sizeHint(self, option, index):
+        rects = self._button_rects(option)
+        hint = super().sizeHint(option, index)
+        if rects:
+            hint.setWidth(rects[-1].right() - option.rect.x() + 8)
+        return hint
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
+            return False
+
+        position = event.position().toPoint()
+        hit = None
+        for (key, _), rect in zip(self.actions, self._button_rects(option)):
+            if rect.contains(position):
+                hit = key
+                break
+
+        if event.type() == QEvent.Type.MouseButtonPress:
+            self._pressed = (index.row(), hit) if hit else None
+            return hit is not None
+
+        pressed, self._pressed = self._pressed, None
+        if hit and pressed == (index.row(), hit):
+            self.actionTriggered.emit(hit, index.data(Qt.ItemDataRole.UserRole))
+            return True
+        return False
+
+
+# ==================== Colonnes des vues ====================
+
+SALES_COLUMNS = [
+    Column("Facture", 'numero_facture', width=150),
+    Column("Client", 'client_nom', text=lambda s: str(s.get('client_nom') or 'N/A'), width=180),
+    Column("Date", 'date_vente', text=lambda s: str(s.get('date_vente', ''))[:10], width=100),
+    Column("Montant", 'montant_total', text=money('montant_total'), align=ALIGN_RIGHT, width=130),
+    Column("Payé", 'montant_paye', text=money('montant_paye'), align=ALIGN_RIGHT, width=130),
+    Column("Statut", 'statut', background=lambda s: STATUS_COLORS.get(s.get('statut')), width=90),
+    Column("Actions", actions=[('menu', "⋮ Actions")], width=140),
+]
+
+
+class SalesTableModel(DictTableModel):
+    """Ventes, chargées par pages sur la clé (date_vente, id)
+
+    fetch_page(after, limit) : voir Sale.get_all(after=...).
+    """
+
+    HEADERS = [column.header for column in SALES_COLUMNS]
+    ACTIONS_COLUMN = len(SALES_COLUMNS) - 1
+
+    def __init__(self, fetch_page=None, page_size=200, parent=None, loader=None):
+        super().__init__(
+            SALES_COLUMNS, fetch_page,
+            page_key=lambda sale: (sale['date_vente'], sale['id']),
+            page_size=page_size, parent=parent, loader=loader
+        )
+
+    def sale_at(self, row):
+        return self.row_at(row)
@@ -0,0 +1,199 @@
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QEvent, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout, QProgressDialog
+from config import DB_POOL_MAX_SIZE
+
+
+_thread_pool = None
+
+
+def database_thread_pool():
+    """Pool de threads des requêtes de lecture (créé à la demande)
+
+    Limité à la taille du pool de connexions MySQL : un thread de plus
+    ne ferait qu'attendre une connexion libre.
+    """
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = QThreadPool()
+        _thread_pool.setMaxThreadCount(max(1, DB_POOL_MAX_SIZE))
+    return _thread_pool
+
+
+class WorkerSignals(QObject):
+    """Signaux d'un QueryWorker (un QRunnable n'est pas un QObject)"""
+
+    finished = pyqtSignal(object, int, object)  # clé, jeton, résultat
+    failed = pyqtSignal(object, int, str)       # clé, jeton, message
+
+
+class QueryWorker(QRunnable):
+    """Exécute fn(*args, **kwargs) dans un thread du pool"""
+
+    def __init__(self, key, token, fn, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.key = key
+        self.token = token
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self.key, self.token, str(e))
+        else:
+            self.signals.finished.emit(self.key, self.token, result)
+
+
+class AsyncLoader(QObject):
+    """Lectures en arrière-plan pour une vue
+
+    run(clé, fn, ...) exécute fn dans un thread et appelle on_done(résultat)
+    dans le thread de l'interface. Chaque clé n'a qu'une requête « courante » :
+    relancer une clé annule la précédente (retirée de la file si elle n'a pas
+    démarré, résultat ignoré sinon). Le même mécanisme protège d'une vue
+    détruite : les slots d'un QObject supprimé ne sont plus appelés.
+    """
+
+    busyChanged = pyqtSignal(bool)
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self._pool = pool or database_thread_pool()
+        self._tokens = {}
+        self._pending = {}
+
+    def run(self, key, fn, *args, on_done=None, on_error=None, **kwargs):
+        """Lancer fn(*args, **kwargs) ; retourne le jeton de la requête"""
+        was_busy = self.is_busy()
+        self._drop(key)
+        token = self._tokens.get(key, 0) + 1
+        self._tokens[key] = token
+
+        worker = QueryWorker(key, token, fn, args, kwargs)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+
+        self._pending[key] = (worker, on_done, on_error)
+        self._pool.start(worker)
+        if not was_busy:
+            self.busyChanged.emit(True)
+        return token
+
+    def cancel(self, key=None):
+        """Abandonner la requête en cours pour `key` (toutes si None)"""
+        keys = list(self._pending) if key is None else [key]
+        was_busy = self.is_busy()
+        for k in keys:
+            self._drop(k)
+        if was_busy and not self.is_busy():
+            self.busyChanged.emit(False)
+
+    def _drop(self, key):
+        pending = self._pending.pop(key, None)
+        if pending:
+            self._pool.tryTake(pending[0])
+            self._tokens[key] = self._tokens.get(key, 0) + 1
+
+    def is_busy(self, key=None):
+        if key is None:
+            return bool(self._pending)
+        return key in self._pending
+
+    def _take(self, key, token):
+        """Retirer la requête terminée si elle est toujours la courante"""
+        if self._tokens.get(key) != token or key not in self._pending:
+            return None
+        pending = self._pending.pop(key)
+        if not self._pending:
+            self.busyChanged.emit(False)
+        return pending
+
+    def _on_finished(self, key, token, result):
+        pending = self._take(key, token)
+        if pending and pending[1]:
+            pending[1](result)
+
+    def _on_failed(self, key, token, message):
+        pending = self._take(key, token)
+        if not pending:
+            return
+        print(f"❌ Erreur de chargement ({key}) :", message)
+        if pending[2]:
+            pending[2](message)
+
+
+class LoadingOverlay(QWidget):
+    """Voile « Chargement… » posé sur un widget pendant une lecture
+
+    Suit la taille du widget couvert ; à brancher sur
+    AsyncLoader.busyChanged.
+    """
+
+    def __init__(self, target, text="⏳ Chargement…"):
+        super().__init__(target)
+        self.setObjectName("loadingOverlay")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+
+        layout = QVBoxLayout(self)
+        label = QLabel(text)
+        label.setObjectName("loadingLabel")
+        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(label, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        target.installEventFilter(self)
+        self.hide()
+
+    def set_busy(self, busy):
+        if busy:
+            self.setGeometry(self.parentWidget().rect())
+            self.raise_()
+            self.show()
+        else:
+            self.hide()
+
+    def eventFilter(self, watched, event):
+        if watched is self.parentWidget() and event.type() == QEvent.Type.Resize:
+            self.setGeometry(watched.rect())
+        return False
+
+
+class ExportProgress(QObject):
+    """Progression d'un export exécuté dans un worker
+
+    L'objet est passé comme rappel progress(lignes, total) : appelé depuis
+    le thread du worker, il relaie la progression au QProgressDialog par
+    un signal et retourne False une fois « Annuler » cliqué.
+    """
+
+    progressed = pyqtSignal(int, int)
+
+    def __init__(self, parent, title):
+        super().__init__(parent)
+        self.title = title
+        self.cancelled = False
+        self.dialog = QProgressDialog(title, "Annuler", 0, 0, parent)
+        self.dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.dialog.setMinimumDuration(500)
+        self.dialog.canceled.connect(self.cancel)
+        self.progressed.connect(self.show_progress)
+
+    def __call__(self, done, total):
+        self.progressed.emit(done, total or 0)
+        return not self.cancelled
+
+    def cancel(self):
+        self.cancelled = True
+
+    def show_progress(self, done, total):
+        if total:
+            self.dialog.setMaximum(total)
+            self.dialog.setValue(min(done, total))
+        self.dialog.setLabelText(f"{self.title} ({done} lignes)")
+
+    def finish(self):
+        self.dialog.canceled.disconnect(self.cancel)
+        self.dialog.close()